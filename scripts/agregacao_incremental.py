@@ -0,0 +1,331 @@
+"""
+Atualização incremental das tabelas mensais/anuais quando chegam dados novos (INMET, SATVeg).
+- O estado guarda os acumulados parciais combináveis (soma, contagem, mínimo e máximo por chave,
+  os mesmos de leitor_inmet.combinar_parciais) e uma marca d'água do que já foi lido:
+  * CSV do INMET (só crescem no fim): byte até onde cada arquivo foi lido e o hash dos últimos
+    bytes lidos; quando o arquivo cresce, só o trecho novo é lido
+  * tabelas com datas (exportação do SATVeg): última data processada e um hash das linhas já
+    dobradas por chave; chaves cujas linhas antigas mudaram (o SATVeg recalcula o Savitzky-Golay
+    do fim da série) são recalculadas a partir das próprias linhas
+- As observações novas viram um parcial que é dobrado apenas nas chaves (Ano, Mes) e Ano
+  afetadas; as demais linhas do estado não são recalculadas
+- Arquivo já lido que foi reescrito ou removido: o estado é refeito do zero (mínimos e máximos
+  não se desfazem)
+
+As tabelas gravadas com salvar_com_alteracoes guardam um histórico de quais chaves mudaram a cada
+versão (hash do arquivo); atualizar_tabela junta as chaves desde a versão que usou por último e
+recalcula só essas linhas das tabelas integradas (correlacao_geral.py). Sem histórico que ligue
+a versão usada antes à atual, a tabela é refeita inteira.
+
+Estado em .cache/incremental/. Nos scripts, o modo é ativado com --incremental (ou INCREMENTAL=1,
+como faz `python pipeline.py --incremental`).
+"""
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from cache_dados import hash_arquivo
+from leitor_inmet import (acumular_arquivo, combinar_parciais, finalizar, parcial, reagrupar,
+                          TAMANHO_BLOCO)
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_ESTADO = os.path.join(RAIZ, '.cache', 'incremental')
+TAMANHO_CAUDA = 4096  # bytes conferidos no fim do trecho já lido de cada CSV
+HISTORICO_MAXIMO = 50  # versões de cada tabela guardadas no histórico de chaves alteradas
+CHAVES_MENSAIS = [('Ano', 'year'), ('Mes', 'month')]
+CHAVES_ANUAIS = [('Ano', 'year')]
+
+
+def opcao_incremental(parser):
+    parser.add_argument('--incremental', action='store_true', default=os.environ.get('INCREMENTAL') == '1',
+                        help='dobra apenas os dados novos no estado salvo em .cache/incremental/')
+    return parser
+
+
+def _arquivo_estado(nome, extensao='.joblib'):
+    return os.path.join(DIR_ESTADO, nome + extensao)
+
+
+def carregar_estado(nome):
+    caminho = _arquivo_estado(nome)
+    return joblib.load(caminho) if os.path.exists(caminho) else None
+
+
+def salvar_estado(nome, estado):
+    os.makedirs(DIR_ESTADO, exist_ok=True)
+    joblib.dump(estado, _arquivo_estado(nome))
+
+
+# --- Acumulados parciais -------------------------------------------------------------------
+
+def dobrar(acumulado, novo):
+    """Combina `novo` no acumulado só nas chaves de `novo`; as demais linhas ficam como estão."""
+    if acumulado is None or acumulado.empty:
+        return novo.sort_index()
+    comuns = novo.index.intersection(acumulado.index)
+    combinados = combinar_parciais([acumulado.loc[comuns], novo], niveis=list(range(novo.index.nlevels)))
+    return pd.concat([acumulado.drop(index=comuns), combinados]).sort_index()
+
+
+def substituir(acumulado, novo, chaves):
+    """Troca as linhas `chaves` do acumulado pelas de `novo` (chaves sem linha em `novo` somem)."""
+    if acumulado is not None:
+        novo = pd.concat([acumulado.drop(index=chaves.intersection(acumulado.index)), novo])
+    return novo.sort_index()
+
+
+# --- CSV nativos do INMET ------------------------------------------------------------------
+
+def _hash_cauda(caminho, fim):
+    inicio = max(0, fim - TAMANHO_CAUDA)
+    with open(caminho, 'rb') as f:
+        f.seek(inicio)
+        return hashlib.sha256(f.read(fim - inicio)).hexdigest()
+
+
+def marca_arquivo(caminho):
+    """Marca d'água de um CSV lido até o fim: tamanho e hash dos últimos bytes."""
+    fim = os.path.getsize(caminho)
+    return {'fim': fim, 'cauda': _hash_cauda(caminho, fim)}
+
+
+def situacao_arquivo(caminho, marca):
+    """'novo', 'igual', 'anexado' (cresceu só no fim) ou 'reescrito' em relação à marca."""
+    if marca is None:
+        return 'novo'
+    tamanho = os.path.getsize(caminho)
+    if tamanho < marca['fim'] or _hash_cauda(caminho, marca['fim']) != marca['cauda']:
+        return 'reescrito'
+    return 'igual' if tamanho == marca['fim'] else 'anexado'
+
+
+def atualizar_inmet(arquivos, estado=None, tamanho_bloco=TAMANHO_BLOCO, workers=None):
+    """
+    Dobra no estado as linhas dos CSV do INMET ainda não lidas (arquivos novos inteiros; dos já
+    lidos, só o trecho anexado). Retorna (estado, afetadas), com afetadas = {'diario', 'mensal',
+    'anual': índice das chaves alteradas}. O estado guarda os acumulados diário, mensal e anual
+    (índices Estacao, Data / Ano, Mes / Ano), os metadados das estações e as marcas dos arquivos.
+    """
+    caminhos = [os.path.abspath(a) for a in arquivos]
+    estado = estado or {}
+    marcas = estado.get('marcas', {})
+    situacoes = {c: situacao_arquivo(c, marcas.get(c)) for c in caminhos}
+    removidos = set(marcas) - set(caminhos)
+    if estado and (removidos or 'reescrito' in situacoes.values()):
+        motivo = 'removido' if removidos else 'reescrito'
+        print(f'Arquivo do INMET já lido foi {motivo}; refazendo o estado incremental.')
+        estado, marcas = {}, {}
+        situacoes = dict.fromkeys(caminhos, 'novo')
+    estado = {'diario': None, 'mensal': None, 'anual': None, **estado, 'marcas': dict(marcas),
+              'metadados': {e: dict(m) for e, m in estado.get('metadados', {}).items()}}
+
+    tarefas = [(c, marcas[c]['fim'] if s == 'anexado' else 0) for c, s in situacoes.items() if s != 'igual']
+    niveis = {'diario': ['Estacao', 'Data'], 'mensal': ['Estacao', 'Ano', 'Mes'], 'anual': ['Estacao', 'Ano']}
+    afetadas = {nome: pd.MultiIndex.from_arrays([[]] * len(n), names=n) for nome, n in niveis.items()}
+    if not tarefas:
+        return estado, afetadas
+
+    caminhos_lidos, inicios = zip(*tarefas)
+    blocos = [tamanho_bloco] * len(tarefas)
+    if len(tarefas) == 1:
+        lidos = [acumular_arquivo(caminhos_lidos[0], tamanho_bloco, inicios[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(tarefas))) as pool:
+            lidos = list(pool.map(acumular_arquivo, caminhos_lidos, blocos, inicios))
+
+    novos = {}
+    for (caminho, inicio), (meta, acumulado) in zip(tarefas, lidos):
+        estado['marcas'][caminho] = marca_arquivo(caminho)
+        estacao = meta['Estacao']
+        if inicio == 0:
+            registro = estado['metadados'].setdefault(estacao, {**meta, 'Arquivos': 0})
+            registro['Arquivos'] += 1
+        if acumulado is not None:
+            novos.setdefault(estacao, []).append(acumulado)
+    if not novos:
+        return estado, afetadas
+
+    por_dia = pd.concat({e: combinar_parciais(partes) for e, partes in novos.items()}, names=['Estacao', 'Data'])
+    for nome, novo in (('diario', por_dia), ('mensal', reagrupar(por_dia, CHAVES_MENSAIS)),
+                       ('anual', reagrupar(por_dia, CHAVES_ANUAIS))):
+        estado[nome] = dobrar(estado[nome], novo)
+        afetadas[nome] = novo.index
+    return estado, afetadas
+
+
+def resumir_estado(estado):
+    """Tabelas finalizadas do estado do INMET, no formato de leitor_inmet.agregar_estacoes."""
+    resultado = {nome: finalizar(estado[nome]) for nome in ('diario', 'mensal', 'anual')}
+    resultado['estacoes'] = pd.DataFrame(list(estado['metadados'].values()))
+    return resultado
+
+
+# --- Tabelas com datas (SATVeg) ------------------------------------------------------------
+
+def atualizar_observacoes(df, col_data, colunas, chaves, estado=None):
+    """
+    Dobra no estado as linhas de `df` com data posterior à marca d'água (última data processada),
+    agrupadas pelas colunas `chaves` (ex.: ['Ano', 'Mes']). Chaves cujas linhas antigas mudaram
+    são recalculadas por inteiro. Retorna (estado, chaves afetadas); finalizar(estado['acumulado'],
+    saidas) dá a tabela. Mudando as colunas de valores, o estado é refeito.
+    """
+    if estado and estado['colunas'] != list(colunas):
+        estado = None
+    estado = estado or {'colunas': list(colunas), 'marca': None, 'acumulado': None, 'hashes': None}
+    df = df[df[col_data].notna()]
+    linhas = pd.util.hash_pandas_object(df[[col_data, *colunas]], index=False)
+    indice = df.set_index(chaves).index
+    if estado['marca'] is None:
+        antigas = np.zeros(len(df), dtype=bool)
+    else:
+        antigas = (df[col_data] <= estado['marca']).to_numpy()
+
+    # Hash por chave das linhas já dobradas (somas de uint64 dão a volta, sem depender da ordem)
+    atual = linhas[antigas].groupby([df.loc[antigas, c] for c in chaves]).sum()
+    if estado['hashes'] is None:
+        revisadas = atual.index
+    else:
+        uniao = atual.index.union(estado['hashes'].index)
+        diferentes = (atual.reindex(uniao, fill_value=0).to_numpy()
+                      != estado['hashes'].reindex(uniao, fill_value=0).to_numpy())
+        revisadas = uniao[diferentes]
+
+    acumulado = estado['acumulado']
+    if len(revisadas):
+        refazer = indice.isin(revisadas)
+        refeitas = parcial(df.loc[refazer, colunas], [df.loc[refazer, c] for c in chaves])
+        acumulado = substituir(acumulado, refeitas, revisadas)
+    novas = ~antigas & ~indice.isin(revisadas)
+    if novas.any():
+        acumulado = dobrar(acumulado, parcial(df.loc[novas, colunas], [df.loc[novas, c] for c in chaves]))
+
+    afetadas = revisadas.union(indice[novas].unique())
+    estado = {
+        'colunas': list(colunas),
+        'marca': df[col_data].max() if len(df) else estado['marca'],
+        'acumulado': acumulado,
+        'hashes': linhas.groupby([df[c] for c in chaves]).sum(),
+    }
+    return estado, afetadas
+
+
+# --- Registro de chaves alteradas e tabelas derivadas ----------------------------------------
+
+def _arquivo_historico(saida):
+    relativo = os.path.relpath(os.path.abspath(saida), RAIZ)
+    return os.path.join(DIR_ESTADO, 'alteracoes', relativo.replace(os.sep, '__') + '.json')
+
+
+def _ler_historico(saida):
+    caminho = _arquivo_historico(saida)
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _chaves_diferentes(tabela, anterior, chaves):
+    """Chaves cujas linhas diferem entre `anterior` e `tabela` (inclui linhas novas e removidas)."""
+    if list(anterior.columns) != list(tabela.columns):
+        return None
+    nova = pd.read_csv(io.StringIO(tabela.to_csv(index=False)))
+    diferentes = pd.concat([anterior, nova]).drop_duplicates(keep=False)
+    return diferentes[chaves].drop_duplicates()
+
+
+def salvar_com_alteracoes(tabela, saida, chaves, alteradas=None):
+    """
+    Grava `tabela` em CSV e acrescenta ao histórico da saída as chaves alteradas em relação ao
+    conteúdo anterior (hash antes -> hash depois). `alteradas` (DataFrame com as colunas `chaves`,
+    ex.: as chaves dobradas) só é usado se o arquivo anterior foi gravado por esta função; senão as
+    chaves saem da comparação das linhas. Chaves que existiam e sumiram entram sempre.
+    """
+    antes = hash_arquivo(saida) if os.path.exists(saida) else None
+    historico = _ler_historico(saida)
+    if not historico or historico[-1]['para'] != antes:
+        historico = []  # arquivo gravado por fora: o histórico anterior não vale mais
+    if antes is not None:
+        anterior = pd.read_csv(saida)
+        if alteradas is None or not historico:
+            alteradas = _chaves_diferentes(tabela, anterior, chaves)
+        elif set(chaves) <= set(anterior.columns):
+            removidas = anterior[chaves][~anterior.set_index(chaves).index.isin(tabela.set_index(chaves).index)]
+            alteradas = pd.concat([alteradas[chaves], removidas]).drop_duplicates()
+    tabela.to_csv(saida, index=False)
+
+    if antes is None or alteradas is None:
+        historico = []
+    else:
+        historico.append({'de': antes, 'para': hash_arquivo(saida),
+                          'chaves': alteradas[chaves].to_dict(orient='records')})
+    os.makedirs(os.path.dirname(_arquivo_historico(saida)), exist_ok=True)
+    with open(_arquivo_historico(saida), 'w', encoding='utf-8') as f:
+        json.dump(historico[-HISTORICO_MAXIMO:], f, default=str)
+
+
+def chaves_alteradas(entrada, hash_usado):
+    """
+    Chaves que mudaram em `entrada` desde o conteúdo de hash `hash_usado` (DataFrame, vazio se
+    nada mudou), ou None se o histórico não liga as duas versões.
+    """
+    atual = hash_arquivo(entrada)
+    if atual == hash_usado:
+        return pd.DataFrame()
+    historico = _ler_historico(entrada)
+    if hash_usado is None or not historico or historico[-1]['para'] != atual:
+        return None
+    inicios = [i for i, passo in enumerate(historico) if passo['de'] == hash_usado]
+    if not inicios:
+        return None
+    registros = [chave for passo in historico[inicios[-1]:] for chave in passo['chaves']]
+    return pd.DataFrame(registros).drop_duplicates()
+
+
+def _casam(tabela, alteradas):
+    """Linhas de `tabela` com alguma chave alterada (comparando as colunas de chave que ela tem)."""
+    mascara = np.zeros(len(tabela), dtype=bool)
+    for chaves in alteradas:
+        comuns = [c for c in chaves.columns if c in tabela.columns]
+        if not comuns:
+            return np.ones(len(tabela), dtype=bool)
+        mascara |= tabela.set_index(comuns).index.isin(chaves.set_index(comuns).index)
+    return mascara
+
+
+def atualizar_tabela(saida, entradas, chaves, montar):
+    """
+    Grava em `saida` a tabela montar({entrada: DataFrame}) recalculando só as linhas das chaves
+    alteradas nas entradas (registradas por salvar_com_alteracoes). Vale para tabelas em que cada
+    linha depende apenas das linhas de mesma chave nas entradas (junções por Ano/Mes).
+    Sem registro para alguma entrada, ou se `saida` mudou por fora, a tabela é refeita inteira.
+    """
+    nome = 'tabela__' + os.path.basename(_arquivo_historico(saida))[:-len('.json')]
+    estado = carregar_estado(nome) or {}
+    usadas = estado.get('entradas', {})
+    hashes = {e: hash_arquivo(e) for e in entradas}
+    tabelas = {e: pd.read_csv(e) for e in entradas}
+
+    alteradas = None
+    if os.path.exists(saida) and estado.get('saida') == hash_arquivo(saida) and set(usadas) == set(entradas):
+        alteradas = [chaves_alteradas(e, usadas[e]) for e in entradas]
+        if any(a is None for a in alteradas):
+            alteradas = None
+    if alteradas is None:
+        tabela = montar(tabelas)
+        print(f'{os.path.basename(saida)}: refeita inteira ({len(tabela)} linhas).')
+    else:
+        alteradas = [a for a in alteradas if len(a)]
+        anterior = pd.read_csv(saida)
+        recalculadas = montar({e: t[_casam(t, alteradas)] for e, t in tabelas.items()})
+        tabela = pd.concat([anterior[~_casam(anterior, alteradas)], recalculadas])
+        print(f'{os.path.basename(saida)}: {len(recalculadas)} linhas recalculadas.')
+    tabela = tabela.sort_values(chaves, kind='stable').reset_index(drop=True)
+    tabela.to_csv(saida, index=False)
+    salvar_estado(nome, {'saida': hash_arquivo(saida), 'entradas': hashes})
+    return tabela
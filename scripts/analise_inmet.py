@@ -2,101 +2,99 @@
 Script para análise exploratória dos dados climáticos do INMET para Sidrolândia-MS.
 Gera estatísticas anuais e mensais de precipitação, temperatura e outras variáveis,
 salva tabelas tratadas e gráficos para integração com NDVI e produtividade.
+
+Entrada (--entrada, padrão dados_brutos/INMET/):
+- uma pasta com os CSV nativos do BDMEP (um por estação e ano), lidos em blocos por leitor_inmet.py;
+  havendo mais de uma estação, usa a mais próxima de Sidrolândia (ou a indicada em --estacao)
+- ou a planilha combinada sidrolandia_inmet_combinado.xlsx (uma estação, já com todas as horas)
+
+Além das tabelas anual e mensal, salva o clima diário (dados_processados/inmet_clima_diario.csv)
+e, com CSV nativos, a lista de estações lidas (dados_processados/inmet_estacoes.csv).
+
+Com --incremental (CSV nativos), só as linhas ainda não lidas são dobradas nos acumulados salvos
+(agregacao_incremental.py), e as chaves (Ano, Mes) e Ano alteradas ficam registradas para
+correlacao_geral.py.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
 import os
+from agregacao_incremental import (opcao_incremental, carregar_estado, salvar_estado, atualizar_inmet,
+                                    resumir_estado, salvar_com_alteracoes)
+from cache_dados import ler_excel_cache
+from leitor_inmet import (localizar_arquivos, agregar_estacoes, acumular_tabela, resumir,
+                          estacao_mais_proxima, TAMANHO_BLOCO)
+from graficos import opcao_sem_graficos, desenhar_figuras
+
+PLANILHA_COMBINADA = 'sidrolandia_inmet_combinado.xlsx'
+SIDROLANDIA = (-20.93, -54.96)  # latitude, longitude
+
+parser = argparse.ArgumentParser(description='Clima anual e mensal (INMET).')
+parser.add_argument('--entrada', default='../dados_brutos/INMET',
+                    help='pasta com os CSV do INMET ou a planilha combinada (.xlsx)')
+parser.add_argument('--estacao', help='código WMO da estação (ex.: A702), quando houver várias')
+parser.add_argument('--bloco', type=int, default=TAMANHO_BLOCO, help='linhas horárias por bloco')
+parser.add_argument('--workers', type=int, default=None)
+opcao_sem_graficos(parser)
+opcao_incremental(parser)
+args = parser.parse_args()
+
+arquivos_csv = localizar_arquivos(args.entrada) if os.path.isdir(args.entrada) else []
+afetadas = None
+if arquivos_csv and args.incremental:
+    estado, afetadas = atualizar_inmet(arquivos_csv, carregar_estado('inmet'), args.bloco, args.workers)
+    resultado = resumir_estado(estado)
+    print(f"Incremental: {len(afetadas['diario'])} dias e {len(afetadas['mensal'])} meses atualizados.")
+elif arquivos_csv:
+    resultado = agregar_estacoes(arquivos_csv, args.bloco, args.workers)
+if arquivos_csv:
+    estacoes = resultado['estacoes']
+    estacoes.to_csv('../dados_processados/inmet_estacoes.csv', index=False)
+    if args.estacao:
+        estacao = args.estacao
+    elif len(estacoes) == 1 or not {'Latitude', 'Longitude'} <= set(estacoes.columns):
+        estacao = estacoes['Estacao'].iloc[0]
+    else:
+        estacao = estacao_mais_proxima(estacoes, *SIDROLANDIA)
+    print(f'{len(arquivos_csv)} arquivos, {len(estacoes)} estações; usando a estação {estacao}.')
+    if afetadas is not None:
+        if estado.get('estacao') != estacao:
+            afetadas = {}  # outra estação: as chaves alteradas saem da comparação das tabelas
+        estado['estacao'] = estacao
+        salvar_estado('inmet', estado)
+else:
+    planilha = args.entrada if not os.path.isdir(args.entrada) else os.path.join(args.entrada, PLANILHA_COMBINADA)
+    estacao = 'combinado'
+    resultado = resumir({estacao: acumular_tabela(ler_excel_cache(planilha), args.bloco)})
 
-# Caminho do arquivo INMET
-df = pd.read_excel('../dados_brutos/INMET/sidrolandia_inmet_combinado.xlsx')
-
-# Identificar automaticamente as colunas principais (precipitação, temperatura, umidade)
-def get_col_by_keyword(df, keywords):
-    for col in df.columns:
-        for kw in keywords:
-            if kw.lower() in col.lower():
-                return col
-    return None
-
-col_precip = get_col_by_keyword(df, ['precip'])
-col_temp = get_col_by_keyword(df, ['bulbo seco', 'temperatura do ar'])
-col_umid = get_col_by_keyword(df, ['umidade relativa'])
-
-# Padronizar nomes para o resto do script
-if col_precip:
-    df = df.rename(columns={col_precip: 'Precipitacao (mm)'})
-if col_temp:
-    df = df.rename(columns={col_temp: 'Temp (C)'})
-if col_umid:
-    df = df.rename(columns={col_umid: 'Umidade (%)'})
-
-# Converter Data para datetime
-if not pd.api.types.is_datetime64_any_dtype(df['Data']):
-    df['Data'] = pd.to_datetime(df['Data'])
-
-# Adicionar colunas Ano/Mes
-if 'Ano' not in df:
-    df['Ano'] = df['Data'].dt.year
-if 'Mes' not in df:
-    df['Mes'] = df['Data'].dt.month
+
+def _da_estacao(tabela):
+    return tabela[tabela['Estacao'] == estacao].drop(columns='Estacao')
+
+
+def salvar(tabela, saida, nivel):
+    """Grava a tabela; no modo incremental, registra as chaves (Ano, Mes) ou Ano alteradas."""
+    if afetadas is None:
+        tabela.to_csv(saida, index=False)
+        return
+    chaves = ['Ano', 'Mes'] if nivel == 'mensal' else ['Ano']
+    alteradas = _da_estacao(afetadas[nivel].to_frame(index=False)) if nivel in afetadas else None
+    salvar_com_alteracoes(tabela, saida, chaves, alteradas)
+
+
+_da_estacao(resultado['diario']).to_csv('../dados_processados/inmet_clima_diario.csv', index=False)
 
 # --- Estatísticas anuais ---
-clima_anual = df.groupby('Ano').agg({
-    'Precipitacao (mm)': 'sum',
-    'Temp (C)': 'mean',
-    'Umidade (%)': 'mean'
-}).reset_index()
-clima_anual.columns = ['Ano', 'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media']
-clima_anual.to_csv('../dados_processados/inmet_clima_anual.csv', index=False)
+clima_anual = _da_estacao(resultado['anual'])[['Ano', 'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media']]
+salvar(clima_anual, '../dados_processados/inmet_clima_anual.csv', 'anual')
 
 # --- Estatísticas mensais ---
-clima_mensal = df.groupby(['Ano', 'Mes']).agg({
-    'Precipitacao (mm)': 'sum',
-    'Temp (C)': 'mean',
-    'Umidade (%)': 'mean'
-}).reset_index()
-clima_mensal.columns = ['Ano', 'Mes', 'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media']
-clima_mensal.to_csv('../dados_processados/inmet_clima_mensal.csv', index=False)
-
-# --- Gráficos anuais ---
-os.makedirs('../resultados', exist_ok=True)
-plt.figure(figsize=(8,5))
-plt.bar(clima_anual['Ano'], clima_anual['Precipitacao_total_mm'], color='royalblue')
-plt.title('Precipitação Total Anual (mm) - Sidrolândia-MS')
-plt.ylabel('mm')
-plt.xlabel('Ano')
-plt.tight_layout()
-plt.savefig('../resultados/inmet_precipitacao_anual.png')
-plt.close()
-
-plt.figure(figsize=(8,5))
-plt.plot(clima_anual['Ano'], clima_anual['Temp_media_C'], marker='o', color='tomato')
-plt.title('Temperatura Média Anual (°C) - Sidrolândia-MS')
-plt.ylabel('°C')
-plt.xlabel('Ano')
-plt.tight_layout()
-plt.savefig('../resultados/inmet_temp_media_anual.png')
-plt.close()
-
-# --- Gráficos mensais (média por mês ao longo dos anos) ---
-plt.figure(figsize=(10,5))
-sns.boxplot(x='Mes', y='Precipitacao_total_mm', data=clima_mensal, color='royalblue')
-plt.title('Distribuição Mensal da Precipitação (mm)')
-plt.ylabel('mm')
-plt.xlabel('Mês')
-plt.tight_layout()
-plt.savefig('../resultados/inmet_precipitacao_mensal_boxplot.png')
-plt.close()
-
-plt.figure(figsize=(10,5))
-sns.boxplot(x='Mes', y='Temp_media_C', data=clima_mensal, color='tomato')
-plt.title('Distribuição Mensal da Temperatura Média (°C)')
-plt.ylabel('°C')
-plt.xlabel('Mês')
-plt.tight_layout()
-plt.savefig('../resultados/inmet_temp_media_mensal_boxplot.png')
-plt.close()
+clima_mensal = _da_estacao(resultado['mensal'])[['Ano', 'Mes', 'Precipitacao_total_mm', 'Temp_media_C',
+                                                 'Umidade_media']]
+salvar(clima_mensal, '../dados_processados/inmet_clima_mensal.csv', 'mensal')
+
+# --- Gráficos anuais e mensais (média por mês ao longo dos anos) ---
+if not args.sem_graficos:
+    desenhar_figuras(['inmet_precipitacao_anual', 'inmet_temp_media_anual',
+                      'inmet_precipitacao_mensal_boxplot', 'inmet_temp_media_mensal_boxplot'])
 
 print('Análises climáticas anuais e mensais salvas em dados_processados/ e resultados/.')
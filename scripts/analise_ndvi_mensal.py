@@ -1,15 +1,38 @@
 """
 Script para calcular NDVI médio mensal a partir dos dados brutos de satélite.
 Salva tabela tratada e gráficos para integração com clima e produtividade.
+
+Por padrão lê a exportação do SATVeg; com --entrada aceita outra tabela com as colunas
+Data e NDVI, como o CSV gerado por ingestao_raster.py a partir de imagens próprias. Sem a coluna
+Savitzky-Golay, o NDVI bruto é suavizado antes da média (máscara de nuvens, preenchimento de lacunas e
+Savitzky-Golay de suavizacao_ndvi.py); com --serie, cada ponto/município é suavizado separadamente.
+
+Com --incremental, só as observações posteriores à última data já processada (e os meses cujas
+linhas antigas mudaram) entram nos acumulados salvos (agregacao_incremental.py).
 """
 
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import os
+from agregacao_incremental import (opcao_incremental, carregar_estado, salvar_estado, atualizar_observacoes,
+                                    salvar_com_alteracoes)
+from cache_dados import ler_excel_cache, ler_csv_cache
+from leitor_inmet import finalizar
+from graficos import opcao_sem_graficos, desenhar_figuras
+from suavizacao_ndvi import suavizar_tabela
+
+parser = argparse.ArgumentParser(description='NDVI médio mensal (tabela + gráficos).')
+parser.add_argument('--entrada', default='../dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx',
+                    help='planilha do SATVeg ou CSV com colunas Data e NDVI')
+parser.add_argument('--serie', help='coluna que identifica cada série na entrada (ex.: Ponto), se houver várias')
+opcao_sem_graficos(parser)
+opcao_incremental(parser)
+args = parser.parse_args()
 
 # Caminho do arquivo NDVI
-df = pd.read_excel('../dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx')
+if args.entrada.lower().endswith('.csv'):
+    df = ler_csv_cache(args.entrada)
+else:
+    df = ler_excel_cache(args.entrada)
 
 # Converter a coluna de data para datetime
 if not pd.api.types.is_datetime64_any_dtype(df['Data']):
@@ -21,34 +44,24 @@ if 'Ano' not in df:
 if 'Mes' not in df:
     df['Mes'] = df['Data'].dt.month
 
-# Calcular NDVI médio mensal (usando Savitzky-Golay suavizado se existir, senão NDVI bruto)
-col_ndvi = 'Savitzky-Golay' if 'Savitzky-Golay' in df.columns else 'NDVI'
-ndvi_mensal = df.groupby(['Ano', 'Mes'])[col_ndvi].mean().reset_index()
-ndvi_mensal.columns = ['Ano', 'Mes', 'NDVI_medio']
-ndvi_mensal.to_csv('../dados_processados/ndvi_mensal.csv', index=False)
-
-# Gráfico: NDVI médio mensal por ano
-os.makedirs('../resultados', exist_ok=True)
-plt.figure(figsize=(12,6))
-for ano, grupo in ndvi_mensal.groupby('Ano'):
-    plt.plot(grupo['Mes'], grupo['NDVI_medio'], marker='o', label=str(ano))
-plt.title('NDVI Médio Mensal por Ano - Sidrolândia-MS')
-plt.xlabel('Mês')
-plt.ylabel('NDVI Médio (suavizado)')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('../resultados/ndvi_mensal_por_ano.png')
-plt.close()
-
-# Boxplot NDVI mensal (todos os anos)
-plt.figure(figsize=(10,5))
-sns.boxplot(x='Mes', y='NDVI_medio', data=ndvi_mensal, color='green')
-plt.title('Distribuição Mensal do NDVI Médio (Todos os Anos)')
-plt.xlabel('Mês')
-plt.ylabel('NDVI Médio')
-plt.tight_layout()
-plt.savefig('../resultados/ndvi_mensal_boxplot.png')
-plt.close()
+# Calcular NDVI médio mensal sobre a série suavizada (a do SATVeg, ou suavizada aqui a partir do NDVI bruto)
+col_ndvi = 'Savitzky-Golay'
+if col_ndvi not in df.columns:
+    df = suavizar_tabela(df, col_serie=args.serie)
+if args.incremental:
+    estado, afetadas = atualizar_observacoes(df, 'Data', [col_ndvi], ['Ano', 'Mes'], carregar_estado('ndvi_mensal'))
+    salvar_estado('ndvi_mensal', estado)
+    ndvi_mensal = finalizar(estado['acumulado'], {'NDVI_medio': [(col_ndvi, 'media')]})
+    salvar_com_alteracoes(ndvi_mensal, '../dados_processados/ndvi_mensal.csv', ['Ano', 'Mes'],
+                          afetadas.to_frame(index=False))
+    print(f'Incremental: {len(afetadas)} meses atualizados.')
+else:
+    ndvi_mensal = df.groupby(['Ano', 'Mes'])[col_ndvi].mean().reset_index()
+    ndvi_mensal.columns = ['Ano', 'Mes', 'NDVI_medio']
+    ndvi_mensal.to_csv('../dados_processados/ndvi_mensal.csv', index=False)
+
+# Gráficos: NDVI médio mensal por ano e boxplot mensal (todos os anos)
+if not args.sem_graficos:
+    desenhar_figuras(['ndvi_mensal_por_ano', 'ndvi_mensal_boxplot'])
 
 print('NDVI mensal salvo em dados_processados/ndvi_mensal.csv e gráficos em resultados/.')
@@ -0,0 +1,504 @@
+"""
+Benchmarks das etapas do projeto sobre dados sintéticos de tamanho configurável (dados_sinteticos.py).
+- Cada benchmark prepara a entrada fora da medição e mede só a etapa: leitura de Excel/CSV/SIDRA
+  e dos CSV nativos do INMET, agregações do INMET e do NDVI mensal, atualização incremental do
+  INMET, busca de janelas de NDVI, suavização Savitzky-Golay em lote, variáveis agroclimáticas,
+  junções de correlacao_geral.py, matrizes de correlação, IC bootstrap, validação LOO (analítica e Random
+  Forest), segmentação K-means e ingestão de bandas
+- Tempo: menor e mediano de N repetições (time.perf_counter); memória: execução separada em um
+  processo novo (fork; o rastreamento deixa o código mais lento, então não entra no tempo), com o
+  pico do tracemalloc e o maior RSS entre os processos filhos que a etapa criou (folds do joblib),
+  lido de resource.getrusage(RUSAGE_CHILDREN) depois de encerrar os workers
+- Cada benchmark roda em vários tamanhos; o expoente de escala (inclinação log-log do tempo
+  e da memória em função do tamanho) resume como a etapa cresce
+- O resultado é salvo em JSON com o commit atual, para comparar versões com --comparar
+
+Os caches (cache_dados.py) ficam em uma pasta temporária: o benchmark não toca em .cache/.
+O RSS dos filhos é o do maior processo, não a soma dos workers; fica em 0 em etapas sem
+processos filhos e em None no Windows (sem o módulo resource).
+
+Uso (a partir de scripts/):
+    python benchmark.py                          # todos, tamanhos padrão
+    python benchmark.py agregacao_inmet loo_linear --repeticoes 5
+    python benchmark.py --rapido                 # só o menor tamanho de cada benchmark
+    python benchmark.py --escala 4               # tamanhos 4x maiores
+    python benchmark.py --comparar ../resultados/benchmarks/a1b2c3d.json ../resultados/benchmarks/e4f5a6b.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import pandas as pd
+import sklearn
+from joblib.externals.loky import get_reusable_executor
+
+import cache_dados
+import dados_sinteticos as sint
+from bootstrap_ic import indices_bootstrap, tabela_correlacoes, tabela_metricas, tabela_ols
+from agregacao_incremental import atualizar_inmet
+from correlacao_vetorizada import matrizes_pearson_spearman
+from features_agroclimaticas import calcular_features
+from indice_janelas_ndvi import avaliar_janelas, construir_indices, grade_janelas
+from ingestao_raster import descrever_banda, medias_indices
+from leitor_inmet import acumular_arquivo, acumular_tabela, combinar_parciais, resumir
+from leitor_sidra import ler_tabela_sidra, extrair_todos
+from loo_linear import loo_linear_analitico
+from segmentacao_kmeans import segmentar_imagem
+from suavizacao_ndvi import suavizar_lote
+from validacao_loo import avaliar_loo
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIR_SCRIPTS)
+PASTA_RESULTADOS = os.path.join(RAIZ, 'resultados', 'benchmarks')
+REPETICOES = 3
+KB_RSS = 2 ** 20 if sys.platform == 'darwin' else 2 ** 10  # ru_maxrss: bytes no macOS, KB no Linux
+LIMIAR_REGRESSAO = 0.15  # piora relativa tolerada em --comparar
+
+# Registro: nome -> {'preparar', 'tamanhos', 'unidade', 'descricao'}
+BENCHMARKS = {}
+
+
+def benchmark(tamanhos, unidade):
+    """
+    Registra um benchmark. A função decorada recebe (tamanho, pasta_temporaria), prepara os dados
+    e devolve a função sem argumentos que será medida.
+    """
+    def registrar(preparar):
+        BENCHMARKS[preparar.__name__] = {
+            'preparar': preparar,
+            'tamanhos': tamanhos,
+            'unidade': unidade,
+            'descricao': preparar.__doc__.strip().splitlines()[0],
+        }
+        return preparar
+    return registrar
+
+
+# --- Ingestão ------------------------------------------------------------------------------
+
+@benchmark(tamanhos=(1, 2, 4), unidade='anos horários')
+def leitura_excel_inmet(anos, pasta):
+    """Leitura da planilha INMET horária (pd.read_excel, primeira execução sem cache)."""
+    caminho = os.path.join(pasta, f'inmet_{anos}.xlsx')
+    sint.gerar_inmet_horario(anos).to_excel(caminho, index=False)
+    return lambda: pd.read_excel(caminho)
+
+
+@benchmark(tamanhos=(1, 2, 4), unidade='anos horários')
+def leitura_excel_cache(anos, pasta):
+    """Leitura da planilha INMET horária pelo cache Parquet (ler_excel_cache, cache já preenchido)."""
+    caminho = os.path.join(pasta, f'inmet_cache_{anos}.xlsx')
+    sint.gerar_inmet_horario(anos).to_excel(caminho, index=False)
+    cache_dados.ler_excel_cache(caminho)
+    return lambda: cache_dados.ler_excel_cache(caminho)
+
+
+@benchmark(tamanhos=(5, 20, 80), unidade='anos horários')
+def leitura_csv_inmet(anos, pasta):
+    """Leitura da série INMET horária em CSV (pd.read_csv)."""
+    caminho = os.path.join(pasta, f'inmet_{anos}.csv')
+    sint.gerar_inmet_horario(anos).to_csv(caminho, index=False)
+    return lambda: pd.read_csv(caminho, parse_dates=['Data'])
+
+
+@benchmark(tamanhos=(100, 1000, 5000), unidade='municípios')
+def leitura_sidra(n_municipios, pasta):
+    """Tabela 1612 em formato longo + extração de todos os municípios (leitor_sidra, cache preenchido)."""
+    caminho = os.path.join(pasta, f'sidra_{n_municipios}.xlsx')
+    sint.salvar_sidra(sint.gerar_sidra(n_municipios, anos=20), caminho)
+    ler_tabela_sidra(caminho)
+    return lambda: extrair_todos(ler_tabela_sidra(caminho))
+
+
+# --- Agregações e junções ------------------------------------------------------------------
+
+def _agregar_inmet(df):
+    """Clima anual e mensal como em analise_inmet.py (acumulado diário de leitor_inmet)."""
+    resultado = resumir({'combinado': acumular_tabela(df)})
+    return resultado['anual'].drop(columns='Estacao'), resultado['mensal'].drop(columns='Estacao')
+
+
+@benchmark(tamanhos=(5, 20, 80), unidade='anos horários')
+def agregacao_inmet(anos, pasta):
+    """Clima anual e mensal a partir da série horária já carregada (leitor_inmet.acumular_tabela)."""
+    df = sint.gerar_inmet_horario(anos)
+    return lambda: _agregar_inmet(df)
+
+
+@benchmark(tamanhos=(5, 20, 80), unidade='anos horários')
+def leitura_inmet_nativo(anos, pasta):
+    """CSV nativos do INMET (um por ano) lidos em blocos e acumulados (leitor_inmet.acumular_arquivo)."""
+    df = sint.gerar_inmet_horario(anos)
+    arquivos = []
+    for ano, linhas in df.groupby(df['Data'].dt.year):
+        arquivos.append(os.path.join(pasta, f'inmet_{anos}_{ano}.CSV'))
+        sint.salvar_inmet_nativo(linhas, arquivos[-1], codigo='A000')
+    del df
+    return lambda: resumir({'A000': combinar_parciais([acumular_arquivo(arq)[1] for arq in arquivos])})
+
+
+@benchmark(tamanhos=(5, 20, 80), unidade='anos de histórico')
+def atualizacao_incremental_inmet(anos, pasta):
+    """Um mês novo anexado ao CSV do INMET dobrado no estado de N anos (agregacao_incremental.py)."""
+    df = sint.gerar_inmet_horario(anos)
+    arquivos = []
+    for ano, linhas in df.groupby(df['Data'].dt.year):
+        arquivos.append(os.path.join(pasta, f'incremental_{anos}_{ano}.CSV'))
+        sint.salvar_inmet_nativo(linhas, arquivos[-1], codigo='A000')
+    ultimo = linhas
+    del df
+    # Estado com o último ano até novembro; dezembro é anexado ao arquivo depois
+    sint.salvar_inmet_nativo(ultimo[ultimo['Data'].dt.month < 12], arquivos[-1], codigo='A000')
+    estado, _ = atualizar_inmet(arquivos, workers=1)
+    sint.salvar_inmet_nativo(ultimo, arquivos[-1] + '.completo', codigo='A000')
+    os.replace(arquivos[-1] + '.completo', arquivos[-1])
+    return lambda: atualizar_inmet(arquivos, estado)
+
+
+@benchmark(tamanhos=(20, 80, 320), unidade='estações x 20 anos')
+def features_agroclimaticas(n_estacoes, pasta):
+    """Graus-dia, veranicos, horas de calor e balanço hídrico por estação/ano/mês (reduções segmentadas)."""
+    diario = resumir({'A000': acumular_tabela(sint.gerar_inmet_horario(20, ano_inicial=2004))})['diario']
+    diario = pd.concat([diario.assign(Estacao=f'E{i:04d}') for i in range(n_estacoes)], ignore_index=True)
+    return lambda: calcular_features(diario)
+
+
+@benchmark(tamanhos=(25, 100, 250), unidade='anos de compostos')
+def agregacao_ndvi_mensal(anos, pasta):
+    """NDVI médio mensal (conversão de datas + groupby de analise_ndvi_mensal.py)."""
+    df = sint.gerar_satveg(anos)
+
+    def agregar():
+        datas = pd.to_datetime(df['Data'], dayfirst=True)
+        return df.groupby([datas.dt.year.rename('Ano'), datas.dt.month.rename('Mes')])['Savitzky-Golay'].mean()
+    return agregar
+
+
+@benchmark(tamanhos=(25, 100, 250), unidade='anos de compostos')
+def janelas_ndvi(anos, pasta):
+    """Índice de somas acumuladas + avaliação de ~1500 janelas fenológicas por série (indice_janelas_ndvi.py)."""
+    df = sint.gerar_satveg(anos)
+    safras = np.arange(2001, 2000 + anos)
+    produtividade = np.random.default_rng(0).normal(5, 1, len(safras))
+    deslocamentos, duracoes = grade_janelas()
+    return lambda: avaliar_janelas(construir_indices(df), safras, produtividade, deslocamentos, duracoes)
+
+
+@benchmark(tamanhos=(500, 2_000, 8_000), unidade='séries de 20 anos')
+def suavizacao_ndvi_lote(n_series, pasta):
+    """Máscara de nuvens, preenchimento de lacunas e Savitzky-Golay em lote (suavizacao_ndvi.py)."""
+    ndvi = sint.gerar_satveg(20)['NDVI'].to_numpy()
+    ruido = np.random.default_rng(0).normal(0, 0.02, (n_series, len(ndvi)))
+    matriz = ndvi + ruido
+    return lambda: suavizar_lote(matriz)
+
+
+def _sidra_em_cache(n_municipios, pasta):
+    caminho = os.path.join(pasta, f'sidra_{n_municipios}_2004.xlsx')
+    if not os.path.exists(caminho):
+        sint.salvar_sidra(sint.gerar_sidra(n_municipios, anos=20, ano_inicial=2004), caminho)
+    return caminho
+
+
+@benchmark(tamanhos=(100, 1000, 10000), unidade='municípios')
+def juncoes_correlacao_geral(n_municipios, pasta):
+    """Junções anual/mensal e matrizes .corr() de correlacao_geral.py, com produtividade de vários municípios."""
+    inmet_anual, inmet_mensal = _agregar_inmet(sint.gerar_inmet_horario(20, ano_inicial=2004))
+    satveg = sint.gerar_satveg(20, ano_inicial=2004)
+    ndvi_ano = satveg.groupby('Ano', as_index=False)['Savitzky-Golay'].mean()
+    ndvi_mensal = satveg.groupby(['Ano', 'Mês'], as_index=False)['Savitzky-Golay'].mean()
+    ndvi_mensal.columns = ['Ano', 'Mes', 'NDVI_medio']
+    prod = extrair_todos(ler_tabela_sidra(_sidra_em_cache(n_municipios, pasta)))
+
+    def juntar():
+        anual = prod.merge(ndvi_ano, on='Ano', how='inner').merge(inmet_anual, on='Ano', how='inner')
+        mensal = ndvi_mensal.merge(inmet_mensal, on=['Ano', 'Mes'], how='inner')
+        return anual.corr(numeric_only=True), mensal.corr(numeric_only=True)
+    return juntar
+
+
+# --- Correlação e modelos ------------------------------------------------------------------
+
+@benchmark(tamanhos=(1_000, 10_000, 100_000), unidade='linhas')
+def matrizes_correlacao(n, pasta):
+    """Pearson + Spearman com p-valores (correlacao_vetorizada.matrizes_pearson_spearman)."""
+    df = sint.gerar_tabela_anual(n)
+    return lambda: matrizes_pearson_spearman(df)
+
+
+def _x_y(n):
+    df = sint.gerar_tabela_anual(n)
+    return df.drop(columns=['Ano', 'Produtividade (ton/ha)']), df['Produtividade (ton/ha)']
+
+
+@benchmark(tamanhos=(1_000, 10_000, 100_000), unidade='reamostras')
+def bootstrap_ic(b, pasta):
+    """IC bootstrap de correlações, OLS e métricas numa tabela anual de 20 anos (bootstrap_ic.py)."""
+    X, y = _x_y(20)
+
+    def reamostrar():
+        indices = indices_bootstrap(len(y), b)
+        return (tabela_correlacoes(X.assign(y=y), indices=indices), tabela_ols(X, y, indices=indices),
+                tabela_metricas(y, X.iloc[:, 0], indices=indices))
+    return reamostrar
+
+
+@benchmark(tamanhos=(100, 1_000, 10_000), unidade='amostras')
+def loo_linear(n, pasta):
+    """LOO exato de OLS por um único ajuste (loo_linear.loo_linear_analitico)."""
+    X, y = _x_y(n)
+    return lambda: loo_linear_analitico(X, y)
+
+
+@benchmark(tamanhos=(10, 20, 40), unidade='amostras')
+def loo_random_forest(n, pasta):
+    """LOO do Random Forest dos scripts (validacao_loo.avaliar_loo, folds em paralelo)."""
+    from sklearn.ensemble import RandomForestRegressor
+    X, y = _x_y(n)
+    return lambda: avaliar_loo(RandomForestRegressor(n_estimators=100, random_state=42), X, y)
+
+
+# --- Imagens -------------------------------------------------------------------------------
+
+@benchmark(tamanhos=(1, 4, 16), unidade='megapixels')
+def segmentacao_kmeans(megapixels, pasta):
+    """K-means ajustado em amostra e rotulagem em blocos (segmentacao_kmeans.segmentar_imagem)."""
+    lado = int(np.sqrt(megapixels * 1e6))
+    img = sint.gerar_imagem_rgb(lado, lado)
+    return lambda: segmentar_imagem(img, n_clusters=3)
+
+
+@benchmark(tamanhos=(4, 16, 64), unidade='megapixels')
+def ingestao_raster(megapixels, pasta):
+    """NDVI médio de uma cena red/nir em .npy lida por blocos (ingestao_raster.medias_indices)."""
+    lado = int(np.sqrt(megapixels * 1e6))
+    red, nir = sint.gerar_bandas(lado, lado)
+    caminhos = [os.path.join(pasta, f'{megapixels}_{banda}.npy') for banda in ('red', 'nir')]
+    np.save(caminhos[0], red)
+    np.save(caminhos[1], nir)
+    del red, nir
+    return lambda: medias_indices(descrever_banda(caminhos[0]), descrever_banda(caminhos[1]))
+
+
+# --- Medição -------------------------------------------------------------------------------
+
+def _pico_execucao(funcao):
+    """(pico do tracemalloc, maior RSS dos processos filhos) de uma execução de `funcao`, em MB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if resource is None:
+        return pico / 2 ** 20, None
+    # Os workers do joblib só entram em RUSAGE_CHILDREN depois de encerrados
+    get_reusable_executor().shutdown(wait=True)
+    return pico / 2 ** 20, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / KB_RSS
+
+
+def _enviar_pico(funcao, conexao):
+    conexao.send(_pico_execucao(funcao))
+    conexao.close()
+
+
+def medir_memoria(funcao):
+    """
+    Memória de uma execução em um processo novo (fork): os contadores de RUSAGE_CHILDREN começam
+    zerados, então nem a preparação dos dados nem as etapas anteriores entram no RSS dos filhos.
+    Sem fork/resource (Windows), mede só o tracemalloc no próprio processo.
+    """
+    if resource is None or 'fork' not in multiprocessing.get_all_start_methods():
+        return _pico_execucao(funcao)
+    get_reusable_executor().shutdown(wait=True)  # o fork não herda workers vivos
+    contexto = multiprocessing.get_context('fork')
+    leitura, escrita = contexto.Pipe(duplex=False)
+    processo = contexto.Process(target=_enviar_pico, args=(funcao, escrita))
+    processo.start()
+    escrita.close()
+    try:
+        return leitura.recv()
+    finally:
+        processo.join()
+
+
+def medir(funcao, repeticoes=REPETICOES):
+    """
+    Tempo (menor e mediano de `repeticoes` execuções) e memória (outra execução, em medir_memoria):
+    pico do tracemalloc e maior RSS dos processos filhos.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    pico, pico_filhos = medir_memoria(funcao)
+    return {
+        'tempo_min_s': min(tempos),
+        'tempo_mediano_s': statistics.median(tempos),
+        'pico_memoria_mb': pico,
+        'pico_rss_filhos_mb': pico_filhos,
+    }
+
+
+def expoente_escala(tamanhos, valores):
+    """Inclinação log-log de valor x tamanho (1 = linear, 2 = quadrático); None com menos de 2 pontos."""
+    pares = [(t, v) for t, v in zip(tamanhos, valores) if t > 0 and v > 0]
+    if len(pares) < 2:
+        return None
+    t, v = np.log(np.array(pares, dtype=float)).T
+    return float(np.polyfit(t, v, 1)[0])
+
+
+def commit_atual():
+    """Hash curto do commit (com '+modificado' se houver alterações não commitadas), ou None fora do git."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        sujo = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('+modificado' if sujo else '')
+
+
+def ambiente():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def executar_benchmarks(nomes=None, escala=1.0, rapido=False, repeticoes=REPETICOES):
+    """Executa os benchmarks e devolve o relatório (dicionário serializável em JSON)."""
+    nomes = nomes or list(BENCHMARKS)
+    desconhecidos = [n for n in nomes if n not in BENCHMARKS]
+    if desconhecidos:
+        raise KeyError(f'Benchmarks não registrados: {desconhecidos}')
+
+    resultados, escalonamento = [], {}
+    diretorio_cache_original = cache_dados.DIR_CACHE
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as pasta:
+        cache_dados.DIR_CACHE = os.path.join(pasta, 'cache')
+        try:
+            for nome in nomes:
+                info = BENCHMARKS[nome]
+                tamanhos = [max(1, int(round(t * escala))) for t in info['tamanhos']]
+                tamanhos = tamanhos[:1] if rapido else tamanhos
+                medidas = []
+                for tamanho in tamanhos:
+                    funcao = info['preparar'](tamanho, pasta)
+                    medida = medir(funcao, repeticoes)
+                    del funcao
+                    medidas.append(medida)
+                    resultados.append({'benchmark': nome, 'tamanho': tamanho, 'unidade': info['unidade'],
+                                       'repeticoes': repeticoes, **medida})
+                    filhos = medida['pico_rss_filhos_mb']
+                    print(f'{nome:<30} {tamanho:>8} {info["unidade"]:<18} {medida["tempo_min_s"]:>9.4f}s '
+                          f'{medida["pico_memoria_mb"]:>9.1f} MB'
+                          + (f' (filhos: {filhos:.1f} MB)' if filhos else ''), flush=True)
+                escalonamento[nome] = {
+                    'expoente_tempo': expoente_escala(tamanhos, [m['tempo_min_s'] for m in medidas]),
+                    'expoente_memoria': expoente_escala(tamanhos, [m['pico_memoria_mb'] for m in medidas]),
+                }
+        finally:
+            cache_dados.DIR_CACHE = diretorio_cache_original
+
+    return {
+        'commit': commit_atual(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'ambiente': ambiente(),
+        'escala': escala,
+        'resultados': resultados,
+        'escalonamento': escalonamento,
+    }
+
+
+def _tabela_resultados(relatorio):
+    tabela = pd.DataFrame(relatorio['resultados'])
+    if 'pico_rss_filhos_mb' not in tabela:  # relatórios anteriores à medição dos processos filhos
+        tabela['pico_rss_filhos_mb'] = np.nan
+    tabela['pico_rss_filhos_mb'] = tabela['pico_rss_filhos_mb'].astype(float)
+    return tabela
+
+
+def comparar(caminho_base, caminho_novo, limiar=LIMIAR_REGRESSAO):
+    """
+    Compara dois relatórios nas medições em comum (mesmo benchmark e tamanho).
+    Retorna a tabela de razões novo/base e a lista de regressões (razão > 1 + limiar).
+    A razão da memória dos filhos só existe quando a base tinha processos filhos.
+    """
+    with open(caminho_base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(caminho_novo, encoding='utf-8') as f:
+        novo = json.load(f)
+    chave = ['benchmark', 'tamanho']
+    tabela = _tabela_resultados(base).merge(_tabela_resultados(novo), on=chave, suffixes=('_base', '_novo'))
+    tabela['razao_tempo'] = tabela['tempo_min_s_novo'] / tabela['tempo_min_s_base']
+    tabela['razao_memoria'] = tabela['pico_memoria_mb_novo'] / tabela['pico_memoria_mb_base']
+    filhos_base = tabela['pico_rss_filhos_mb_base']
+    tabela['razao_memoria_filhos'] = tabela['pico_rss_filhos_mb_novo'] / filhos_base.where(filhos_base > 0)
+    tabela = tabela[chave + ['tempo_min_s_base', 'tempo_min_s_novo', 'razao_tempo',
+                             'pico_memoria_mb_base', 'pico_memoria_mb_novo', 'razao_memoria',
+                             'pico_rss_filhos_mb_base', 'pico_rss_filhos_mb_novo', 'razao_memoria_filhos']]
+    regressoes = tabela[(tabela['razao_tempo'] > 1 + limiar) | (tabela['razao_memoria'] > 1 + limiar)
+                        | (tabela['razao_memoria_filhos'] > 1 + limiar)]
+    return tabela, regressoes, base.get('commit'), novo.get('commit')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks das etapas sobre dados sintéticos.')
+    parser.add_argument('benchmarks', nargs='*', help=f'nomes (padrão: todos): {", ".join(BENCHMARKS)}')
+    parser.add_argument('--escala', type=float, default=1.0, help='multiplica os tamanhos padrão')
+    parser.add_argument('--rapido', action='store_true', help='apenas o menor tamanho de cada benchmark')
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES)
+    parser.add_argument('--saida', help='arquivo JSON (padrão: resultados/benchmarks/<commit>.json)')
+    parser.add_argument('--comparar', nargs=2, metavar=('BASE', 'NOVO'), help='compara dois relatórios JSON')
+    parser.add_argument('--limiar', type=float, default=LIMIAR_REGRESSAO,
+                        help='piora relativa considerada regressão em --comparar (padrão: 0.15)')
+    args = parser.parse_args()
+
+    if args.comparar:
+        tabela, regressoes, commit_base, commit_novo = comparar(*args.comparar, limiar=args.limiar)
+        print(f'Base: {commit_base}  Novo: {commit_novo}\n')
+        print(tabela.to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+        if len(regressoes):
+            print(f'\n{len(regressoes)} regressões acima de {args.limiar:.0%}:')
+            print(regressoes[['benchmark', 'tamanho', 'razao_tempo', 'razao_memoria',
+                              'razao_memoria_filhos']].to_string(index=False))
+        else:
+            print(f'\nNenhuma regressão acima de {args.limiar:.0%}.')
+        sys.exit(1 if len(regressoes) else 0)
+
+    relatorio = executar_benchmarks(args.benchmarks, args.escala, args.rapido, args.repeticoes)
+    print('\nExpoente de escala (tempo / memória):')
+    for nome, exp in relatorio['escalonamento'].items():
+        tempo, memoria = ('-' if v is None else f'{v:.2f}' for v in (exp['expoente_tempo'], exp['expoente_memoria']))
+        print(f'  {nome:<30} {tempo:>6} / {memoria}')
+
+    saida = args.saida or os.path.join(PASTA_RESULTADOS, f'{relatorio["commit"] or "sem_commit"}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f'\nResultados salvos em {saida}')
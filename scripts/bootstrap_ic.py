@@ -0,0 +1,135 @@
+"""
+Intervalos de confiança bootstrap (percentis) para correlações, coeficientes de OLS e métricas de erro.
+- A matriz de índices das reamostras (B x n) é sorteada uma única vez e serve a todas as estatísticas
+- Cada estatística sai para as B reamostras de uma vez, com operações NumPy sobre arrays (B, n, k):
+  correlações por einsum das colunas centradas, Spearman sobre os postos de cada reamostra
+  (rankdata no eixo 1), OLS pela pseudoinversa empilhada (np.linalg.pinv em (B, n, p)) e
+  R²/MAE/RMSE por reduções no eixo 1
+- Reamostras degeneradas (coluna constante, desenho do OLS sem posto completo) dão NaN e ficam fora
+  dos percentis; a coluna B_validas informa quantas sobraram
+- Entradas com NaN são rejeitadas (ValueError): as linhas incompletas devem sair (dropna) antes de
+  sortear os índices, senão as reamostras que as sorteiam viram NaN e os percentis ficam enviesados
+
+Com quatro a poucos anos por município os intervalos são largos, e é essa a informação que faltava ao
+lado das estimativas pontuais. Na regressão múltipla com n = p + 1, só as reamostras com todas as
+linhas distintas têm posto completo, e elas repetem o ajuste original: o intervalo tem largura zero e
+não informa nada (veja B_validas).
+
+Uso:
+    from bootstrap_ic import indices_bootstrap, tabela_correlacoes, tabela_ols, tabela_metricas
+    indices = indices_bootstrap(len(df))                      # B = 10.000
+    tabela_correlacoes(df[colunas], indices=indices)           # um par de variáveis por linha
+    tabela_ols(df[['Savitzky-Golay']], df['Produtividade (ton/ha)'], indices=indices)
+    tabela_metricas(y_real, y_pred)                            # R², MAE, RMSE com IC
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+B = 10_000
+NIVEL = 0.95
+SEMENTE = 42
+
+
+def indices_bootstrap(n, b=B, semente=SEMENTE):
+    """Matriz (b, n) de índices sorteados com reposição: cada linha é uma reamostra."""
+    return np.random.default_rng(semente).integers(0, n, size=(b, n))
+
+
+def intervalo(amostras, nivel=NIVEL):
+    """Percentis (inferior, superior) ao longo do eixo 0, ignorando reamostras NaN."""
+    alfa = (1 - nivel) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # estatística sem nenhuma reamostra válida
+        return np.nanquantile(amostras, [alfa, 1 - alfa], axis=0)
+
+
+def correlacoes_bootstrap(valores, indices, metodo='pearson'):
+    """Matrizes de correlação (B, k, k) das reamostras de `valores` (n x k)."""
+    amostras = np.asarray(valores, dtype=float)[indices]          # (B, n, k)
+    constante = np.ptp(amostras, axis=1) == 0                     # (B, k)
+    if metodo == 'spearman':
+        amostras = rankdata(amostras, axis=1)
+    centradas = amostras - amostras.mean(axis=1, keepdims=True)
+    cov = np.einsum('bni,bnj->bij', centradas, centradas)
+    desvio = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    desvio = np.where(constante, np.nan, desvio)
+    r = cov / (desvio[:, :, None] * desvio[:, None, :])
+    return np.clip(r, -1.0, 1.0)
+
+
+def ols_bootstrap(X, y, indices):
+    """Coeficientes (B, p + 1) do OLS com intercepto; reamostras sem posto completo ficam NaN."""
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    Xa = np.column_stack([np.ones(len(X)), X])[indices]           # (B, n, p + 1)
+    ya = np.asarray(y, dtype=float)[indices]                      # (B, n)
+    coef = (np.linalg.pinv(Xa) @ ya[:, :, None])[:, :, 0]
+    coef[np.linalg.matrix_rank(Xa) < Xa.shape[2]] = np.nan
+    return coef
+
+
+def metricas_bootstrap(y_real, y_pred, indices):
+    """R², MAE e RMSE de cada reamostra dos pares (real, predito): dicionário de arrays (B,)."""
+    real = np.asarray(y_real, dtype=float)[indices]
+    erro = real - np.asarray(y_pred, dtype=float)[indices]
+    sqt = ((real - real.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    sqr = (erro ** 2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(sqt > 0, 1 - sqr / sqt, np.nan)
+    return {'R2': r2, 'MAE': np.abs(erro).mean(axis=1), 'RMSE': np.sqrt(sqr / real.shape[1])}
+
+
+def _exigir_completos(*dados):
+    if any(np.isnan(np.asarray(d, dtype=float)).any() for d in dados):
+        raise ValueError('Valores ausentes (NaN): remova as linhas incompletas (dropna) antes do bootstrap.')
+
+
+def _colunas_ic(tabela, nome, pontual, amostras, nivel):
+    inferior, superior = intervalo(amostras, nivel)
+    tabela[nome] = pontual
+    tabela[f'{nome}_IC_inf'] = inferior
+    tabela[f'{nome}_IC_sup'] = superior
+    tabela[f'{nome}_B_validas'] = np.isfinite(amostras).sum(axis=0)
+    return tabela
+
+
+def tabela_correlacoes(df, metodos=('pearson', 'spearman'), indices=None, nivel=NIVEL):
+    """Uma linha por par de colunas de `df`, com a correlação de cada método e seu IC."""
+    valores = df.to_numpy(dtype=float)
+    _exigir_completos(valores)
+    indices = indices_bootstrap(len(valores)) if indices is None else indices
+    colunas = np.asarray(df.columns)
+    i, j = np.triu_indices(len(colunas), k=1)
+    tabela = pd.DataFrame({'Variavel_1': colunas[i], 'Variavel_2': colunas[j]})
+    todas = np.arange(len(valores))[None, :]
+    for metodo in metodos:
+        pontual = correlacoes_bootstrap(valores, todas, metodo)[0, i, j]
+        amostras = correlacoes_bootstrap(valores, indices, metodo)[:, i, j]
+        _colunas_ic(tabela, metodo.capitalize(), pontual, amostras, nivel)
+    return tabela
+
+
+def tabela_ols(X, y, indices=None, nivel=NIVEL):
+    """Uma linha por termo (Intercepto + colunas de X): coeficiente do OLS e seu IC."""
+    _exigir_completos(X, y)
+    indices = indices_bootstrap(len(y)) if indices is None else indices
+    termos = ['Intercepto'] + list(X.columns if hasattr(X, 'columns') else [getattr(X, 'name', 'x')])
+    pontual = ols_bootstrap(X, y, np.arange(len(y))[None, :])[0]
+    tabela = pd.DataFrame({'Termo': termos})
+    return _colunas_ic(tabela, 'Coeficiente', pontual, ols_bootstrap(X, y, indices), nivel)
+
+
+def tabela_metricas(y_real, y_pred, indices=None, nivel=NIVEL):
+    """R², MAE e RMSE das previsões (ex.: LOO) com IC, reamostrando os pares (real, predito)."""
+    _exigir_completos(y_real, y_pred)
+    indices = indices_bootstrap(len(y_real)) if indices is None else indices
+    pontual = metricas_bootstrap(y_real, y_pred, np.arange(len(y_real))[None, :])
+    amostras = metricas_bootstrap(y_real, y_pred, indices)
+    linhas = []
+    for nome in amostras:
+        inferior, superior = intervalo(amostras[nome], nivel)
+        linhas.append({'Metrica': nome, 'Valor': pontual[nome][0], 'IC_inf': inferior, 'IC_sup': superior,
+                       'B_validas': int(np.isfinite(amostras[nome]).sum())})
+    return pd.DataFrame(linhas)
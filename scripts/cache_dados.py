@@ -0,0 +1,243 @@
+"""
+Cache colunar (Parquet) para os arquivos brutos do projeto (SATVeg, SIDRA, INMET).
+- Converte cada planilha Excel uma única vez para Parquet tipado
+- A chave do cache é o hash SHA-256 do conteúdo do arquivo de origem + parâmetros de leitura
+- Quando o arquivo de origem muda, a entrada antiga é descartada e o cache é refeito
+- Gravação atômica (arquivo temporário + os.replace, metadados por último): processos paralelos
+  do pipeline que leem a mesma planilha nunca veem uma entrada pela metade
+
+Uso:
+    from cache_dados import ler_excel_cache
+    df = ler_excel_cache('../dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx')
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import date, datetime, time
+
+import pandas as pd
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+DIR_CACHE = os.path.join(DIR_SCRIPTS, '..', '.cache', 'brutos')
+TAMANHO_BLOCO_HASH = 1024 * 1024
+FORMATO = 2  # versão do formato das entradas (2: tipo original de cada célula das colunas mistas)
+
+# Tipo original da célula -> conversão do texto gravado de volta para o valor
+RESTAURADORES = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': lambda texto: texto == 'True',
+    'datetime': datetime.fromisoformat,
+    'date': date.fromisoformat,
+    'time': time.fromisoformat,
+    'Timestamp': pd.Timestamp,
+}
+
+
+def hash_arquivo(caminho):
+    """Calcula o SHA-256 do conteúdo do arquivo, lendo em blocos de 1 MB."""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def modulos_locais(script, vistos=None):
+    """
+    Script + módulos de scripts/ que ele importa (recursivamente), como nomes de arquivo: o hash de
+    todos eles é a versão do código de quem depende do script (etapas do pipeline, manifestos).
+    """
+    vistos = vistos if vistos is not None else []
+    if script in vistos:
+        return vistos
+    vistos.append(script)
+    with open(os.path.join(DIR_SCRIPTS, script), encoding='utf-8') as f:
+        codigo = f.read()
+    for nome in re.findall(r'^\s*(?:from|import)\s+(\w+)', codigo, flags=re.MULTILINE):
+        if os.path.exists(os.path.join(DIR_SCRIPTS, nome + '.py')):
+            modulos_locais(nome + '.py', vistos)
+    return vistos
+
+
+def gravar_atomico(destino, escrever):
+    """
+    Chama `escrever(caminho_temporario)` e move o resultado para `destino` com os.replace:
+    quem lê `destino` vê o arquivo antigo ou o novo completo, nunca um arquivo pela metade.
+    """
+    pasta = os.path.dirname(destino) or '.'
+    os.makedirs(pasta, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(prefix=os.path.basename(destino) + '.', suffix='.tmp', dir=pasta)
+    os.close(fd)
+    try:
+        escrever(temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def gravar_json_atomico(destino, dados):
+    def escrever(caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+    gravar_atomico(destino, escrever)
+
+
+def _chave_cache(hash_origem, aba, parametros):
+    # Parâmetros de leitura (skiprows, header...) entram na chave: mesma planilha lida
+    # de formas diferentes gera entradas diferentes
+    texto = json.dumps({'aba': str(aba), 'parametros': parametros, 'formato': FORMATO}, sort_keys=True, default=str)
+    return hashlib.sha256((hash_origem + texto).encode('utf-8')).hexdigest()[:20]
+
+
+def _prefixo(caminho, aba):
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    return f'{nome}__{aba}'.replace(' ', '_').replace(os.sep, '_')
+
+
+def _arquivo_cache(caminho, aba, chave):
+    return os.path.join(DIR_CACHE, f'{_prefixo(caminho, aba)}__{chave}.parquet')
+
+
+def _para_parquet(df):
+    """
+    Prepara o DataFrame para Parquet. Retorna (df_convertido, metadados).
+    Colunas com tipos misturados (ex.: SIDRA, números e '-') são gravadas como texto, com o tipo
+    original de cada célula numa coluna auxiliar (o texto '007' volta como texto, o número 7 como
+    número); nomes de colunas não-texto também são registrados.
+    """
+    df = df.copy()
+    colunas_inteiras = all(isinstance(c, int) for c in df.columns)
+    mistas = []
+    for i, col in enumerate(df.columns):
+        serie = df[col]
+        if serie.dtype == object:
+            tipos = {type(v) for v in serie.dropna()}
+            if len(tipos) > 1 or (tipos and tipos != {str}):
+                df[f'__tipo__{i}'] = serie.map(lambda v: None if pd.isna(v) else type(v).__name__).astype(object)
+                df[col] = serie.map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+                mistas.append(i)
+    df.columns = [str(c) for c in df.columns]
+    return df, {'colunas_inteiras': colunas_inteiras, 'colunas_mistas': mistas, 'formato': FORMATO}
+
+
+def _restaurar_coluna(textos, tipos):
+    """Desfaz a conversão para texto de uma coluna mista usando o tipo registrado de cada célula."""
+    valores = textos.astype(object).to_numpy(copy=True)
+    tipos = tipos.to_numpy()
+    for nome in pd.unique(tipos[pd.notna(tipos)]):
+        restaurar = RESTAURADORES.get(nome)
+        if restaurar is None:
+            continue  # tipo sem conversão conhecida: fica o texto
+        posicoes = (tipos == nome).nonzero()[0]
+        valores[posicoes] = [restaurar(v) for v in valores[posicoes]]
+    return pd.Series(valores, index=textos.index, name=textos.name, dtype=object)
+
+
+def _de_parquet(df, metadados):
+    for i in metadados['colunas_mistas']:
+        df.isetitem(i, _restaurar_coluna(df.iloc[:, i], df[f'__tipo__{i}']))
+    df = df.drop(columns=[f'__tipo__{i}' for i in metadados['colunas_mistas']])
+    if metadados['colunas_inteiras']:
+        df.columns = [int(c) for c in df.columns]
+    return df
+
+
+def _remover_entradas_antigas(prefixo, hash_origem):
+    """Apaga as entradas desta aba geradas a partir de uma versão anterior do arquivo de origem."""
+    if not os.path.isdir(DIR_CACHE):
+        return
+    for nome in os.listdir(DIR_CACHE):
+        if not (nome.startswith(prefixo + '__') and nome.endswith('.json')):
+            continue
+        arq_meta = os.path.join(DIR_CACHE, nome)
+        try:
+            with open(arq_meta, encoding='utf-8') as f:
+                metadados = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue  # removida (ou sendo regravada) por outro processo
+        if metadados.get('hash_origem') == hash_origem and metadados.get('formato') == FORMATO:
+            continue
+        for arq in (arq_meta, arq_meta[:-len('.json')] + '.parquet'):
+            try:
+                os.remove(arq)
+            except FileNotFoundError:
+                pass
+
+
+def carregar_com_cache(caminho, leitor, aba='dados', **parametros):
+    """
+    Lê um arquivo bruto usando o cache Parquet.
+    `leitor(caminho, **parametros)` só é chamado quando o cache não existe ou está desatualizado.
+    """
+    return _carregar(caminho, hash_arquivo(caminho), leitor, aba, parametros)
+
+
+def _carregar(caminho, hash_origem, leitor, aba, parametros):
+    chave = _chave_cache(hash_origem, aba, parametros)
+    prefixo = _prefixo(caminho, aba)
+    arq_dados = _arquivo_cache(caminho, aba, chave)
+    arq_meta = arq_dados[:-len('.parquet')] + '.json'
+
+    if _entrada_completa(arq_dados):
+        try:
+            with open(arq_meta, encoding='utf-8') as f:
+                metadados = json.load(f)
+            return _de_parquet(pd.read_parquet(arq_dados), metadados)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass  # apagada por outro processo entre a verificação e a leitura: recalcula
+
+    df = leitor(caminho, **parametros)
+    os.makedirs(DIR_CACHE, exist_ok=True)
+    _remover_entradas_antigas(prefixo, hash_origem)
+    df_parquet, metadados = _para_parquet(df)
+    metadados['origem'] = os.path.abspath(caminho)
+    metadados['hash_origem'] = hash_origem
+    # Parquet primeiro, metadados por último: a entrada só conta como pronta quando o .json existe
+    gravar_atomico(arq_dados, lambda temporario: df_parquet.to_parquet(temporario, index=False))
+    gravar_json_atomico(arq_meta, metadados)
+    return df
+
+
+def _entrada_completa(arq_dados):
+    return os.path.exists(arq_dados) and os.path.exists(arq_dados[:-len('.parquet')] + '.json')
+
+
+def ler_excel_cache(caminho, sheet_name=0, **kwargs):
+    """
+    Equivalente a pd.read_excel com cache Parquet por aba.
+    Com sheet_name=None (ou lista), a pasta de trabalho é aberta uma única vez
+    e todas as abas pedidas são convertidas de uma vez; retorna dict como o pandas.
+    """
+    if sheet_name is not None and not isinstance(sheet_name, list):
+        return carregar_com_cache(caminho, pd.read_excel, aba=sheet_name, sheet_name=sheet_name, **kwargs)
+
+    hash_origem = hash_arquivo(caminho)
+    if sheet_name is None:
+        # A lista de abas também fica no cache, para não abrir a pasta de trabalho à toa
+        sheet_name = _carregar(
+            caminho, hash_origem, lambda c: pd.DataFrame({'aba': pd.ExcelFile(c).sheet_names}), '_abas', {}
+        )['aba'].tolist()
+    faltando = [
+        aba for aba in sheet_name
+        if not _entrada_completa(_arquivo_cache(caminho, aba, _chave_cache(hash_origem, aba, dict(sheet_name=aba, **kwargs))))
+    ]
+    lidas = pd.read_excel(caminho, sheet_name=faltando, **kwargs) if faltando else {}
+
+    abas = {}
+    for aba in sheet_name:
+        parametros = dict(sheet_name=aba, **kwargs)
+        # Uma entrada removida por outro processo depois da verificação é lida de novo da planilha
+        abas[aba] = _carregar(caminho, hash_origem,
+                              lambda c, **p: lidas[aba] if aba in lidas else pd.read_excel(c, **p), aba, parametros)
+    return abas
+
+
+def ler_csv_cache(caminho, **kwargs):
+    """Equivalente a pd.read_csv com cache Parquet (útil para CSVs brutos grandes)."""
+    return carregar_com_cache(caminho, pd.read_csv, aba='csv', **kwargs)
@@ -0,0 +1,160 @@
+"""
+Cache persistente de resultados de validação cruzada e de modelos ajustados.
+- Chave = hash de (matriz X com nomes das colunas, y, classe do estimador, hiperparâmetros
+  incluindo random_state, esquema de validação, versão do scikit-learn, `extra`). Cada chamador
+  passa em `extra` a função que calcula e o hash dos módulos que a implementam (versao_codigo):
+  resultados de funções diferentes não se misturam e editar o código invalida as entradas
+- Gravação atômica (arquivo temporário + os.replace, metadados por último): os scripts que rodam
+  em paralelo no pipeline e pedem a mesma chave nunca leem um arquivo pela metade; uma entrada
+  ilegível ou apagada por outro processo é simplesmente recalculada
+- Reexecuções com os mesmos dados e configuração devolvem o resultado salvo na hora
+- Invalidação: mudar integrado_*.csv muda a chave; além disso, entradas registradas para um
+  arquivo de origem cujo conteúdo mudou são apagadas na próxima consulta
+- Despejo por idade (dias) e por tamanho total (MB), removendo primeiro as menos usadas
+
+Uso:
+    from cache_resultados import em_cache, versao_codigo
+    resultado = em_cache(lambda: avaliar_loo(modelo, X, y), X, y, modelo, 'LeaveOneOut()',
+                         origem='../dados_processados/integrado_anual.csv',
+                         extra={'funcao': 'validacao_loo.avaliar_loo', 'codigo': versao_codigo(validacao_loo)})
+"""
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import sklearn
+
+from cache_dados import gravar_atomico, gravar_json_atomico, hash_arquivo
+
+DIR_CACHE_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'resultados')
+TAMANHO_MAXIMO_MB = 500
+IDADE_MAXIMA_DIAS = 30
+
+
+def versao_codigo(*modulos):
+    """Hash do código-fonte dos módulos (objetos de módulo ou caminhos de arquivo)."""
+    h = hashlib.sha256()
+    for modulo in modulos:
+        h.update(hash_arquivo(getattr(modulo, '__file__', modulo)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _atualizar_hash_dados(h, dados):
+    if hasattr(dados, 'columns'):
+        h.update(json.dumps([str(c) for c in dados.columns]).encode('utf-8'))
+    valores = np.ascontiguousarray(np.asarray(dados, dtype=float))
+    h.update(str(valores.shape).encode('utf-8'))
+    h.update(valores.tobytes())
+
+
+def chave_resultado(X, y, modelo, esquema_cv, extra=None):
+    """Hash SHA-256 que identifica (dados, estimador, hiperparâmetros, validação)."""
+    h = hashlib.sha256()
+    _atualizar_hash_dados(h, X)
+    _atualizar_hash_dados(h, y)
+    classe = f'{type(modelo).__module__}.{type(modelo).__qualname__}'
+    parametros = sorted((k, repr(v)) for k, v in modelo.get_params(deep=True).items())
+    h.update(json.dumps({
+        'classe': classe,
+        'parametros': parametros,
+        'cv': str(esquema_cv),
+        'sklearn': sklearn.__version__,
+        'extra': extra,
+    }, default=str).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _arquivos(chave):
+    base = os.path.join(DIR_CACHE_RESULTADOS, chave)
+    return base + '.joblib', base + '.json'
+
+
+def _metadados():
+    if not os.path.isdir(DIR_CACHE_RESULTADOS):
+        return []
+    entradas = []
+    for nome in os.listdir(DIR_CACHE_RESULTADOS):
+        if nome.endswith('.json'):
+            try:
+                with open(os.path.join(DIR_CACHE_RESULTADOS, nome), encoding='utf-8') as f:
+                    entradas.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue  # removida ou ilegível: tratada como ausente
+    return entradas
+
+
+def remover(chave):
+    for arq in _arquivos(chave):
+        try:
+            os.remove(arq)
+        except FileNotFoundError:
+            pass
+
+
+def invalidar_origem(origem):
+    """Apaga as entradas calculadas a partir de uma versão anterior do arquivo `origem`."""
+    origem = os.path.abspath(origem)
+    hash_atual = hash_arquivo(origem) if os.path.exists(origem) else None
+    for meta in _metadados():
+        if meta.get('origem') == origem and meta.get('hash_origem') != hash_atual:
+            remover(meta['chave'])
+
+
+def limpar_cache(tamanho_maximo_mb=TAMANHO_MAXIMO_MB, idade_maxima_dias=IDADE_MAXIMA_DIAS):
+    """Remove entradas mais velhas que o limite e, se preciso, as menos usadas até caber no tamanho."""
+    agora = time.time()
+    entradas = []
+    for meta in _metadados():
+        arq_dados, _ = _arquivos(meta['chave'])
+        try:
+            ultimo_uso, tamanho = os.path.getmtime(arq_dados), os.path.getsize(arq_dados)
+        except FileNotFoundError:
+            remover(meta['chave'])
+            continue
+        if agora - ultimo_uso > idade_maxima_dias * 86400:
+            remover(meta['chave'])
+            continue
+        entradas.append((ultimo_uso, tamanho, meta['chave']))
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, chave in sorted(entradas):
+        if total <= tamanho_maximo_mb * 1024 * 1024:
+            break
+        remover(chave)
+        total -= tamanho
+
+
+def em_cache(calcular, X, y, modelo, esquema_cv, origem=None, extra=None):
+    """
+    Devolve o resultado salvo para (X, y, modelo, esquema_cv) ou executa `calcular()`
+    e guarda o retorno (qualquer objeto serializável pelo joblib, inclusive estimadores).
+    `extra` identifica quem calcula: {'funcao': ..., 'codigo': versao_codigo(...)}.
+    """
+    if origem is not None:
+        invalidar_origem(origem)
+    chave = chave_resultado(X, y, modelo, esquema_cv, extra)
+    arq_dados, arq_meta = _arquivos(chave)
+    if os.path.exists(arq_dados) and os.path.exists(arq_meta):
+        try:
+            os.utime(arq_dados)  # marca o uso para o despejo LRU
+            return joblib.load(arq_dados)
+        except (FileNotFoundError, EOFError):
+            pass  # removida por outro processo entre a verificação e a leitura: recalcula
+
+    resultado = calcular()
+    gravar_atomico(arq_dados, lambda temporario: joblib.dump(resultado, temporario))
+    origem_abs = os.path.abspath(origem) if origem is not None else None
+    gravar_json_atomico(arq_meta, {
+        'chave': chave,
+        'modelo': type(modelo).__name__,
+        'cv': str(esquema_cv),
+        'funcao': extra.get('funcao') if isinstance(extra, dict) else None,
+        'origem': origem_abs,
+        'hash_origem': hash_arquivo(origem_abs) if origem_abs else None,
+        'criado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+    })
+    limpar_cache()
+    return resultado
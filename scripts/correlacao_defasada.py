@@ -0,0 +1,88 @@
+"""
+Correlação cruzada com defasagens (lags) entre o NDVI mensal e as variáveis climáticas.
+- Reindexa a série em um calendário mensal completo: meses sem dado viram NaN,
+  então um lag de L meses nunca "pula" lacunas entre anos
+- Calcula todos os lags 0..N para todas as variáveis de uma vez, com deslocamentos em
+  lote (janelas deslizantes sobre a matriz) e somas mascaradas, sem um pearsonr por lag
+- Saída em formato longo: lag x variável, com r, n de pares e p-valor
+
+Convenção: lag L = clima no mês t-L comparado com o NDVI no mês t.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from correlacao_vetorizada import p_valores
+
+
+def serie_mensal_continua(df, colunas):
+    """Reindexa (Ano, Mes) para um calendário mensal sem lacunas; meses ausentes ficam NaN."""
+    indice_mes = (df['Ano'].astype(int) * 12 + df['Mes'].astype(int) - 1).to_numpy()
+    if len(np.unique(indice_mes)) != len(indice_mes):
+        raise ValueError('Há meses repetidos na série; agregue por (Ano, Mes) antes.')
+    continuo = np.arange(indice_mes.min(), indice_mes.max() + 1)
+    serie = pd.DataFrame(df[colunas].to_numpy(dtype=float), index=indice_mes, columns=colunas)
+    serie = serie.reindex(continuo)
+    serie.insert(0, 'Mes', continuo % 12 + 1)
+    serie.insert(0, 'Ano', continuo // 12)
+    return serie.reset_index(drop=True)
+
+
+def correlacao_cruzada(df, alvo='NDVI_medio', variaveis=None, max_lag=12):
+    """
+    Correlação de Pearson entre `alvo` no mês t e cada variável no mês t-L, L = 0..max_lag.
+    Retorna DataFrame com colunas: lag, variavel, r, n, p_valor.
+    """
+    if variaveis is None:
+        variaveis = [c for c in df.select_dtypes('number').columns if c not in ('Ano', 'Mes', alvo)]
+    serie = serie_mensal_continua(df, [alvo] + list(variaveis))
+    # Centrar pelas médias não altera r e melhora a precisão das somas
+    y = serie[alvo].to_numpy()
+    y = y - np.nanmean(y)
+    x = serie[list(variaveis)].to_numpy()
+    x = x - np.nanmean(x, axis=0)
+    t, k = x.shape
+
+    # x_pad tem max_lag linhas de NaN no início; a janela L começa em (max_lag - L),
+    # então defasados[L][i] = x[i - L] — todos os lags como visões da mesma memória
+    x_pad = np.vstack([np.full((max_lag, k), np.nan), x])
+    janelas = sliding_window_view(x_pad, t, axis=0)          # (max_lag+1, k, t)
+    defasados = janelas[::-1]                                 # índice 0 = lag 0
+
+    valido = ~np.isnan(defasados) & ~np.isnan(y)[None, None, :]
+    m = valido.astype(float)
+    xv = np.where(valido, defasados, 0.0)
+    yv = np.where(valido, y[None, None, :], 0.0)
+
+    n = m.sum(axis=2)
+    sx, sy = xv.sum(axis=2), yv.sum(axis=2)
+    sxx, syy, sxy = (xv * xv).sum(axis=2), (yv * yv).sum(axis=2), (xv * yv).sum(axis=2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        r = cov / np.sqrt((sxx - sx ** 2 / n) * (syy - sy ** 2 / n))
+    r = np.clip(r, -1.0, 1.0)
+    r[n < 3] = np.nan
+    p = p_valores(r, n)
+
+    lags = np.repeat(np.arange(max_lag + 1), k)
+    return pd.DataFrame({
+        'lag': lags,
+        'variavel': np.tile(np.asarray(variaveis, dtype=object), max_lag + 1),
+        'r': r.ravel(),
+        'n': n.ravel().astype(int),
+        'p_valor': p.ravel(),
+    })
+
+
+def melhores_lags(tabela, alfa=0.05):
+    """
+    Para cada variável, o lag de maior |r| e se ele é significativo ao nível `alfa`.
+    Variáveis sem r em nenhum lag (coluna constante ou vazia) ficam com lag e r ausentes.
+    """
+    validas = tabela.dropna(subset=['r'])
+    idx = validas.assign(abs_r=validas['r'].abs()).groupby('variavel')['abs_r'].idxmax()
+    sem_r = tabela[~tabela['variavel'].isin(validas['variavel'])].drop_duplicates('variavel')
+    sem_r = sem_r.assign(lag=pd.NA)
+    melhores = pd.concat([tabela.loc[idx], sem_r]).sort_values('variavel').reset_index(drop=True)
+    melhores['lag'] = melhores['lag'].astype('Int64')
+    melhores['significativo'] = (melhores['p_valor'] < alfa).fillna(False).astype(bool)
+    return melhores
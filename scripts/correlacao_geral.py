@@ -2,51 +2,82 @@
 Script para gerar matrizes de correlação e gráficos entre NDVI, clima (INMET) e produtividade (IBGE),
 tanto na granularidade anual quanto mensal.
 Salva outputs em dados_processados/ e resultados/.
+
+Se features_agroclimaticas.py já tiver gerado as variáveis agroclimáticas (graus-dia, veranicos,
+horas de calor, balanço hídrico), elas entram nas tabelas integradas junto com o clima.
+
+Com --incremental, as tabelas integradas recalculam só as linhas (Ano ou Ano/Mes) que mudaram nas
+entradas desde a última execução, quando os scripts anteriores registraram essas chaves
+(agregacao_incremental.py); senão são refeitas inteiras.
 """
 
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import argparse
 import os
+import pandas as pd
+from agregacao_incremental import opcao_incremental, atualizar_tabela
+from graficos import opcao_sem_graficos, desenhar_figuras
+
+parser = opcao_sem_graficos(argparse.ArgumentParser(description='Integração e correlações anual/mensal.'))
+args = opcao_incremental(parser).parse_args()
+
+PROD = '../dados_processados/Produtividade_Milho_-_Sidrolandia.csv'
+NDVI_ANO = '../dados_processados/ndvi_medio_por_ano.csv'
+CLIMA_ANO = '../dados_processados/inmet_clima_anual.csv'
+FEATURES_ANO = '../dados_processados/features_agroclimaticas_anual.csv'
+NDVI_MENSAL = '../dados_processados/ndvi_mensal.csv'
+CLIMA_MENSAL = '../dados_processados/inmet_clima_mensal.csv'
+FEATURES_MENSAL = '../dados_processados/features_agroclimaticas_mensal.csv'
+
+
+def com_features(clima, tabelas, arquivo, chaves):
+    """Acrescenta as variáveis agroclimáticas ao clima, se o arquivo existir."""
+    if arquivo not in tabelas:
+        return clima
+    features = tabelas[arquivo].drop(columns=['Dias_validos'])
+    return clima.merge(features, on=chaves, how='left')
 
-# --- Correlação ANUAL ---
-# Carregar dados processados
-prod = pd.read_csv('../dados_processados/Produtividade_Milho_-_Sidrolandia.csv')
-ndvi_ano = pd.read_csv('../dados_processados/ndvi_medio_por_ano.csv')
-clima_ano = pd.read_csv('../dados_processados/inmet_clima_anual.csv')
 
-# Juntar tudo por Ano
-anual = prod.merge(ndvi_ano, on='Ano', how='inner')
-anual = anual.merge(clima_ano, on='Ano', how='inner')
-anual.to_csv('../dados_processados/integrado_anual.csv', index=False)
+def montar_anual(tabelas):
+    """Produtividade + NDVI + clima (e variáveis agroclimáticas), juntados por Ano."""
+    clima_ano = com_features(tabelas[CLIMA_ANO], tabelas, FEATURES_ANO, ['Ano'])
+    anual = tabelas[PROD].merge(tabelas[NDVI_ANO], on='Ano', how='inner')
+    return anual.merge(clima_ano, on='Ano', how='inner')
+
+
+def montar_mensal(tabelas):
+    """NDVI + clima (e variáveis agroclimáticas), juntados por Ano e Mes."""
+    clima_mensal = com_features(tabelas[CLIMA_MENSAL], tabelas, FEATURES_MENSAL, ['Ano', 'Mes'])
+    return tabelas[NDVI_MENSAL].merge(clima_mensal, on=['Ano', 'Mes'], how='inner')
+
+
+def integrar(saida, entradas, chaves, montar):
+    entradas = [e for e in entradas if e not in (FEATURES_ANO, FEATURES_MENSAL) or os.path.exists(e)]
+    if args.incremental:
+        return atualizar_tabela(saida, entradas, chaves, montar)
+    tabela = montar({e: pd.read_csv(e) for e in entradas})
+    tabela.to_csv(saida, index=False)
+    return tabela
+
+
+# --- Correlação ANUAL ---
+# Juntar produtividade, NDVI e clima por Ano
+anual = integrar('../dados_processados/integrado_anual.csv', [PROD, NDVI_ANO, CLIMA_ANO, FEATURES_ANO],
+                 ['Ano'], montar_anual)
 
 # Matriz de correlação anual
 corr_anual = anual.corr(numeric_only=True)
 corr_anual.to_csv('../dados_processados/correlacao_anual.csv')
 
-plt.figure(figsize=(8,6))
-sns.heatmap(corr_anual, annot=True, cmap='coolwarm', fmt='.2f')
-plt.title('Matriz de Correlação Anual (NDVI, Clima, Produtividade)')
-plt.tight_layout()
-plt.savefig('../resultados/correlacao_anual_heatmap.png')
-plt.close()
-
 # --- Correlação MENSAL ---
-ndvi_mensal = pd.read_csv('../dados_processados/ndvi_mensal.csv')
-clima_mensal = pd.read_csv('../dados_processados/inmet_clima_mensal.csv')
-
 # Juntar por Ano e Mes
-mensal = ndvi_mensal.merge(clima_mensal, on=['Ano','Mes'], how='inner')
-mensal.to_csv('../dados_processados/integrado_mensal.csv', index=False)
+mensal = integrar('../dados_processados/integrado_mensal.csv', [NDVI_MENSAL, CLIMA_MENSAL, FEATURES_MENSAL],
+                  ['Ano', 'Mes'], montar_mensal)
 
 corr_mensal = mensal.corr(numeric_only=True)
 corr_mensal.to_csv('../dados_processados/correlacao_mensal.csv')
 
-plt.figure(figsize=(8,6))
-sns.heatmap(corr_mensal, annot=True, cmap='viridis', fmt='.2f')
-plt.title('Matriz de Correlação Mensal (NDVI, Clima)')
-plt.tight_layout()
-plt.savefig('../resultados/correlacao_mensal_heatmap.png')
-plt.close()
+# Mapas de calor das duas matrizes
+if not args.sem_graficos:
+    desenhar_figuras(['correlacao_anual_heatmap', 'correlacao_mensal_heatmap'])
 
 print('Matrizes de correlação anual e mensal salvas em dados_processados/ e resultados/.')
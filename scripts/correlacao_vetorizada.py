@@ -0,0 +1,111 @@
+"""
+Matrizes de correlação (Pearson e Spearman) com p-valores, calculadas de forma vetorizada.
+- Uma única passada de álgebra matricial para todos os pares de colunas (sem laços k²)
+- Spearman = Pearson sobre os postos; os postos são calculados uma vez por coluna
+- p-valores pela distribuição t (n - 2 graus de liberdade) aplicada à matriz inteira
+- Valores ausentes: cada par usa apenas as linhas em que as duas colunas existem
+  (contagem "pairwise-complete", como no DataFrame.corr do pandas)
+
+No Spearman com NaN, os pares que envolvem alguma coluna incompleta são re-ranqueados só nas
+linhas comuns ao par (uma vez por padrão distinto de linhas comuns, não por par), como no
+DataFrame.corr(method='spearman'); entre colunas completas vale o ranqueamento único.
+"""
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata, t as dist_t
+
+
+def _postos(valores):
+    """Postos médios (empates) por coluna, preservando NaN."""
+    return rankdata(valores, axis=0, nan_policy='omit')
+
+
+def correlacao_pareada(valores):
+    """
+    Pearson par a par de uma matriz (n linhas x k colunas) com NaN.
+    Retorna (r, n_pares), ambos k x k.
+    """
+    valores = np.asarray(valores, dtype=float)
+    presente = ~np.isnan(valores)
+    m = presente.astype(float)
+    # Centrar pela média da coluna não altera r e evita cancelamento numérico nas somas
+    x = np.where(presente, valores - np.nanmean(valores, axis=0), 0.0)
+
+    n = m.T @ m                     # linhas válidas em comum para cada par
+    soma = x.T @ m                  # soma[i, j] = Σ x_i nas linhas comuns a (i, j)
+    soma_q = (x * x).T @ m          # soma_q[i, j] = Σ x_i² nas linhas comuns
+    soma_xy = x.T @ x               # Σ x_i x_j (zeros nos ausentes)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = soma_xy - soma * soma.T / n
+        var_i = soma_q - soma ** 2 / n
+        r = cov / np.sqrt(var_i * var_i.T)
+    r = np.clip(r, -1.0, 1.0)
+    r[n < 2] = np.nan
+    return r, n.astype(int)
+
+
+def spearman_pareado(valores):
+    """
+    Spearman par a par de uma matriz (n linhas x k colunas) com NaN, exato como o do pandas.
+    Retorna (r, n_pares), ambos k x k.
+    """
+    valores = np.asarray(valores, dtype=float)
+    presente = ~np.isnan(valores)
+    r, n = correlacao_pareada(_postos(valores))     # exato entre colunas completas
+    incompleta = ~presente.all(axis=0)
+    if not incompleta.any():
+        return r, n
+
+    # Pares com coluna incompleta, agrupados pelas linhas comuns: cada grupo é ranqueado uma vez
+    i, j = np.nonzero(incompleta[:, None] | incompleta[None, :])
+    comuns = presente[:, i] & presente[:, j]
+    padroes, grupo = np.unique(comuns.T, axis=0, return_inverse=True)
+    grupo = grupo.ravel()
+    for g, linhas in enumerate(padroes):
+        if linhas.sum() < 2:
+            continue                                 # já é NaN (n < 2)
+        pares = grupo == g
+        colunas = np.unique(np.concatenate([i[pares], j[pares]]))
+        r_grupo, _ = correlacao_pareada(_postos(valores[np.ix_(linhas, colunas)]))
+        r[i[pares], j[pares]] = r_grupo[np.searchsorted(colunas, i[pares]), np.searchsorted(colunas, j[pares])]
+    return r, n
+
+
+def p_valores(r, n):
+    """p-valor bicaudal de H0: ρ = 0, pela estatística t = r·sqrt((n-2)/(1-r²))."""
+    gl = n - 2.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estat_t = r * np.sqrt(gl / (1.0 - r ** 2))
+        p = 2.0 * dist_t.sf(np.abs(estat_t), gl)
+    p = np.where(np.abs(r) >= 1.0, 0.0, p)
+    p = np.where(gl > 0, p, np.nan)
+    return p
+
+
+def matriz_correlacao(df, metodo='pearson', colunas=None):
+    """
+    Retorna (r, p, n) como DataFrames k x k para as colunas numéricas de `df`.
+    metodo: 'pearson' ou 'spearman'. A diagonal de p recebe 1.0, como nas tabelas já geradas.
+    """
+    if colunas is None:
+        colunas = df.select_dtypes('number').columns
+    valores = df[colunas].to_numpy(dtype=float)
+    if metodo == 'spearman':
+        r, n = spearman_pareado(valores)
+    elif metodo == 'pearson':
+        r, n = correlacao_pareada(valores)
+    else:
+        raise ValueError(f'Método de correlação desconhecido: {metodo}')
+
+    p = p_valores(r, n)
+    np.fill_diagonal(p, 1.0)
+
+    def _df(matriz):
+        return pd.DataFrame(matriz, index=colunas, columns=colunas)
+    return _df(r), _df(p), _df(n)
+
+
+def matrizes_pearson_spearman(df, colunas=None):
+    """Atalho: {'pearson': (r, p, n), 'spearman': (r, p, n)} na mesma chamada."""
+    return {metodo: matriz_correlacao(df, metodo, colunas) for metodo in ('pearson', 'spearman')}
@@ -0,0 +1,241 @@
+"""
+Geradores determinísticos de dados sintéticos, no mesmo formato das fontes reais do projeto,
+para medir como cada etapa escala (ver benchmark.py).
+- INMET: série horária com as colunas da estação automática (precipitação, temperatura, umidade...)
+- SATVeg: série de compostos de 16 dias (NDVI, Savitzky-Golay, EVI), como a planilha exportada
+- SIDRA: abas da Tabela 1612 no layout original (cabeçalho em duas linhas, '-', '..' e rodapé),
+  para vários municípios, lidas normalmente por leitor_sidra.py
+- Imagens RGB grandes com zonas de cor (vegetação, solo, pousio) e bandas red/nir para ingestao_raster.py
+
+A mesma semente sempre gera os mesmos dados; o tamanho é controlado pelos parâmetros
+(anos, municípios, altura x largura).
+
+Uso:
+    from dados_sinteticos import gerar_inmet_horario, gerar_sidra, salvar_sidra
+    inmet = gerar_inmet_horario(anos=20)
+    salvar_sidra(gerar_sidra(n_municipios=5000, anos=20), '/tmp/sidra.xlsx')
+"""
+import numpy as np
+import pandas as pd
+
+COL_PRECIP = 'PRECIPITAÇÃO TOTAL, HORÁRIO (mm)'
+COL_RADIACAO = 'RADIACAO GLOBAL (Kj/m²)'
+COL_TEMP = 'TEMPERATURA DO AR - BULBO SECO, HORARIA (°C)'
+COL_TEMP_MAX = 'TEMPERATURA MÁXIMA NA HORA ANT. (AUT) (°C)'
+COL_TEMP_MIN = 'TEMPERATURA MÍNIMA NA HORA ANT. (AUT) (°C)'
+COL_UMIDADE = 'UMIDADE RELATIVA DO AR, HORARIA (%)'
+COL_VENTO = 'VENTO, VELOCIDADE HORARIA (m/s)'
+
+PRODUTOS_SIDRA = ('Milho (em grão)', 'Soja (em grão)')
+ABAS_SIDRA = {
+    'Área plantada': 'Área plantada (Hectares)',
+    'Área colhida': 'Área colhida (Hectares)',
+    'Quantidade produzida': 'Quantidade produzida (Toneladas)',
+}
+UFS = ('MS', 'MT', 'GO', 'PR', 'SP', 'MG', 'RS', 'BA')
+
+# Cores típicas das zonas em composições RGB (vegetação ativa, solo exposto, pousio/sombra)
+CORES_ZONAS = np.array([[46, 125, 50], [196, 164, 98], [120, 120, 112]], dtype=np.int16)
+
+
+def _fase_anual(datas):
+    """Posição no ano em radianos (0 = 1º de janeiro)."""
+    return 2 * np.pi * (datas.dayofyear.to_numpy() - 1) / 365.25
+
+
+def gerar_inmet_horario(anos, ano_inicial=2000, semente=0, fracao_faltante=0.01):
+    """
+    Série horária de uma estação automática do INMET (anos * ~8760 linhas).
+    Verão chuvoso e inverno seco, ciclo diário de temperatura e umidade; `fracao_faltante`
+    das leituras de cada variável fica vazia (NaN), como nas falhas de transmissão.
+    """
+    rng = np.random.default_rng(semente)
+    instantes = pd.date_range(f'{ano_inicial}-01-01', f'{ano_inicial + anos}-01-01', freq='h', inclusive='left')
+    n = len(instantes)
+    fase_ano = _fase_anual(instantes)
+    hora = instantes.hour.to_numpy()
+    fase_dia = 2 * np.pi * (hora - 9) / 24  # mínimo ~06h local (09 UTC), máximo à tarde
+
+    estacao = np.cos(fase_ano)  # +1 no verão (jan), -1 no inverno (jul)
+    temp = 23 + 3.5 * estacao + 5.5 * np.sin(fase_dia) + rng.normal(0, 1.2, n)
+    amplitude = np.abs(rng.normal(0.8, 0.3, n))
+    umidade = np.clip(70 + 12 * estacao - 18 * np.sin(fase_dia) + rng.normal(0, 6, n), 8, 100)
+    chove = rng.random(n) < 0.035 + 0.05 * (estacao + 1) / 2
+    precip = np.where(chove, rng.gamma(0.7, 4.0, n), 0.0)
+    radiacao = np.clip(3200 * np.sin(fase_dia + np.pi / 2) * (1 + 0.2 * estacao), 0, None) * (1 - 0.6 * chove)
+    vento = np.abs(rng.normal(2.2, 1.0, n))
+
+    df = pd.DataFrame({
+        'Data': instantes.normalize(),
+        'Hora UTC': np.array([f'{h:02d}00 UTC' for h in range(24)])[hora],
+        COL_PRECIP: precip.round(1),
+        COL_RADIACAO: radiacao.round(1),
+        COL_TEMP: temp.round(1),
+        COL_TEMP_MAX: (temp + amplitude).round(1),
+        COL_TEMP_MIN: (temp - amplitude).round(1),
+        COL_UMIDADE: umidade.round(0),
+        COL_VENTO: vento.round(1),
+    })
+    if fracao_faltante:
+        for col in df.columns[2:]:
+            df.loc[rng.random(n) < fracao_faltante, col] = np.nan
+    return df
+
+
+def salvar_inmet_nativo(df, caminho, codigo='A000', nome='ESTACAO SINTETICA', uf='MS',
+                        latitude=-20.93, longitude=-54.96, altitude=480.0):
+    """
+    Grava a série de gerar_inmet_horario no formato do BDMEP (um CSV por estação e ano):
+    cabeçalho de 8 linhas, latin-1, ';', vírgula decimal, -9999 nas leituras ausentes.
+    """
+    cabecalho = [
+        ('REGIAO:', 'CO'), ('UF:', uf), ('ESTACAO:', nome), ('CODIGO (WMO):', codigo),
+        ('LATITUDE:', f'{latitude}'.replace('.', ',')), ('LONGITUDE:', f'{longitude}'.replace('.', ',')),
+        ('ALTITUDE:', f'{altitude}'.replace('.', ',')), ('DATA DE FUNDACAO:', '2000-01-01'),
+    ]
+    with open(caminho, 'w', encoding='latin-1', newline='') as f:
+        f.writelines(f'{chave};{valor}\n' for chave, valor in cabecalho)
+        df.assign(**{'': ''}).to_csv(f, sep=';', decimal=',', index=False, na_rep='-9999',
+                                     date_format='%Y/%m/%d', lineterminator='\n')
+
+
+def gerar_satveg(anos, ano_inicial=2000, semente=0):
+    """
+    Série NDVI/EVI em compostos de 16 dias (23 por ano, reiniciando em 1º de janeiro, como o MODIS),
+    no formato da planilha do SATVeg: Data (dd/mm/aaaa), NDVI, Savitzky-Golay, EVI, Mês, Ano.
+    O NDVI bruto tem ruído e quedas por nuvem; o Savitzky-Golay segue a curva fenológica.
+    """
+    rng = np.random.default_rng(semente)
+    datas = pd.DatetimeIndex([
+        pd.Timestamp(ano, 1, 1) + pd.Timedelta(days=16 * k)
+        for ano in range(ano_inicial, ano_inicial + anos) for k in range(23)
+    ])
+    n = len(datas)
+    fase = _fase_anual(datas)
+    # Duas safras: soja (pico em jan/fev) e milho safrinha (pico em abr/mai)
+    curva = 0.45 + 0.25 * np.exp(-((fase - 0.6) ** 2) / 0.25) + 0.2 * np.exp(-((fase - 2.1) ** 2) / 0.3)
+    curva = curva + np.repeat(rng.normal(0, 0.03, anos), 23)  # variação entre safras
+    nuvem = rng.random(n) < 0.08
+    ndvi = np.clip(curva + rng.normal(0, 0.03, n) - nuvem * rng.uniform(0.1, 0.35, n), -0.1, 0.95)
+    return pd.DataFrame({
+        'Data': datas.strftime('%d/%m/%Y'),
+        'NDVI': ndvi.round(4),
+        'Savitzky-Golay': (curva + rng.normal(0, 0.005, n)).round(4),
+        'EVI': (0.62 * ndvi + rng.normal(0, 0.02, n)).round(4),
+        'Mês': datas.month,
+        'Ano': datas.year,
+    })
+
+
+def nomes_municipios(n_municipios):
+    """'Sidrolândia (MS)' seguido de municípios fictícios com UF."""
+    return ['Sidrolândia (MS)'] + [f'Município {i:05d} ({UFS[i % len(UFS)]})' for i in range(1, n_municipios)]
+
+
+def gerar_sidra(n_municipios, anos, ano_inicial=2004, produtos=PRODUTOS_SIDRA, semente=0,
+                fracao_sigilo=0.02):
+    """
+    Abas da Tabela 1612 no layout do SIDRA (DataFrames sem cabeçalho, como lidos com header=None):
+    título nas linhas 0-2, ano na linha 3, produto na linha 4, uma linha por município
+    (primeiro 'Brasil') e rodapé 'Fonte'. Municípios sem plantio aparecem com '-';
+    `fracao_sigilo` dos valores vem como '..'. Retorna {nome_da_aba: DataFrame} (inclui 'Notas').
+    """
+    rng = np.random.default_rng(semente)
+    municipios = nomes_municipios(n_municipios)
+    anos_tabela = np.arange(ano_inicial, ano_inicial + anos)
+    forma = (n_municipios, anos, len(produtos))
+
+    escala = rng.lognormal(8, 1.5, (n_municipios, 1, len(produtos)))
+    plantada = np.round(escala * rng.uniform(0.8, 1.2, forma))
+    plantada[rng.random((n_municipios, 1, len(produtos))).repeat(anos, axis=1) < 0.15] = 0
+    colhida = np.round(plantada * rng.uniform(0.85, 1.0, forma))
+    produtividade = rng.normal(5.0, 1.2, forma).clip(0.5)
+    valores = {
+        'Área plantada': plantada,
+        'Área colhida': colhida,
+        'Quantidade produzida': np.round(colhida * produtividade),
+    }
+
+    abas = {}
+    for aba, variavel in ABAS_SIDRA.items():
+        v = valores[aba]
+        corpo = np.vstack([v.sum(axis=0, keepdims=True), v]).reshape(n_municipios + 1, -1)
+        celulas = corpo.astype(np.int64).astype(object)
+        celulas[corpo == 0] = '-'
+        celulas[rng.random(corpo.shape) < fracao_sigilo] = '..'
+        celulas[0] = corpo[0].astype(np.int64)  # o total nacional nunca é sigiloso
+
+        linha_ano = np.full(corpo.shape[1], np.nan, dtype=object)
+        linha_ano[::len(produtos)] = anos_tabela
+        cabecalho = [
+            ['Tabela 1612 - Área plantada, área colhida, quantidade produzida, rendimento médio e valor '
+             'da produção das lavouras temporárias'],
+            [f'Variável - {variavel}'],
+            ['Brasil e Município'],
+            [np.nan, *linha_ano],
+            [np.nan, *np.tile(produtos, anos)],
+        ]
+        linhas = cabecalho + [[nome, *celulas[i]] for i, nome in enumerate(['Brasil', *municipios])]
+        linhas.append(['Fonte: IBGE - Produção Agrícola Municipal'])
+        abas[aba] = pd.DataFrame(linhas)
+    abas['Notas'] = pd.DataFrame({0: ['Notas', '1 - Dados sintéticos gerados por dados_sinteticos.py']})
+    return abas
+
+
+def salvar_sidra(abas, caminho):
+    """Grava as abas geradas por gerar_sidra em um .xlsx com o layout original (sem cabeçalho/índice)."""
+    with pd.ExcelWriter(caminho) as escritor:
+        for nome, df in abas.items():
+            df.to_excel(escritor, sheet_name=nome, header=False, index=False)
+
+
+def gerar_tabela_anual(n, semente=0):
+    """
+    Tabela no formato de integrado_anual.csv com `n` linhas: produtividade dependente do NDVI
+    e do clima, mais ruído. Útil para correlações e validação LOO em tamanhos maiores que o real.
+    """
+    rng = np.random.default_rng(semente)
+    ndvi = rng.normal(0.62, 0.04, n)
+    precip = rng.normal(1400, 250, n)
+    temp = rng.normal(23.5, 0.8, n)
+    umidade = rng.normal(71, 4, n)
+    produtividade = 5 + 18 * (ndvi - 0.62) + 0.0015 * (precip - 1400) - 0.3 * (temp - 23.5) + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        'Ano': np.arange(2000, 2000 + n),
+        'Produtividade (ton/ha)': produtividade,
+        'Savitzky-Golay': ndvi,
+        'Precipitacao_total_mm': precip,
+        'Temp_media_C': temp,
+        'Umidade_media': umidade,
+    })
+
+
+def _zonas(altura, largura, n_zonas, rng, celula=64):
+    """Mapa de zonas (uint8) em manchas de `celula` pixels, ampliado por repetição."""
+    grade = rng.integers(0, n_zonas, (-(-altura // celula), -(-largura // celula)), dtype=np.uint8)
+    return np.repeat(np.repeat(grade, celula, axis=0), celula, axis=1)[:altura, :largura]
+
+
+def gerar_imagem_rgb(altura, largura, n_zonas=3, semente=0, ruido=18, linhas_por_bloco=512):
+    """
+    Imagem RGB uint8 (altura x largura x 3) com manchas das cores em CORES_ZONAS e ruído.
+    O ruído é gerado por blocos de linhas, então o pico de memória fica próximo do tamanho da imagem.
+    """
+    rng = np.random.default_rng(semente)
+    cores = CORES_ZONAS[np.arange(n_zonas) % len(CORES_ZONAS)]
+    zonas = _zonas(altura, largura, n_zonas, rng)
+    img = np.empty((altura, largura, 3), dtype=np.uint8)
+    for inicio in range(0, altura, linhas_por_bloco):
+        bloco = slice(inicio, inicio + linhas_por_bloco)
+        ruido_bloco = rng.integers(-ruido, ruido + 1, zonas[bloco].shape + (3,), dtype=np.int16)
+        img[bloco] = np.clip(cores[zonas[bloco]] + ruido_bloco, 0, 255)
+    return img
+
+
+def gerar_bandas(altura, largura, semente=0):
+    """Bandas red e nir (uint16, refletância x 10000) com as mesmas manchas de gerar_imagem_rgb."""
+    rng = np.random.default_rng(semente)
+    zonas = _zonas(altura, largura, 3, rng)
+    red = np.array([600, 2200, 1500], dtype=np.uint16)[zonas] + rng.integers(0, 300, zonas.shape, dtype=np.uint16)
+    nir = np.array([4200, 2800, 2300], dtype=np.uint16)[zonas] + rng.integers(0, 300, zonas.shape, dtype=np.uint16)
+    return red, nir
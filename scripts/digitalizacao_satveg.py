@@ -0,0 +1,168 @@
+"""
+Digitalização de gráficos do SATVeg (imagens PNG da curva NDVI).
+- Linhas de referência (preta = NDVI 0,7; roxa = NDVI 0,4) detectadas por distância de cor
+  ao quadrado em inteiros (diferenças em int16, soma em int32) sobre colunas amostradas
+- A curva NDVI é extraída como números: para cada coluna amostrada, a linha média dos pixels
+  com a cor da curva é convertida em NDVI pela escala definida pelas duas linhas de referência
+- Modo em lote: processa uma pasta de gráficos em um pool de processos, um CSV por gráfico
+  e um resumo com as linhas detectadas
+- Referências inválidas (mesma linha para as duas cores, ex.: gráfico sem a linha roxa, ou a roxa
+  acima da preta) não têm escala: o NDVI fica NaN e o resumo marca referencias_ok = False
+
+A imagem é mantida em uint8 e as máscaras em bool; nada é convertido para float na resolução
+completa (a soma das linhas da curva é uma redução inteira).
+
+Uso (a partir de scripts/):
+    python digitalizacao_satveg.py ../dados_brutos/graficos_satveg --saida ../dados_processados/curvas_satveg
+    python digitalizacao_satveg.py pasta --cor-curva 0,128,0 --inicio 2000-02-18 --fim 2024-12-18
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+COR_PRETA = (0, 0, 0)
+COR_ROXA = (128, 0, 128)
+COR_CURVA = (0, 128, 0)
+NDVI_PRETA = 0.7
+NDVI_ROXA = 0.4
+PASSO_COLUNAS = 4
+TOLERANCIA_COR = 60  # distância euclidiana máxima (0-255) para um pixel ser da curva
+
+
+def ler_grafico(caminho):
+    """Imagem RGB em uint8 (canal alpha descartado)."""
+    with Image.open(caminho) as img:
+        return np.asarray(img.convert('RGB'))
+
+
+def _distancia2(img, cor):
+    """Distância de cor ao quadrado, em inteiros: diferenças int16, soma dos quadrados em int32."""
+    diferenca = img.astype(np.int16) - np.asarray(cor, dtype=np.int16)
+    return np.einsum('...c,...c->...', diferenca, diferenca, dtype=np.int32)
+
+
+def detectar_linhas(img, passo=PASSO_COLUNAS):
+    """
+    Linha (y) de menor distância média à cor preta e à roxa, varrendo uma coluna a cada `passo`.
+    Retorna (y_preto, y_roxo, altura), como a versão original de segmentacao_ndvi_temporal.py.
+    """
+    amostra = img[:, ::passo, :3]
+    y_preto = int(_distancia2(amostra, COR_PRETA).sum(axis=1, dtype=np.int64).argmin())
+    y_roxo = int(_distancia2(amostra, COR_ROXA).sum(axis=1, dtype=np.int64).argmin())
+    return y_preto, y_roxo, img.shape[0]
+
+
+def referencias_validas(y_preto, y_roxo):
+    """A linha preta (NDVI maior) fica acima da roxa: y cresce para baixo na imagem."""
+    return y_preto < y_roxo
+
+
+def linha_para_ndvi(y, y_preto, y_roxo):
+    """Converte a posição vertical em NDVI pela reta que passa pelas duas linhas de referência."""
+    if not referencias_validas(y_preto, y_roxo):
+        raise ValueError(f'Linhas de referência inválidas: preta em y={y_preto}, roxa em y={y_roxo}')
+    return NDVI_PRETA + (y_preto - np.asarray(y, dtype=float)) * (NDVI_PRETA - NDVI_ROXA) / (y_roxo - y_preto)
+
+
+def extrair_curva(img, y_preto, y_roxo, cor_curva=COR_CURVA, tolerancia=TOLERANCIA_COR, passo=1):
+    """
+    Curva NDVI por coluna: linha média dos pixels próximos de `cor_curva` (colunas sem a curva
+    são descartadas). Retorna DataFrame com coluna_px, linha_px, posicao (0-1 na largura) e NDVI
+    (NaN se as linhas de referência forem inválidas).
+    """
+    amostra = img[:, ::passo, :3]
+    mascara = _distancia2(amostra, cor_curva) <= tolerancia ** 2          # (altura, colunas)
+    contagem = mascara.sum(axis=0)
+    linhas = np.arange(img.shape[0], dtype=np.int64)
+    soma_linhas = np.einsum('y,yc->c', linhas, mascara, dtype=np.int64)   # soma dos y por coluna
+    tem_curva = contagem > 0
+    colunas = np.arange(0, img.shape[1], passo)[tem_curva]
+    linha_media = soma_linhas[tem_curva] / contagem[tem_curva]
+    return pd.DataFrame({
+        'coluna_px': colunas,
+        'linha_px': linha_media,
+        'posicao': colunas / max(img.shape[1] - 1, 1),
+        'NDVI': (linha_para_ndvi(linha_media, y_preto, y_roxo) if referencias_validas(y_preto, y_roxo)
+                 else np.nan),
+    })
+
+
+def datar_curva(curva, inicio, fim):
+    """Associa datas às colunas, interpolando entre a primeira e a última coluna com curva."""
+    inicio, fim = pd.Timestamp(inicio), pd.Timestamp(fim)
+    extensao = curva['coluna_px'].iloc[-1] - curva['coluna_px'].iloc[0]
+    fracao = (curva['coluna_px'] - curva['coluna_px'].iloc[0]) / max(extensao, 1)
+    return curva.assign(Data=(inicio + (fim - inicio) * fracao).dt.round('D'))
+
+
+def processar_grafico(caminho, pasta_saida, cor_curva=COR_CURVA, tolerancia=TOLERANCIA_COR,
+                      passo=PASSO_COLUNAS, inicio=None, fim=None):
+    """Detecta as linhas, extrai a curva, salva <nome>_curva.csv e devolve um resumo do gráfico."""
+    img = ler_grafico(caminho)
+    y_preto, y_roxo, altura = detectar_linhas(img, passo)
+    curva = extrair_curva(img, y_preto, y_roxo, cor_curva, tolerancia)
+    if inicio and fim and len(curva):
+        curva = datar_curva(curva, inicio, fim)
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    curva.to_csv(os.path.join(pasta_saida, f'{nome}_curva.csv'), index=False)
+    return {
+        'arquivo': os.path.basename(caminho),
+        'altura_px': altura,
+        'largura_px': img.shape[1],
+        'y_preto': y_preto,
+        'y_roxo': y_roxo,
+        'referencias_ok': referencias_validas(y_preto, y_roxo),
+        'colunas_com_curva': len(curva),
+        'NDVI_medio': curva['NDVI'].mean() if len(curva) else np.nan,
+    }
+
+
+def _processar(argumentos):
+    return processar_grafico(*argumentos)
+
+
+def processar_pasta(pasta, pasta_saida, workers=None, **opcoes):
+    """Processa todos os PNG da pasta em paralelo. Retorna o resumo (um gráfico por linha)."""
+    os.makedirs(pasta_saida, exist_ok=True)
+    arquivos = sorted(glob.glob(os.path.join(pasta, '*.png')))
+    parametros = [
+        (arq, pasta_saida, opcoes.get('cor_curva', COR_CURVA), opcoes.get('tolerancia', TOLERANCIA_COR),
+         opcoes.get('passo', PASSO_COLUNAS), opcoes.get('inicio'), opcoes.get('fim'))
+        for arq in arquivos
+    ]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(parametros) // (workers * 4))
+        resumo = list(pool.map(_processar, parametros, chunksize=chunksize))
+    return pd.DataFrame(resumo)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Digitaliza em lote gráficos NDVI do SATVeg (PNG).')
+    parser.add_argument('pasta', help='pasta com os gráficos .png')
+    parser.add_argument('--saida', default='../dados_processados/curvas_satveg')
+    parser.add_argument('--cor-curva', default=','.join(map(str, COR_CURVA)), help='cor RGB da curva NDVI')
+    parser.add_argument('--tolerancia', type=int, default=TOLERANCIA_COR)
+    parser.add_argument('--passo', type=int, default=PASSO_COLUNAS, help='passo de colunas na detecção das linhas')
+    parser.add_argument('--inicio', help='data da primeira coluna com curva (AAAA-MM-DD)')
+    parser.add_argument('--fim', help='data da última coluna com curva (AAAA-MM-DD)')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    inicio_exec = time.perf_counter()
+    resumo = processar_pasta(
+        args.pasta, args.saida, args.workers,
+        cor_curva=tuple(int(c) for c in args.cor_curva.split(',')),
+        tolerancia=args.tolerancia, passo=args.passo, inicio=args.inicio, fim=args.fim,
+    )
+    duracao = time.perf_counter() - inicio_exec
+    resumo.to_csv(os.path.join(args.saida, 'resumo.csv'), index=False)
+    print(resumo.to_string(index=False))
+    print(f'\n{len(resumo)} gráficos em {duracao:.2f}s ({len(resumo) / max(duracao, 1e-9):.1f}/s). '
+          f'Curvas salvas em {args.saida}')
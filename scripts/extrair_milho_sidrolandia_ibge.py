@@ -1,59 +1,37 @@
 """
 Script para extrair dados de milho de Sidrolândia-MS do arquivo IBGE/SIDRA.
 Lê as abas 'Área plantada', 'Área colhida' e 'Quantidade produzida',
-filtra os dados de Sidrolândia-MS e monta um DataFrame consolidado.
+filtra os dados de Sidrolândia-MS e monta um DataFrame consolidado para todos os anos da tabela.
 
-Vantagens:
-- Extração automática e consistente dos dados para vários anos
-- Pronto para integração com NDVI e modelagem
-"""
-
-"""
-Script para extrair dados de milho de Sidrolândia-MS do arquivo IBGE/SIDRA.
-Lê as abas 'Área plantada', 'Área colhida' e 'Quantidade produzida',
-filtra os dados de Sidrolândia-MS e monta um DataFrame consolidado para os anos 2020-2023.
+Outros municípios: python extrair_milho_sidrolandia_ibge.py --municipio Maracaju
+(salva Produtividade_Milho_-_Maracaju_MS.csv). Para todos de uma vez, ver pipeline_municipios.py.
 
 Vantagens:
 - Extração automática e consistente dos dados para vários anos
 - Pronto para integração com NDVI e modelagem
 """
+import argparse
 
-import pandas as pd
-
-# Nome do arquivo Excel
-arquivo_ibge = '../dados_brutos/IBGE/SIDRA-IBGE-Producao-Municipal-Tabela-1612.xlsx'
-anos = [2020, 2021, 2022, 2023]
-colunas_milho = ['Milho (em grão)', 'Milho (em grão).1', 'Milho (em grão).2', 'Milho (em grão).3']
-
-# Função para extrair dados de milho para Sidrolândia (MS) de uma aba
-def extrair_milho_aba(nome_aba):
-    # Lê a aba pulando 4 linhas para pegar o cabeçalho correto
-    df = pd.read_excel(arquivo_ibge, sheet_name=nome_aba, skiprows=4)
-    # Filtra Sidrolândia (MS)
-    linha = df[df['Unnamed: 0'].str.contains('Sidrolândia', na=False)].iloc[0]
-    # Extrai os valores de milho para cada ano
-    valores = [linha[col] for col in colunas_milho]
-    return valores
-
-# Extrai dados de cada aba
-dados_area_plantada = extrair_milho_aba('Área plantada')
-dados_area_colhida = extrair_milho_aba('Área colhida')
-dados_producao = extrair_milho_aba('Quantidade produzida')
+from leitor_sidra import ler_tabela_sidra, extrair_municipio, resolver_municipio, nome_arquivo_municipio
 
-# Monta DataFrame consolidado
-df_final = pd.DataFrame({
-    'Ano': anos,
-    'Área Plantada (ha)': dados_area_plantada,
-    'Área Colhida (ha)': dados_area_colhida,
-    'Produção (ton)': dados_producao
-})
+parser = argparse.ArgumentParser(description='Extrai área, produção e produtividade de um município (SIDRA 1612).')
+parser.add_argument('--municipio', default='Sidrolândia', help='nome do município, com ou sem UF')
+parser.add_argument('--produto', default='Milho (em grão)')
+args = parser.parse_args()
 
-# Calcula produtividade (ton/ha)
-df_final['Produtividade (ton/ha)'] = df_final['Produção (ton)'] / df_final['Área Plantada (ha)']
+# Lê todas as abas da Tabela 1612 de uma vez (formato longo indexado por
+# município, produto, ano e variável) e consulta o município direto no índice
+tabela_sidra = ler_tabela_sidra('../dados_brutos/IBGE/SIDRA-IBGE-Producao-Municipal-Tabela-1612.xlsx')
+municipio = resolver_municipio(tabela_sidra, args.municipio)
+df_final = extrair_municipio(tabela_sidra, municipio, produto=args.produto)
 
-print('Dados consolidados de milho para Sidrolândia-MS:')
+print(f'Dados consolidados de {args.produto} para {municipio}:')
 print(df_final)
 
-# Salva CSV limpo
-df_final.to_csv('../dados_processados/Produtividade_Milho_-_Sidrolandia.csv', index=False)
-print('\nArquivo Produtividade_Milho_-_Sidrolandia.csv salvo com sucesso.')
+# Salva CSV limpo (o nome original é mantido para Sidrolândia, usado pelas demais etapas)
+if municipio == 'Sidrolândia (MS)':
+    nome_saida = 'Produtividade_Milho_-_Sidrolandia.csv'
+else:
+    nome_saida = f'Produtividade_Milho_-_{nome_arquivo_municipio(municipio)}.csv'
+df_final.to_csv(f'../dados_processados/{nome_saida}', index=False)
+print(f'\nArquivo {nome_saida} salvo com sucesso.')
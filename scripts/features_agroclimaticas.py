@@ -0,0 +1,172 @@
+"""
+Variáveis agroclimáticas para o milho, calculadas com NumPy sobre os vetores diários (ou horários)
+ordenados por estação/data, com reduções segmentadas (np.add.reduceat / np.maximum.reduceat):
+- Graus-dia (GDD): média de Tmin e Tmax limitadas a [base, teto], menos a base (10 e 30 °C)
+- Veranicos: sequências de pelo menos DIAS_VERANICO dias secos (< 1 mm) e a maior sequência seca
+- Horas de estresse térmico: horas com temperatura acima de LIMIAR_CALOR_C (leitor_inmet.py)
+- Balanço hídrico simples: precipitação menos ET0 de Hargreaves (radiação extraterrestre pela
+  latitude e dia do ano) e o déficit acumulado (dias em que a ET0 supera a chuva)
+
+Os segmentos são (estação, ano, mês) ou (estação, ano): o array é ordenado uma vez, os inícios de
+segmento são localizados por comparação com a linha anterior e cada variável sai de uma redução
+sobre o array inteiro, sem laço em Python por grupo. As sequências secas não atravessam segmentos.
+
+As tabelas seguem o esquema de inmet_clima_mensal.csv / inmet_clima_anual.csv (Ano, Mes) e são
+juntadas por correlacao_geral.py. Com --incremental, as chaves cujas linhas mudaram ficam
+registradas (agregacao_incremental.py) para que as tabelas integradas recalculem só essas linhas.
+
+Uso (a partir de scripts/):
+    python features_agroclimaticas.py                  # lê dados_processados/inmet_clima_diario.csv
+    python features_agroclimaticas.py --latitude -21.5 --dias-veranico 10
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from agregacao_incremental import opcao_incremental, salvar_com_alteracoes
+from leitor_inmet import LIMIAR_CALOR_C
+
+TEMP_BASE_C = 10.0
+TEMP_TETO_C = 30.0
+LIMIAR_SECO_MM = 1.0
+DIAS_VERANICO = 5
+LATITUDE_SIDROLANDIA = -20.93
+CONSTANTE_SOLAR = 0.0820  # MJ m-2 min-1
+MJ_PARA_MM = 0.408  # 1 MJ m-2 evapora ~0,408 mm
+
+
+def inicios_segmentos(chaves):
+    """Índices onde começa cada segmento de um array de chaves (n x k) já ordenado."""
+    chaves = np.asarray(chaves)
+    if len(chaves) == 0:
+        return np.array([], dtype=np.intp)
+    muda = np.any(chaves[1:] != chaves[:-1], axis=1)
+    return np.concatenate([[0], np.flatnonzero(muda) + 1])
+
+
+def soma_segmentos(valores, inicios):
+    """Soma por segmento ignorando NaN."""
+    return np.add.reduceat(np.nan_to_num(np.asarray(valores, dtype=float)), inicios)
+
+
+def contagem_segmentos(valores, inicios):
+    """Quantidade de valores válidos (não NaN) por segmento."""
+    return np.add.reduceat(np.isfinite(np.asarray(valores, dtype=float)).astype(np.int64), inicios)
+
+
+def graus_dia(tmin, tmax, base=TEMP_BASE_C, teto=TEMP_TETO_C):
+    """Graus-dia diários (método da média com Tmin/Tmax limitadas ao intervalo [base, teto])."""
+    tmin = np.clip(tmin, base, teto)
+    tmax = np.clip(tmax, base, teto)
+    return (tmin + tmax) / 2 - base
+
+
+def sequencias_secas(precipitacao, inicios, limiar=LIMIAR_SECO_MM, dias_minimos=DIAS_VERANICO, dias=None):
+    """
+    Por segmento: (número de veranicos com pelo menos `dias_minimos` dias secos, maior sequência seca).
+    Dia sem leitura interrompe a sequência: tanto a linha com NaN quanto o dia ausente da tabela, que
+    aparece como salto em `dias` (números dos dias, na mesma ordem das linhas). Tudo vetorizado: para
+    cada dia seco calcula-se há quantos dias a sequência começou (índice - início da sequência + 1).
+    """
+    precipitacao = np.asarray(precipitacao, dtype=float)
+    n = len(precipitacao)
+    seco = precipitacao < limiar  # NaN -> False
+    inicio_segmento = np.zeros(n, dtype=bool)
+    inicio_segmento[inicios] = True
+    if dias is not None:
+        inicio_segmento[1:] |= np.diff(np.asarray(dias)) != 1   # dia(s) faltando entre as linhas
+    anterior_seco = np.concatenate([[False], seco[:-1]]) & ~inicio_segmento
+    comeca = seco & ~anterior_seco
+
+    indice = np.arange(n)
+    inicio_sequencia = np.maximum.accumulate(np.where(comeca, indice, 0))
+    duracao = np.where(seco, indice - inicio_sequencia + 1, 0)
+
+    veranicos = np.add.reduceat((duracao == dias_minimos).astype(np.int64), inicios)
+    maior = np.maximum.reduceat(duracao, inicios)
+    return veranicos, maior
+
+
+def radiacao_extraterrestre(dia_do_ano, latitude):
+    """Radiação extraterrestre diária (FAO-56, eq. 21), em mm/dia equivalentes de evaporação."""
+    phi = np.radians(latitude)
+    angulo = 2 * np.pi * np.asarray(dia_do_ano, dtype=float) / 365
+    dr = 1 + 0.033 * np.cos(angulo)
+    declinacao = 0.409 * np.sin(angulo - 1.39)
+    ws = np.arccos(np.clip(-np.tan(phi) * np.tan(declinacao), -1, 1))
+    ra = (24 * 60 / np.pi) * CONSTANTE_SOLAR * dr * (
+        ws * np.sin(phi) * np.sin(declinacao) + np.cos(phi) * np.cos(declinacao) * np.sin(ws))
+    return MJ_PARA_MM * ra
+
+
+def et0_hargreaves(tmin, tmax, tmed, dia_do_ano, latitude):
+    """Evapotranspiração de referência diária (mm) por Hargreaves-Samani."""
+    amplitude = np.sqrt(np.clip(np.asarray(tmax) - np.asarray(tmin), 0, None))
+    return 0.0023 * (np.asarray(tmed) + 17.8) * amplitude * radiacao_extraterrestre(dia_do_ano, latitude)
+
+
+def horas_acima(temperatura_horaria, inicios, limiar=LIMIAR_CALOR_C):
+    """Horas com temperatura acima do limiar por segmento (para séries horárias já carregadas)."""
+    return np.add.reduceat((np.asarray(temperatura_horaria, dtype=float) > limiar).astype(np.int64), inicios)
+
+
+def calcular_features(diario, por_mes=True, latitude=LATITUDE_SIDROLANDIA, base=TEMP_BASE_C,
+                      teto=TEMP_TETO_C, limiar_seco=LIMIAR_SECO_MM, dias_veranico=DIAS_VERANICO):
+    """
+    Variáveis agroclimáticas por (Estacao, Ano, Mes) ou (Estacao, Ano) a partir do clima diário
+    (colunas Data, Precipitacao_total_mm, Temp_media_C, Temp_min_C, Temp_max_C e, se houver,
+    Horas_calor). Sem a coluna Estacao, a tabela é tratada como uma única estação.
+    """
+    datas = pd.to_datetime(diario['Data'])
+    chaves = pd.DataFrame({'Ano': datas.dt.year, 'Mes': datas.dt.month} if por_mes else {'Ano': datas.dt.year})
+    if 'Estacao' in diario:
+        chaves.insert(0, 'Estacao', diario['Estacao'].values)
+    ordem = np.lexsort((datas.to_numpy(), *[chaves[c].to_numpy() for c in reversed(chaves.columns)]))
+    chaves = chaves.iloc[ordem].reset_index(drop=True)
+    codigos = np.column_stack([pd.factorize(chaves[c], sort=True)[0] for c in chaves.columns])
+    inicios = inicios_segmentos(codigos)
+
+    def coluna(nome):
+        return diario[nome].to_numpy(dtype=float)[ordem]
+
+    precipitacao = coluna('Precipitacao_total_mm')
+    tmin, tmax, tmed = coluna('Temp_min_C'), coluna('Temp_max_C'), coluna('Temp_media_C')
+    et0 = et0_hargreaves(tmin, tmax, tmed, datas.dt.dayofyear.to_numpy()[ordem], latitude)
+    balanco = precipitacao - et0
+    dias = datas.to_numpy().astype('datetime64[D]').astype(np.int64)[ordem]
+    veranicos, maior_seca = sequencias_secas(precipitacao, inicios, limiar_seco, dias_veranico, dias)
+
+    features = chaves.iloc[inicios].reset_index(drop=True)
+    features['Graus_dia'] = soma_segmentos(graus_dia(tmin, tmax, base, teto), inicios)
+    features['Veranicos'] = veranicos
+    features['Maior_seq_seca_dias'] = maior_seca
+    if 'Horas_calor' in diario:
+        features['Horas_calor'] = soma_segmentos(coluna('Horas_calor'), inicios)
+    features['ET0_mm'] = soma_segmentos(et0, inicios)
+    features['Balanco_hidrico_mm'] = soma_segmentos(balanco, inicios)
+    features['Deficit_hidrico_mm'] = soma_segmentos(np.clip(-balanco, 0, None), inicios)
+    features['Dias_validos'] = contagem_segmentos(balanco, inicios)
+    return features
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Graus-dia, veranicos, horas de calor e balanço hídrico.')
+    parser.add_argument('--entrada', default='../dados_processados/inmet_clima_diario.csv')
+    parser.add_argument('--latitude', type=float, default=LATITUDE_SIDROLANDIA, help='latitude da estação (graus)')
+    parser.add_argument('--dias-veranico', type=int, default=DIAS_VERANICO,
+                        help='dias secos consecutivos para contar um veranico')
+    opcao_incremental(parser)
+    args = parser.parse_args()
+
+    diario = pd.read_csv(args.entrada)
+    mensal = calcular_features(diario, por_mes=True, latitude=args.latitude, dias_veranico=args.dias_veranico)
+    anual = calcular_features(diario, por_mes=False, latitude=args.latitude, dias_veranico=args.dias_veranico)
+    for tabela, saida, chaves in ((mensal, '../dados_processados/features_agroclimaticas_mensal.csv', ['Ano', 'Mes']),
+                                  (anual, '../dados_processados/features_agroclimaticas_anual.csv', ['Ano'])):
+        if args.incremental:
+            salvar_com_alteracoes(tabela, saida, chaves)
+        else:
+            tabela.to_csv(saida, index=False)
+    print(anual.to_string(index=False))
+    print('\nVariáveis agroclimáticas salvas em dados_processados/features_agroclimaticas_{mensal,anual}.csv')
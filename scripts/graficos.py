@@ -0,0 +1,513 @@
+"""
+Registro das figuras do projeto, desenhadas apenas a partir de dados já salvos.
+- Cada figura declara o PNG de saída e os arquivos de dados que lê (caminhos relativos à raiz)
+- Os scripts de análise só calculam e salvam dados; para desenhar chamam desenhar_figuras()
+  com os nomes das suas figuras (ou nada, com --sem-graficos / --no-plots)
+- renderizar_figuras.py desenha todas as figuras em paralelo e pula as que já estão em dia
+- O hash dos dados + código de graficos.py fica em .cache/figuras/<nome>.json (o arquivo inteiro:
+  funções auxiliares, paletas e constantes usadas pelos desenhos também contam)
+
+Backend 'Agg': nada abre janela (antes havia plt.show() bloqueando execuções automáticas).
+"""
+import hashlib
+import json
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from cache_dados import hash_arquivo
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIR_SCRIPTS)
+DIR_ESTADO = os.path.join(RAIZ, '.cache', 'figuras')
+
+FIGURAS = {}
+
+
+def figura(saida, entradas):
+    """Registra a função como desenho de `saida` a partir dos arquivos `entradas`."""
+    def registrar(desenhar):
+        FIGURAS[desenhar.__name__] = {'saida': saida, 'entradas': entradas, 'desenhar': desenhar}
+        return desenhar
+    return registrar
+
+
+def _caminho(relativo):
+    return os.path.join(RAIZ, relativo)
+
+
+def _ler(relativo, **kwargs):
+    return pd.read_csv(_caminho(relativo), **kwargs)
+
+
+def _salvar(relativo, **kwargs):
+    os.makedirs(os.path.dirname(_caminho(relativo)), exist_ok=True)
+    plt.savefig(_caminho(relativo), **kwargs)
+    plt.close('all')
+
+
+def opcao_sem_graficos(parser):
+    parser.add_argument('--sem-graficos', '--no-plots', dest='sem_graficos', action='store_true',
+                        default=os.environ.get('SEM_GRAFICOS') == '1', help='gera apenas os dados (figuras depois, com renderizar_figuras.py)')
+    return parser
+
+
+# --- Controle de figuras em dia -----------------------------------------------------------
+
+def impressao_figura(nome):
+    """Hash das entradas, do nome da figura e de graficos.py; None se alguma entrada não existir."""
+    info = FIGURAS[nome]
+    h = hashlib.sha256(nome.encode('utf-8'))
+    h.update(hash_arquivo(os.path.abspath(__file__)).encode('utf-8'))
+    for entrada in info['entradas']:
+        if not os.path.exists(_caminho(entrada)):
+            return None
+        h.update(entrada.encode('utf-8'))
+        h.update(hash_arquivo(_caminho(entrada)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _arquivo_estado(nome):
+    return os.path.join(DIR_ESTADO, nome + '.json')
+
+
+def figura_em_dia(nome, impressao):
+    if not os.path.exists(_caminho(FIGURAS[nome]['saida'])) or not os.path.exists(_arquivo_estado(nome)):
+        return False
+    with open(_arquivo_estado(nome), encoding='utf-8') as f:
+        return json.load(f).get('impressao') == impressao
+
+
+def desenhar_figura(nome, impressao=None):
+    """Desenha uma figura e registra a impressão dos dados usados (um arquivo de estado por figura)."""
+    impressao = impressao or impressao_figura(nome)
+    FIGURAS[nome]['desenhar']()
+    os.makedirs(DIR_ESTADO, exist_ok=True)
+    with open(_arquivo_estado(nome), 'w', encoding='utf-8') as f:
+        json.dump({'saida': FIGURAS[nome]['saida'], 'impressao': impressao}, f)
+
+
+def desenhar_figuras(nomes):
+    """Desenho em série, usado pelos scripts ao final do cálculo (figuras em dia são puladas)."""
+    for nome in nomes:
+        impressao = impressao_figura(nome)
+        if impressao is not None and not figura_em_dia(nome, impressao):
+            desenhar_figura(nome, impressao)
+
+
+# --- NDVI ---------------------------------------------------------------------------------
+
+@figura('resultados/ndvi_serie_temporal.png', ['dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx'])
+def ndvi_serie_temporal():
+    from cache_dados import ler_excel_cache
+    df = ler_excel_cache(_caminho('dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx'))
+    plt.figure(figsize=(12, 5))
+    plt.plot(pd.to_datetime(df['Data'], dayfirst=True), df['Savitzky-Golay'], label='NDVI Suavizado (Golay)', color='green')
+    plt.xlabel('Data')
+    plt.ylabel('NDVI Suavizado')
+    plt.title('NDVI Suavizado (Savitzky-Golay) ao longo do tempo')
+    plt.legend()
+    plt.tight_layout()
+    _salvar('resultados/ndvi_serie_temporal.png')
+
+
+@figura('resultados/ndvi_mensal_por_ano.png', ['dados_processados/ndvi_mensal.csv'])
+def ndvi_mensal_por_ano():
+    ndvi_mensal = _ler('dados_processados/ndvi_mensal.csv')
+    plt.figure(figsize=(12,6))
+    for ano, grupo in ndvi_mensal.groupby('Ano'):
+        plt.plot(grupo['Mes'], grupo['NDVI_medio'], marker='o', label=str(ano))
+    plt.title('NDVI Médio Mensal por Ano - Sidrolândia-MS')
+    plt.xlabel('Mês')
+    plt.ylabel('NDVI Médio (suavizado)')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    _salvar('resultados/ndvi_mensal_por_ano.png')
+
+
+@figura('resultados/ndvi_mensal_boxplot.png', ['dados_processados/ndvi_mensal.csv'])
+def ndvi_mensal_boxplot():
+    ndvi_mensal = _ler('dados_processados/ndvi_mensal.csv')
+    plt.figure(figsize=(10,5))
+    sns.boxplot(x='Mes', y='NDVI_medio', data=ndvi_mensal, color='green')
+    plt.title('Distribuição Mensal do NDVI Médio (Todos os Anos)')
+    plt.xlabel('Mês')
+    plt.ylabel('NDVI Médio')
+    plt.tight_layout()
+    _salvar('resultados/ndvi_mensal_boxplot.png')
+
+
+# --- Clima (INMET) ------------------------------------------------------------------------
+
+@figura('resultados/inmet_precipitacao_anual.png', ['dados_processados/inmet_clima_anual.csv'])
+def inmet_precipitacao_anual():
+    clima_anual = _ler('dados_processados/inmet_clima_anual.csv')
+    plt.figure(figsize=(8,5))
+    plt.bar(clima_anual['Ano'], clima_anual['Precipitacao_total_mm'], color='royalblue')
+    plt.title('Precipitação Total Anual (mm) - Sidrolândia-MS')
+    plt.ylabel('mm')
+    plt.xlabel('Ano')
+    plt.tight_layout()
+    _salvar('resultados/inmet_precipitacao_anual.png')
+
+
+@figura('resultados/inmet_temp_media_anual.png', ['dados_processados/inmet_clima_anual.csv'])
+def inmet_temp_media_anual():
+    clima_anual = _ler('dados_processados/inmet_clima_anual.csv')
+    plt.figure(figsize=(8,5))
+    plt.plot(clima_anual['Ano'], clima_anual['Temp_media_C'], marker='o', color='tomato')
+    plt.title('Temperatura Média Anual (°C) - Sidrolândia-MS')
+    plt.ylabel('°C')
+    plt.xlabel('Ano')
+    plt.tight_layout()
+    _salvar('resultados/inmet_temp_media_anual.png')
+
+
+@figura('resultados/inmet_precipitacao_mensal_boxplot.png', ['dados_processados/inmet_clima_mensal.csv'])
+def inmet_precipitacao_mensal_boxplot():
+    clima_mensal = _ler('dados_processados/inmet_clima_mensal.csv')
+    plt.figure(figsize=(10,5))
+    sns.boxplot(x='Mes', y='Precipitacao_total_mm', data=clima_mensal, color='royalblue')
+    plt.title('Distribuição Mensal da Precipitação (mm)')
+    plt.ylabel('mm')
+    plt.xlabel('Mês')
+    plt.tight_layout()
+    _salvar('resultados/inmet_precipitacao_mensal_boxplot.png')
+
+
+@figura('resultados/inmet_temp_media_mensal_boxplot.png', ['dados_processados/inmet_clima_mensal.csv'])
+def inmet_temp_media_mensal_boxplot():
+    clima_mensal = _ler('dados_processados/inmet_clima_mensal.csv')
+    plt.figure(figsize=(10,5))
+    sns.boxplot(x='Mes', y='Temp_media_C', data=clima_mensal, color='tomato')
+    plt.title('Distribuição Mensal da Temperatura Média (°C)')
+    plt.ylabel('°C')
+    plt.xlabel('Mês')
+    plt.tight_layout()
+    _salvar('resultados/inmet_temp_media_mensal_boxplot.png')
+
+
+# --- Integração e correlações -------------------------------------------------------------
+
+@figura('resultados/ndvi_vs_produtividade.png', ['dados_processados/dataset_integrado_ndvi_produtividade.csv'])
+def ndvi_vs_produtividade():
+    df_merged = _ler('dados_processados/dataset_integrado_ndvi_produtividade.csv')
+    plt.figure(figsize=(8,5))
+    plt.scatter(df_merged['Savitzky-Golay'], df_merged['Produtividade (ton/ha)'], color='blue')
+    plt.xlabel('NDVI Médio Anual (Savitzky-Golay)')
+    plt.ylabel('Produtividade do Milho (ton/ha)')
+    plt.title('Relação NDVI Médio Anual x Produtividade do Milho')
+    plt.grid(True)
+    plt.tight_layout()
+    _salvar('resultados/ndvi_vs_produtividade.png')
+
+
+@figura('resultados/correlacao_anual_heatmap.png', ['dados_processados/correlacao_anual.csv'])
+def correlacao_anual_heatmap():
+    corr_anual = _ler('dados_processados/correlacao_anual.csv', index_col=0)
+    plt.figure(figsize=(8,6))
+    sns.heatmap(corr_anual, annot=True, cmap='coolwarm', fmt='.2f')
+    plt.title('Matriz de Correlação Anual (NDVI, Clima, Produtividade)')
+    plt.tight_layout()
+    _salvar('resultados/correlacao_anual_heatmap.png')
+
+
+@figura('resultados/correlacao_mensal_heatmap.png', ['dados_processados/correlacao_mensal.csv'])
+def correlacao_mensal_heatmap():
+    corr_mensal = _ler('dados_processados/correlacao_mensal.csv', index_col=0)
+    plt.figure(figsize=(8,6))
+    sns.heatmap(corr_mensal, annot=True, cmap='viridis', fmt='.2f')
+    plt.title('Matriz de Correlação Mensal (NDVI, Clima)')
+    plt.tight_layout()
+    _salvar('resultados/correlacao_mensal_heatmap.png')
+
+
+# --- Modelos ------------------------------------------------------------------------------
+
+def _real_vs_predito(arquivo, saida, titulo, cor, tamanho):
+    previsoes = _ler(arquivo)
+    y, y_pred = previsoes['Produtividade_Real'], previsoes['Produtividade_Predita']
+    plt.figure(figsize=(8,6))
+    plt.scatter(y, y_pred, color=cor, s=tamanho)
+    plt.plot([y.min(), y.max()], [y.min(), y.max()], 'r--')
+    plt.xlabel('Produtividade Real (ton/ha)')
+    plt.ylabel('Produtividade Predita (ton/ha)')
+    plt.title(titulo)
+    plt.grid(True)
+    plt.tight_layout()
+    _salvar(saida)
+
+
+@figura('resultados/modelo_anual_real_vs_predito.png', ['dados_processados/modelo_anual_previsoes.csv'])
+def modelo_anual_real_vs_predito():
+    _real_vs_predito('dados_processados/modelo_anual_previsoes.csv', 'resultados/modelo_anual_real_vs_predito.png',
+                     'Modelo Anual: Produtividade Real vs Predita', 'blue', 80)
+
+
+@figura('resultados/modelo_mensal_real_vs_predito.png', ['dados_processados/modelo_mensal_previsoes.csv'])
+def modelo_mensal_real_vs_predito():
+    _real_vs_predito('dados_processados/modelo_mensal_previsoes.csv', 'resultados/modelo_mensal_real_vs_predito.png',
+                     'Modelo Mensal: Produtividade Real vs Predita', 'green', 60)
+
+
+@figura('resultados/produtividade_rf_completo_real_vs_predito.png', ['dados_processados/rf_completo_previsoes.csv'])
+def produtividade_rf_completo_real_vs_predito():
+    previsoes = _ler('dados_processados/rf_completo_previsoes.csv')
+    plt.figure(figsize=(8,5))
+    plt.plot(previsoes['Ano'], previsoes['Produtividade_Real'], label='Real', marker='o')
+    plt.plot(previsoes['Ano'], previsoes['Produtividade_Predita'], label='Predito', marker='s')
+    plt.xlabel('Ano')
+    plt.ylabel('Produtividade (ton/ha)')
+    plt.title('Produtividade Real vs Predita (Random Forest)')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    _salvar('resultados/produtividade_rf_completo_real_vs_predito.png', dpi=200)
+
+
+@figura('resultados/produtividade_rf_importancia_variaveis.png', ['dados_processados/rf_completo_importancia.csv'])
+def produtividade_rf_importancia_variaveis():
+    importancia = _ler('dados_processados/rf_completo_importancia.csv')
+    plt.figure(figsize=(7,4))
+    sns.barplot(x=importancia['Importancia'], y=importancia['Variavel'], palette='viridis')
+    plt.title('Importância das Variáveis - Random Forest')
+    plt.xlabel('Importância')
+    plt.tight_layout()
+    _salvar('resultados/produtividade_rf_importancia_variaveis.png', dpi=200)
+
+
+@figura('resultados/produtividade_rf_real_vs_predito.png', ['dados_processados/rf_resultados_detalhados.csv'])
+def produtividade_rf_real_vs_predito():
+    from validacao_loo import metricas_regressao
+    resultados = _ler('dados_processados/rf_resultados_detalhados.csv')
+    metricas = metricas_regressao(resultados['Produtividade_Real'], resultados['Produtividade_Predita'])
+    plt.figure(figsize=(10, 6))
+    plt.plot(resultados['Ano'], resultados['Produtividade_Real'], 'o-', label='Real', color='blue', linewidth=2)
+    plt.plot(resultados['Ano'], resultados['Produtividade_Predita'], 's--', label='Predito', color='orange', linewidth=2)
+    plt.xlabel('Ano')
+    plt.ylabel('Produtividade (ton/ha)')
+    plt.title(f"Produtividade Real vs Predita (Random Forest)\n"
+              f"R² = {metricas['R2']:.2f}, MAE = {metricas['MAE']:.2f}, RMSE = {metricas['RMSE']:.2f}")
+    plt.legend()
+    plt.grid(True)
+    plt.xticks(resultados['Ano'])
+    plt.tight_layout()
+    _salvar('resultados/produtividade_rf_real_vs_predito.png', dpi=300)
+
+
+@figura('resultados/rf_anual_residuos.png', ['dados_processados/rf_resultados_detalhados.csv'])
+def rf_anual_residuos():
+    resultados = _ler('dados_processados/rf_resultados_detalhados.csv')
+    plt.figure(figsize=(10, 6))
+    plt.stem(resultados['Ano'], resultados['Residuo'], 'r', markerfmt='ro', label='Resíduos')
+    plt.axhline(y=0, color='blue', linestyle='-')
+    plt.xlabel('Ano')
+    plt.ylabel('Resíduo (ton/ha)')
+    plt.title('Análise de Resíduos - Random Forest')
+    plt.grid(True, alpha=0.3)
+    plt.xticks(resultados['Ano'])
+
+    # Anotar os valores dos resíduos
+    for ano, res in zip(resultados['Ano'], resultados['Residuo']):
+        plt.annotate(f'{res:.2f}', (ano, res), textcoords="offset points",
+                     xytext=(0,10), ha='center')
+
+    plt.tight_layout()
+    _salvar('resultados/rf_anual_residuos.png', dpi=300)
+
+
+@figura('resultados/rf_anual_importancia.png', ['dados_processados/rf_importancia.csv'])
+def rf_anual_importancia():
+    # Já ordenada da mais para a menos importante
+    importancia = _ler('dados_processados/rf_importancia.csv')
+    importancias_pct = importancia['Importancia'] * 100
+
+    plt.figure(figsize=(10, 6))
+    sns.barplot(x=importancias_pct, y=importancia['Variavel'], palette='viridis')
+    plt.title('Importância das Variáveis - Random Forest', fontsize=14)
+    plt.xlabel('Importância Relativa (%)', fontsize=12)
+    plt.ylabel('Variável', fontsize=12)
+
+    # Adicionar valores percentuais nas barras
+    for i, v in enumerate(importancias_pct):
+        plt.text(v + 0.5, i, f'{v:.1f}%', va='center')
+
+    plt.tight_layout()
+    _salvar('resultados/rf_anual_importancia.png', dpi=300)
+
+
+@figura('resultados/rf_anual_dispersao.png', ['dados_processados/rf_resultados_detalhados.csv'])
+def rf_anual_dispersao():
+    resultados = _ler('dados_processados/rf_resultados_detalhados.csv')
+    y_true, y_pred = resultados['Produtividade_Real'], resultados['Produtividade_Predita']
+    plt.figure(figsize=(8, 8))
+    plt.scatter(y_true, y_pred, c='blue', alpha=0.6, s=100)
+    plt.plot([min(y_true), max(y_true)], [min(y_true), max(y_true)], 'r--')
+    plt.xlabel('Produtividade Real (ton/ha)')
+    plt.ylabel('Produtividade Predita (ton/ha)')
+    plt.title('Dispersão: Valores Reais vs. Preditos')
+    plt.grid(True, alpha=0.3)
+
+    # Anotar os anos
+    for real, predito, ano in zip(y_true, y_pred, resultados['Ano']):
+        plt.annotate(str(ano), (real, predito), textcoords="offset points",
+                     xytext=(5,5), ha='left')
+
+    plt.tight_layout()
+    _salvar('resultados/rf_anual_dispersao.png', dpi=300)
+
+
+@figura('resultados/rf_oob_curva.png', ['dados_processados/rf_oob_curva.csv', 'dados_processados/rf_oob_vs_loo.csv'])
+def rf_oob_curva():
+    curva = _ler('dados_processados/rf_oob_curva.csv')
+    rmse_loo = _ler('dados_processados/rf_oob_vs_loo.csv').query("Metrica == 'RMSE'").set_index('Modelo')['LOO']
+    plt.figure(figsize=(9, 5))
+    for (modelo, grupo), cor in zip(curva.groupby('Modelo'), sns.color_palette('deep')):
+        plt.plot(grupo['n_estimators'], grupo['RMSE_OOB'], marker='o', color=cor, label=f'{modelo} (OOB)')
+        if pd.notna(rmse_loo.get(modelo)):
+            plt.axhline(rmse_loo[modelo], color=cor, linestyle='--', label=f'{modelo} (LOO, 100 árvores)')
+    plt.xlabel('Número de árvores')
+    plt.ylabel('RMSE (ton/ha)')
+    plt.title('Random Forest: erro OOB x número de árvores')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    _salvar('resultados/rf_oob_curva.png', dpi=200)
+
+
+# --- Análise estatística ------------------------------------------------------------------
+
+COLS_ANUAL = ['Produtividade (ton/ha)', 'Savitzky-Golay', 'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media']
+
+
+@figura('resultados/regression.png', ['dados_processados/integrado_anual.csv'])
+def regression():
+    import statsmodels.api as sm
+    df_anual = _ler('dados_processados/integrado_anual.csv')
+    model = sm.OLS(df_anual['Produtividade (ton/ha)'], sm.add_constant(df_anual['Savitzky-Golay'])).fit()
+    plt.figure(figsize=(8, 6))
+    sns.regplot(x='Savitzky-Golay', y='Produtividade (ton/ha)', data=df_anual,
+               line_kws={"color": "red"})
+    plt.title(f'Regressão Linear: NDVI x Produtividade\nR² = {model.rsquared:.3f}, p = {model.pvalues.iloc[1]:.3f}')
+    plt.tight_layout()
+    _salvar('resultados/regression.png', dpi=200)
+
+
+@figura('resultados/corr_matrix.png', ['dados_processados/correlacao_pearson_anual.csv'])
+def corr_matrix():
+    corr_anual = _ler('dados_processados/correlacao_pearson_anual.csv', index_col=0)
+    plt.figure(figsize=(10, 8))
+    mask = np.triu(np.ones_like(corr_anual, dtype=bool))
+    cmap = sns.diverging_palette(230, 20, as_cmap=True)
+    sns.heatmap(
+        corr_anual,
+        annot=True,
+        mask=mask,
+        cmap=cmap,
+        vmax=1,
+        vmin=-1,
+        center=0,
+        square=True,
+        linewidths=.5,
+        fmt=".2f"
+    )
+    plt.title('Matriz de Correlação (Pearson) - Dados Anuais')
+    plt.tight_layout()
+    _salvar('resultados/corr_matrix.png', dpi=200)
+
+
+@figura('resultados/pairplot.png', ['dados_processados/integrado_anual.csv'])
+def pairplot():
+    df_anual = _ler('dados_processados/integrado_anual.csv')
+    sns.pairplot(df_anual[COLS_ANUAL], kind='reg', diag_kind='kde')
+    plt.tight_layout()
+    _salvar('resultados/pairplot.png', dpi=200)
+
+
+@figura('resultados/time_series.png', ['dados_processados/integrado_anual.csv'])
+def time_series():
+    df_anual = _ler('dados_processados/integrado_anual.csv')
+    fig, ax1 = plt.subplots(figsize=(10, 6))
+
+    color = 'tab:blue'
+    ax1.set_xlabel('Ano')
+    ax1.set_ylabel('Produtividade (ton/ha)', color=color)
+    ax1.plot(df_anual['Ano'], df_anual['Produtividade (ton/ha)'], marker='o', color=color)
+    ax1.tick_params(axis='y', labelcolor=color)
+
+    ax2 = ax1.twinx()
+    color = 'tab:green'
+    ax2.set_ylabel('NDVI médio', color=color)
+    ax2.plot(df_anual['Ano'], df_anual['Savitzky-Golay'], marker='s', color=color)
+    ax2.tick_params(axis='y', labelcolor=color)
+
+    plt.title('Série Temporal: NDVI e Produtividade')
+    plt.tight_layout()
+    _salvar('resultados/time_series.png', dpi=200)
+
+
+# --- Imagens SATVeg -----------------------------------------------------------------------
+
+# Zonas da segmentação K-means e cores de destaque (verde, amarelo, cinza)
+CORES_ZONAS = {
+    'Vegetação ativa': (34, 139, 34),
+    'Solo exposto': (255, 255, 0),
+    'Vegetação nativa/pousio': (160, 160, 160),
+}
+
+
+@figura('resultados/satveg_segmentado_kmeans.png', [
+    'resultados/satveg-sta-querencia.png',
+    'dados_processados/satveg_segmentado_kmeans_rotulos.npy',
+    'dados_processados/satveg_segmentado_kmeans_contagem.csv',
+])
+def satveg_segmentado_kmeans():
+    from PIL import Image
+    from segmentacao_kmeans import pintar_sobreposicao
+    Image.MAX_IMAGE_PIXELS = None
+    img_np = np.asarray(Image.open(_caminho('resultados/satveg-sta-querencia.png')).convert('RGB'))
+    rotulos = np.load(_caminho('dados_processados/satveg_segmentado_kmeans_rotulos.npy'), mmap_mode='r')
+    contagem = _ler('dados_processados/satveg_segmentado_kmeans_contagem.csv').sort_values('cluster')
+    lut_cores = np.array([CORES_ZONAS[zona] for zona in contagem['zona']], dtype=np.float32)
+    img_overlay = pintar_sobreposicao(img_np, rotulos, lut_cores, alpha=0.45)
+
+    plt.figure(figsize=(10,10))
+    plt.imshow(img_overlay)
+    plt.axis('off')
+    plt.title('Segmentação K-means: Vegetação (verde), Solo exposto (amarelo), Pousio (cinza)')
+    _salvar('resultados/satveg_segmentado_kmeans.png', bbox_inches='tight', dpi=300)
+
+
+@figura('resultados/satveg_segmentado.png', ['satveg_grafico.png', 'dados_processados/satveg_grafico_resumo.csv'])
+def satveg_segmentado():
+    from digitalizacao_satveg import ler_grafico
+    img = ler_grafico(_caminho('satveg_grafico.png'))
+    resumo = _ler('dados_processados/satveg_grafico_resumo.csv').iloc[0]
+    y_preto, y_roxo, altura_px = resumo['y_preto'], resumo['y_roxo'], resumo['altura_px']
+
+    fig, ax = plt.subplots(figsize=(10,5))
+    ax.imshow(img)
+    ax.axis('off')
+    ax.set_title('SATVeg NDVI - Segmentação Temporal', fontsize=16, weight='bold')
+
+    # Preenche faixas NDVI alinhadas às linhas detectadas
+    # NDVI alto: acima da linha preta, médio: entre preta e roxa, baixo: abaixo da roxa
+    faixas = [
+        (0, y_roxo, '#ffeeba', 'NDVI Baixo'),
+        (y_roxo, y_preto, '#b7e4c7', 'NDVI Médio'),
+        (y_preto, altura_px, '#90ee90', 'NDVI Alto')
+    ]
+    for y1, y2, cor, label in faixas:
+        ax.fill_betweenx(y=[y1, y2], x1=0, x2=img.shape[1], color=cor, alpha=0.3, label=label)
+
+    # Apenas uma legenda clara
+    handles, labels = ax.get_legend_handles_labels()
+    by_label = dict(zip(labels, handles))
+    ax.legend(by_label.values(), by_label.keys(), loc='lower left', fontsize=12, frameon=True)
+    _salvar('resultados/satveg_segmentado.png', bbox_inches='tight', dpi=300)
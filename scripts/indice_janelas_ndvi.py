@@ -0,0 +1,227 @@
+"""
+Índice de somas acumuladas para consultar séries NDVI/EVI em janelas de datas arbitrárias,
+e busca da janela fenológica que melhor prevê a produtividade.
+- Para cada série (NDVI, Savitzky-Golay, EVI), sobre as observações válidas em ordem de data,
+  guarda somas acumuladas, a integral acumulada da curva (trapézios, índice x dia) e uma sparse
+  table de máximos (log2 n níveis); a contagem é a diferença das posições
+- Média, máximo e área sob a curva de qualquer janela [início, fim] saem em O(1): dois
+  searchsorted e diferenças de acumulados (o máximo combina dois blocos da sparse table)
+- As consultas são vetorizadas: inícios e fins podem ser matrizes (janelas x anos)
+- A área usa a curva interpolada linearmente, recortada exatamente nas bordas da janela
+
+O ano civil (analise_ndvi.py) não acompanha o ciclo do milho (safra plantada em set-dez, safrinha
+em jan-mar). Aqui cada janela é um deslocamento a partir de 1º de agosto do ano anterior à
+colheita mais uma duração; a grade inteira (milhares de janelas) vira uma matriz de variáveis
+(janelas x anos) em uma chamada, e cada janela é avaliada pelo R² leave-one-out da regressão
+linear simples com a Produtividade (ton/ha), em fórmula fechada (e_i / (1 - h_ii)) para todas de
+uma vez. Com poucos anos de produtividade, a melhor janela é exploratória: muitas janelas
+candidatas e poucos pontos favorecem ajustes ao acaso.
+
+Uso (a partir de scripts/):
+    python indice_janelas_ndvi.py
+    python indice_janelas_ndvi.py --passo 8 --duracao-maxima 240
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from cache_dados import ler_excel_cache
+
+# Série -> (coluna de data, coluna de valores) na planilha do SATVeg (o EVI tem datas próprias;
+# sem 'Data.1', usa-se 'Data')
+SERIES = {
+    'NDVI': ('Data', 'NDVI'),
+    'NDVI_SG': ('Data', 'Savitzky-Golay'),
+    'EVI': ('Data.1', 'EVI'),
+    'EVI_SG': ('Data.1', 'Savitzky-Golay.1'),
+}
+ESTATISTICAS = ('media', 'maximo', 'area')
+MES_ANCORA = 8          # janelas contadas a partir de 1º de agosto do ano anterior à colheita
+DESLOCAMENTO_MAXIMO = 400
+DURACAO_MINIMA = 16     # um composto MODIS
+DURACAO_MAXIMA = 240
+PASSO_DIAS = 8
+LIMITE_ALAVANCAGEM = 1 - 1e-8
+
+
+def _dias(datas):
+    """Datas (datetime64 ou Timestamp) -> dias desde 1970-01-01 (int64); inteiros já são dias."""
+    datas = np.asarray(datas)
+    if np.issubdtype(datas.dtype, np.integer):
+        return datas.astype(np.int64)
+    return datas.astype('datetime64[D]').astype(np.int64)
+
+
+def construir_indice(datas, valores):
+    """
+    Índice de uma série: dias e valores válidos ordenados, somas acumuladas (com zero inicial),
+    integral acumulada da curva linear por partes e sparse table de máximos.
+    """
+    dias = _dias(pd.to_datetime(datas))
+    valores = np.asarray(valores, dtype=float)
+    validos = np.isfinite(valores)
+    ordem = np.argsort(dias[validos], kind='stable')
+    dias, valores = dias[validos][ordem], valores[validos][ordem]
+
+    soma = np.concatenate([[0.0], np.cumsum(valores)])
+    trapezios = np.diff(dias) * (valores[1:] + valores[:-1]) / 2
+    area = np.concatenate([[0.0], np.cumsum(trapezios)])
+
+    # maximos[k, i] = max(valores[i : i + 2**k])
+    niveis = [valores]
+    while 2 ** len(niveis) <= len(valores):
+        metade = 2 ** (len(niveis) - 1)
+        anterior = niveis[-1]
+        niveis.append(np.maximum(anterior[:-metade], anterior[metade:]))
+    maximos = np.full((len(niveis), len(valores)), -np.inf)
+    for k, nivel in enumerate(niveis):
+        maximos[k, :len(nivel)] = nivel
+    return {'dias': dias, 'valores': valores, 'soma': soma, 'area': area, 'maximos': maximos}
+
+
+def construir_indices(df, series=SERIES):
+    """{série: índice} para as séries da planilha do SATVeg presentes em `df`."""
+    indices = {}
+    for nome, (col_data, col_valor) in series.items():
+        col_data = col_data if col_data in df else 'Data'
+        if col_data in df and col_valor in df:
+            datas = df[col_data]
+            if not pd.api.types.is_datetime64_any_dtype(datas):
+                datas = pd.to_datetime(datas, dayfirst=True)
+            indices[nome] = construir_indice(datas, df[col_valor])
+    return indices
+
+
+def _integral_ate(indice, t):
+    """Área sob a curva do primeiro dia da série até o dia t (t fora da série é recortado)."""
+    dias, valores = indice['dias'], indice['valores']
+    t = np.clip(t, dias[0], dias[-1])
+    k = np.clip(np.searchsorted(dias, t, side='right') - 1, 0, len(dias) - 2)
+    passo = np.maximum(dias[k + 1] - dias[k], 1)
+    valor_t = valores[k] + (valores[k + 1] - valores[k]) * (t - dias[k]) / passo
+    return indice['area'][k] + (t - dias[k]) * (valores[k] + valor_t) / 2
+
+
+def consultar(indice, inicios, fins):
+    """
+    Média, máximo, área e número de observações em [início, fim] (datas ou dias, inclusivos),
+    para arrays de inícios e fins de qualquer formato. Janelas sem observação dão NaN.
+    """
+    inicios, fins = _dias(inicios), _dias(fins)
+    i = np.searchsorted(indice['dias'], inicios, side='left')
+    j = np.searchsorted(indice['dias'], fins, side='right')
+    n = j - i
+    vazia = n <= 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = (indice['soma'][j] - indice['soma'][i]) / n
+    nivel = np.floor(np.log2(np.maximum(n, 1))).astype(np.intp)
+    tamanho = 2 ** nivel
+    ultima = len(indice['valores']) - 1
+    maximo = np.maximum(indice['maximos'][nivel, np.minimum(i, ultima)],
+                        indice['maximos'][nivel, np.clip(j - tamanho, 0, ultima)])
+    area = _integral_ate(indice, fins) - _integral_ate(indice, inicios)
+
+    media, maximo, area = (np.where(vazia, np.nan, v) for v in (media, maximo, area))
+    return {'media': media, 'maximo': maximo, 'area': area, 'n': n}
+
+
+def grade_janelas(deslocamento_maximo=DESLOCAMENTO_MAXIMO, duracao_minima=DURACAO_MINIMA,
+                  duracao_maxima=DURACAO_MAXIMA, passo=PASSO_DIAS):
+    """Todas as combinações (deslocamento do início, duração) da grade, em dias."""
+    deslocamentos, duracoes = np.meshgrid(np.arange(0, deslocamento_maximo + 1, passo),
+                                          np.arange(duracao_minima, duracao_maxima + 1, passo), indexing='ij')
+    return deslocamentos.ravel(), duracoes.ravel()
+
+
+def janelas_por_ano(anos, deslocamentos, duracoes, mes_ancora=MES_ANCORA):
+    """Inícios e fins em dias (janelas x anos): âncora do ano anterior + deslocamento (+ duração - 1)."""
+    ancoras = _dias(pd.to_datetime({'year': np.asarray(anos) - 1, 'month': mes_ancora, 'day': 1}))
+    inicios = ancoras[None, :] + np.asarray(deslocamentos)[:, None]
+    return inicios, inicios + np.asarray(duracoes)[:, None] - 1
+
+
+def r2_loo_simples(X, y):
+    """
+    R² leave-one-out e r de Pearson da regressão y ~ a + b·x para cada linha de X (m x n),
+    sem reajustes: h_ii = 1/n + (x_i - x̄)² / Sxx e resíduo LOO = e_i / (1 - h_ii).
+    Linhas sem variância ou com alavancagem ~1 dão NaN.
+    """
+    X, y = np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+    n = X.shape[1]
+    xc = X - X.mean(axis=1, keepdims=True)
+    yc = y - y.mean()
+    sxx = (xc ** 2).sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        b = (xc @ yc)[:, None] / sxx
+        residuo = yc[None, :] - b * xc
+        h = 1 / n + xc ** 2 / sxx
+        press = ((residuo / (1 - h)) ** 2).sum(axis=1)
+        r2 = 1 - press / (yc ** 2).sum()
+        r = (xc @ yc) / np.sqrt(sxx[:, 0] * (yc ** 2).sum())
+    r2[(h >= LIMITE_ALAVANCAGEM).any(axis=1)] = np.nan
+    return r2, r
+
+
+def avaliar_janelas(indices, anos, produtividade, deslocamentos, duracoes, mes_ancora=MES_ANCORA):
+    """
+    Avalia todas as janelas da grade para cada série e estatística. Retorna DataFrame com
+    Serie, Estatistica, Deslocamento_dias, Duracao_dias, Inicio/Fim (dia/mês), R2_LOO, r,
+    ordenado do melhor R² LOO para o pior. Janelas sem observação em algum ano ficam de fora.
+    """
+    inicios, fins = janelas_por_ano(anos, deslocamentos, duracoes, mes_ancora)
+    datas_inicio = pd.to_datetime(inicios[:, 0], unit='D')
+    datas_fim = pd.to_datetime(fins[:, 0], unit='D')
+    partes = []
+    for serie, indice in indices.items():
+        consulta = consultar(indice, inicios, fins)
+        for estatistica in ESTATISTICAS:
+            X = consulta[estatistica]
+            completas = np.isfinite(X).all(axis=1)
+            r2, r = r2_loo_simples(X[completas], produtividade)
+            partes.append(pd.DataFrame({
+                'Serie': serie,
+                'Estatistica': estatistica,
+                'Deslocamento_dias': deslocamentos[completas],
+                'Duracao_dias': duracoes[completas],
+                'Inicio': datas_inicio[completas].strftime('%d/%m'),
+                'Fim': datas_fim[completas].strftime('%d/%m'),
+                'R2_LOO': r2,
+                'r': r,
+            }))
+    ranking = pd.concat(partes, ignore_index=True)
+    return ranking.sort_values('R2_LOO', ascending=False, na_position='last').reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Janela fenológica de NDVI/EVI que melhor prevê a produtividade.')
+    parser.add_argument('--entrada', default='../dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx')
+    parser.add_argument('--produtividade', default='../dados_processados/Produtividade_Milho_-_Sidrolandia.csv')
+    parser.add_argument('--passo', type=int, default=PASSO_DIAS, help='passo da grade de janelas (dias)')
+    parser.add_argument('--duracao-maxima', type=int, default=DURACAO_MAXIMA)
+    args = parser.parse_args()
+
+    indices = construir_indices(ler_excel_cache(args.entrada))
+    prod = pd.read_csv(args.produtividade).dropna(subset=['Produtividade (ton/ha)'])
+    anos = prod['Ano'].to_numpy()
+    deslocamentos, duracoes = grade_janelas(duracao_maxima=args.duracao_maxima, passo=args.passo)
+    ranking = avaliar_janelas(indices, anos, prod['Produtividade (ton/ha)'].to_numpy(), deslocamentos, duracoes)
+    print(f'{len(deslocamentos)} janelas x {len(indices)} séries x {len(ESTATISTICAS)} estatísticas; '
+          f'{len(anos)} anos de produtividade.')
+
+    melhores = ranking.dropna(subset=['R2_LOO']).groupby(['Serie', 'Estatistica'], sort=False).head(1)
+    melhores.to_csv('../dados_processados/janelas_ndvi_melhores.csv', index=False)
+    ranking.head(100).to_csv('../dados_processados/janelas_ndvi_ranking.csv', index=False)
+
+    # Valores da melhor janela em cada ano, ao lado da produtividade
+    melhor = melhores.iloc[0]
+    inicios, fins = janelas_por_ano(anos, [melhor['Deslocamento_dias']], [melhor['Duracao_dias']])
+    valores = consultar(indices[melhor['Serie']], inicios, fins)
+    por_ano = prod[['Ano', 'Produtividade (ton/ha)']].assign(**{
+        f"{melhor['Serie']}_{estatistica}": valores[estatistica][0] for estatistica in ESTATISTICAS})
+    por_ano.to_csv('../dados_processados/janelas_ndvi_melhor_por_ano.csv', index=False)
+
+    print(melhores.to_string(index=False))
+    print(f"\nMelhor janela: {melhor['Serie']} ({melhor['Estatistica']}) de {melhor['Inicio']} a {melhor['Fim']} "
+          f"(R² LOO = {melhor['R2_LOO']:.3f}). Resultados em dados_processados/janelas_ndvi_*.csv")
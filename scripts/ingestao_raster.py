@@ -0,0 +1,149 @@
+"""
+Ingestão de imagens próprias (bandas vermelho/infravermelho próximo) para cálculo de NDVI/EVI.
+- Cada banda é um arquivo local .npy ou binário bruto (.raw/.bin), acessado por np.memmap
+- Os índices são calculados em blocos de tamanho fixo: cada bloco é mapeado, processado e
+  desmapeado em seguida, então o pico de memória não depende do tamanho da cena
+- Para cada data é salva a média do NDVI (e do EVI, se houver banda azul) dos pixels válidos,
+  no formato lido por analise_ndvi_mensal.py (colunas Data dd/mm/aaaa, NDVI, EVI)
+
+Organização esperada da pasta de entrada (uma cena por data):
+    2023-01-15_red.npy   2023-01-15_nir.npy   [2023-01-15_blue.npy]
+Arquivos brutos precisam de um arquivo ao lado com o formato, ex. 2023-01-15_red.raw.json:
+    {"dtype": "uint16", "shape": [10980, 10980]}
+Opcionalmente, o .json também informa "escala" (fator para refletância, ex. 0.0001) e "nodata".
+
+Uso (a partir de scripts/):
+    python ingestao_raster.py ../dados_brutos/cenas --saida ../dados_processados/ndvi_cenas.csv
+    python analise_ndvi_mensal.py --entrada ../dados_processados/ndvi_cenas.csv
+"""
+import argparse
+import glob
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+PIXELS_POR_BLOCO = 4_000_000
+PADRAO_BANDA = re.compile(r'^(\d{4}-\d{2}-\d{2})_(red|nir|blue)\.(npy|raw|bin)$')
+
+# Coeficientes do EVI (MODIS): G * (NIR - R) / (NIR + C1*R - C2*B + L)
+EVI_G, EVI_C1, EVI_C2, EVI_L = 2.5, 6.0, 7.5, 1.0
+
+
+def descrever_banda(caminho):
+    """
+    Retorna {'caminho', 'dtype', 'tamanho', 'offset', 'escala', 'nodata'} sem ler os dados.
+    Para .npy, o formato vem do cabeçalho; para binário bruto, do arquivo <banda>.json.
+    """
+    sidecar = {}
+    if os.path.exists(caminho + '.json'):
+        with open(caminho + '.json', encoding='utf-8') as f:
+            sidecar = json.load(f)
+    if caminho.endswith('.npy'):
+        with open(caminho, 'rb') as f:
+            versao = np.lib.format.read_magic(f)
+            ler_cabecalho = (np.lib.format.read_array_header_1_0 if versao == (1, 0)
+                             else np.lib.format.read_array_header_2_0)
+            shape, fortran, dtype = ler_cabecalho(f)
+            offset = f.tell()
+        if fortran and len(shape) > 1:
+            raise ValueError(f'Banda em ordem Fortran não suportada: {caminho}')
+    else:
+        if 'dtype' not in sidecar or 'shape' not in sidecar:
+            raise ValueError(f'Banda bruta sem formato ({caminho}.json com "dtype" e "shape")')
+        shape, dtype, offset = tuple(sidecar['shape']), np.dtype(sidecar['dtype']), sidecar.get('offset', 0)
+    return {
+        'caminho': caminho,
+        'dtype': np.dtype(dtype),
+        'tamanho': int(np.prod(shape)),
+        'offset': offset,
+        'escala': sidecar.get('escala', 1.0),
+        'nodata': sidecar.get('nodata'),
+    }
+
+
+def _ler_bloco(banda, inicio, n):
+    """Mapeia apenas [inicio, inicio+n) da banda e devolve uma cópia em float32 (refletância)."""
+    mapa = np.memmap(banda['caminho'], dtype=banda['dtype'], mode='r',
+                     offset=banda['offset'] + inicio * banda['dtype'].itemsize, shape=(n,))
+    valores = np.asarray(mapa, dtype=np.float32)
+    del mapa  # desmapeia: as páginas lidas não se acumulam na memória do processo
+    valido = np.isfinite(valores)
+    if banda['nodata'] is not None:
+        valido &= valores != banda['nodata']
+    return valores * np.float32(banda['escala']), valido
+
+
+def medias_indices(red, nir, blue=None, pixels_por_bloco=PIXELS_POR_BLOCO):
+    """
+    Média de NDVI (e EVI, se `blue` for informada) sobre os pixels válidos de uma cena.
+    Recebe descrições de bandas (descrever_banda). Retorna {'NDVI', 'EVI', 'Pixels_validos'}.
+    """
+    bandas = [b for b in (red, nir, blue) if b is not None]
+    if len({b['tamanho'] for b in bandas}) != 1:
+        raise ValueError('As bandas da cena têm tamanhos diferentes.')
+    soma_ndvi = soma_evi = 0.0
+    n_ndvi = n_evi = 0
+    for inicio in range(0, red['tamanho'], pixels_por_bloco):
+        n = min(pixels_por_bloco, red['tamanho'] - inicio)
+        r, valido_r = _ler_bloco(red, inicio, n)
+        v, valido_v = _ler_bloco(nir, inicio, n)
+        denominador = v + r
+        valido = valido_r & valido_v & (denominador != 0)
+        soma_ndvi += float(np.sum((v[valido] - r[valido]) / denominador[valido], dtype=np.float64))
+        n_ndvi += int(valido.sum())
+        if blue is not None:
+            b, valido_b = _ler_bloco(blue, inicio, n)
+            denominador = v + EVI_C1 * r - EVI_C2 * b + EVI_L
+            valido &= valido_b & (denominador != 0)
+            evi = EVI_G * (v[valido] - r[valido]) / denominador[valido]
+            soma_evi += float(np.sum(evi, dtype=np.float64))
+            n_evi += int(valido.sum())
+    return {
+        'NDVI': soma_ndvi / n_ndvi if n_ndvi else np.nan,
+        'EVI': soma_evi / n_evi if n_evi else np.nan,
+        'Pixels_validos': n_ndvi,
+    }
+
+
+def localizar_cenas(pasta):
+    """Agrupa os arquivos da pasta por data: {data: {'red': caminho, 'nir': caminho, 'blue': ...}}."""
+    cenas = {}
+    for caminho in sorted(glob.glob(os.path.join(pasta, '*'))):
+        encontrado = PADRAO_BANDA.match(os.path.basename(caminho))
+        if encontrado:
+            data, banda, _ = encontrado.groups()
+            cenas.setdefault(data, {})[banda] = caminho
+    return cenas
+
+
+def ingerir_pasta(pasta, pixels_por_bloco=PIXELS_POR_BLOCO):
+    """NDVI/EVI médio de todas as cenas da pasta, uma linha por data (cenas sem red/nir são ignoradas)."""
+    linhas = []
+    for data, arquivos in localizar_cenas(pasta).items():
+        if 'red' not in arquivos or 'nir' not in arquivos:
+            print(f'Cena {data} ignorada: faltam as bandas red/nir.')
+            continue
+        medias = medias_indices(
+            descrever_banda(arquivos['red']),
+            descrever_banda(arquivos['nir']),
+            descrever_banda(arquivos['blue']) if 'blue' in arquivos else None,
+            pixels_por_bloco,
+        )
+        linhas.append({'Data': pd.Timestamp(data).strftime('%d/%m/%Y'), **medias})
+    return pd.DataFrame(linhas, columns=['Data', 'NDVI', 'EVI', 'Pixels_validos'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='NDVI/EVI médio por data a partir de bandas .npy/.raw.')
+    parser.add_argument('pasta', help='pasta com as bandas (AAAA-MM-DD_red.npy, AAAA-MM-DD_nir.npy...)')
+    parser.add_argument('--saida', default='../dados_processados/ndvi_cenas.csv')
+    parser.add_argument('--bloco', type=int, default=PIXELS_POR_BLOCO, help='pixels por bloco')
+    args = parser.parse_args()
+
+    tabela = ingerir_pasta(args.pasta, args.bloco)
+    tabela.to_csv(args.saida, index=False)
+    print(tabela.to_string(index=False))
+    print(f'\n{len(tabela)} cenas processadas. NDVI médio por data salvo em {args.saida}')
@@ -0,0 +1,117 @@
+"""
+Leitor da série histórica de grãos da CONAB (dados_brutos/CONAB/CONAB-SerieHistoricaGraos.txt).
+- Lê o arquivo em blocos (chunks), sem carregar o texto inteiro na memória
+- Remove o preenchimento com espaços dos campos de largura fixa
+- Converte 'ano_agricola' ("1976/77" ou "2024") em ano_inicio/ano_fim inteiros
+- Guarda uf, produto e dsc_safra_previsao como categóricos e os valores numéricos em float32
+- Monta um índice (uf, produto, ano) para consultar séries estaduais sem reler o arquivo
+
+O nível 'ano' do índice é o ano de colheita (ano_fim), comparável ao 'Ano' do IBGE/SIDRA.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from cache_dados import carregar_com_cache
+
+ARQUIVO_CONAB = '../dados_brutos/CONAB/CONAB-SerieHistoricaGraos.txt'
+TAMANHO_BLOCO = 5000
+
+COLUNAS_CATEGORICAS = ['dsc_safra_previsao', 'uf', 'produto']
+COLUNAS_NUMERICAS = ['area_plantada_mil_ha', 'producao_mil_t', 'produtividade_mil_ha_mil_t']
+CHAVE_REGISTRO = ['ano_inicio', 'dsc_safra_previsao', 'uf', 'produto']
+
+
+def _anos_agricolas(texto):
+    """'1976/77' -> (1976, 1977); '1999/00' -> (1999, 2000); '2024' -> (2024, 2024)."""
+    partes = texto.str.split('/', n=1, expand=True)
+    inicio = partes[0].astype(np.int16)
+    if partes.shape[1] == 1:
+        return inicio, inicio.copy()
+    sufixo = pd.to_numeric(partes[1], errors='coerce')
+    # O sufixo tem dois dígitos: o ano final é o primeiro ano > início que termina nesses dígitos
+    fim = inicio - inicio % 100 + sufixo
+    fim = fim.where(fim > inicio, fim + 100).where(sufixo.notna(), inicio)
+    return inicio, fim.astype(np.int16)
+
+
+def _converter_bloco(bloco):
+    """Limpa e tipa um bloco de linhas brutas (todas as colunas lidas como texto)."""
+    bloco = bloco.apply(lambda col: col.str.strip())
+    saida = pd.DataFrame(index=bloco.index)
+    saida['ano_inicio'], saida['ano_fim'] = _anos_agricolas(bloco['ano_agricola'])
+    for col in COLUNAS_CATEGORICAS:
+        saida[col] = bloco[col].astype('category')
+    saida['id_produto'] = pd.to_numeric(bloco['id_produto'], errors='coerce').astype('Int32')
+    for col in COLUNAS_NUMERICAS:
+        saida[col] = pd.to_numeric(bloco[col], errors='coerce').astype(np.float32)
+    return saida
+
+
+def _concatenar(blocos):
+    """Concatena blocos unificando as categorias, sem voltar para texto (object)."""
+    resultado = {}
+    for col in blocos[0].columns:
+        partes = [b[col].reset_index(drop=True) for b in blocos]
+        if isinstance(partes[0].dtype, pd.CategoricalDtype):
+            resultado[col] = union_categoricals(partes, ignore_order=True)
+        else:
+            resultado[col] = pd.concat(partes, ignore_index=True)
+    return pd.DataFrame(resultado)
+
+
+def ler_conab_blocos(arquivo=ARQUIVO_CONAB, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera os blocos já tipados do arquivo, um de cada vez (leitura em streaming)."""
+    leitor = pd.read_csv(arquivo, sep=';', dtype=str, encoding='utf-8', chunksize=tamanho_bloco)
+    for bloco in leitor:
+        bloco.columns = [c.strip() for c in bloco.columns]
+        yield _converter_bloco(bloco)
+
+
+def _ler_conab_sem_cache(arquivo, tamanho_bloco=TAMANHO_BLOCO):
+    return _concatenar(list(ler_conab_blocos(arquivo, tamanho_bloco)))
+
+
+def ler_conab(arquivos=ARQUIVO_CONAB, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê uma ou mais versões da série histórica da CONAB e retorna um DataFrame tipado
+    indexado por (uf, produto, ano). Cada arquivo passa pelo cache Parquet de cache_dados.py.
+    Com vários arquivos (novas divulgações, do mais antigo para o mais novo), os registros
+    do arquivo mais novo substituem os anteriores com a mesma (safra, uf, produto, ano agrícola).
+    """
+    if isinstance(arquivos, str):
+        arquivos = [arquivos]
+    tabelas = [
+        carregar_com_cache(arq, _ler_conab_sem_cache, aba='conab', tamanho_bloco=tamanho_bloco)
+        for arq in arquivos
+    ]
+    # Uma divulgação mais nova substitui os registros das anteriores com a mesma chave
+    for i in range(len(tabelas) - 1):
+        chaves_novas = pd.MultiIndex.from_frame(pd.concat(tabelas[i + 1:])[CHAVE_REGISTRO].astype(str))
+        chaves = pd.MultiIndex.from_frame(tabelas[i][CHAVE_REGISTRO].astype(str))
+        tabelas[i] = tabelas[i][~chaves.isin(chaves_novas)]
+    tabela = _concatenar(tabelas) if len(tabelas) > 1 else tabelas[0]
+    tabela = tabela.set_index(['uf', 'produto', tabela['ano_fim'].rename('ano')])
+    return tabela.sort_index()
+
+
+def serie_estado(tabela, uf, produto, safra=None, somar_safras=True):
+    """
+    Série anual de um estado/produto. Com somar_safras=True, área e produção das
+    diferentes safras (1ª, 2ª, 3ª) são somadas por ano e a produtividade recalculada.
+    """
+    serie = tabela.loc[(uf, produto)]
+    if safra is not None:
+        return serie[serie['dsc_safra_previsao'] == safra]
+    if not somar_safras:
+        return serie
+    total = serie.groupby(level='ano')[['area_plantada_mil_ha', 'producao_mil_t']].sum()
+    # produção (mil t) / área (mil ha) = t/ha
+    total['produtividade_t_ha'] = total['producao_mil_t'] / total['area_plantada_mil_ha'].replace(0, np.nan)
+    return total
+
+
+if __name__ == '__main__':
+    conab = ler_conab()
+    print(conab.info(memory_usage='deep'))
+    print('\nMilho em MS (soma das safras):')
+    print(serie_estado(conab, 'MS', 'MILHO').tail(10))
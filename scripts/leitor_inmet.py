@@ -0,0 +1,286 @@
+"""
+Leitor dos CSV nativos das estações automáticas do INMET (BDMEP: um arquivo por estação e ano).
+- Cabeçalho de 8 linhas ('REGIAO:;CO', 'ESTACAO:;...', 'LATITUDE:;-20,45'...) lido à parte
+- Dados em latin-1, separados por ';', com vírgula decimal e -9999 para leitura ausente
+- As colunas de interesse são descobertas por palavra-chave (get_col_by_keyword), como em
+  analise_inmet.py, tanto no layout atual ('Data', 'Hora UTC') quanto no antigo ('DATA (YYYY-MM-DD)')
+- O arquivo é lido em blocos; cada bloco vira somas, contagens, mínimos e máximos por dia e é
+  combinado com o acumulado. Nenhuma tabela horária completa é montada: a memória depende do
+  tamanho do bloco e do número de dias, não do número de horas
+- Horas de estresse térmico (temperatura > LIMIAR_CALOR_C) são contadas na leitura horária e
+  acumuladas como as demais variáveis (coluna Horas_calor)
+- Mês e ano saem do acumulado diário (somas e contagens se somam; mínimos e máximos se combinam),
+  então a média mensal é a média das leituras horárias, igual ao groupby original
+
+As datas são as do arquivo (UTC), como na planilha combinada usada antes.
+
+Uso:
+    from leitor_inmet import localizar_arquivos, agregar_estacoes
+    resultado = agregar_estacoes(localizar_arquivos('../dados_brutos/INMET'))
+    resultado['anual'], resultado['mensal'], resultado['diario'], resultado['estacoes']
+"""
+import glob
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_BLOCO = 50_000
+ENCODING = 'latin-1'
+VALORES_AUSENTES = ['-9999', '-9999,0', '-9999.0']
+
+# Variável padronizada -> palavras-chave procuradas no nome da coluna original
+VARIAVEIS = {
+    'Precipitacao': ['precip'],
+    'Temperatura': ['bulbo seco', 'temperatura do ar'],
+    'Temperatura_maxima': ['temperatura máxima', 'temperatura maxima'],
+    'Temperatura_minima': ['temperatura mínima', 'temperatura minima'],
+    'Umidade': ['umidade relativa'],
+}
+
+# Coluna de saída -> alternativas (variável, estatística), usadas na ordem em que existirem
+SAIDAS = {
+    'Precipitacao_total_mm': [('Precipitacao', 'soma')],
+    'Temp_media_C': [('Temperatura', 'media')],
+    'Temp_min_C': [('Temperatura_minima', 'min'), ('Temperatura', 'min')],
+    'Temp_max_C': [('Temperatura_maxima', 'max'), ('Temperatura', 'max')],
+    'Umidade_media': [('Umidade', 'media')],
+    'Horas_calor': [('Calor', 'soma')],
+    'Horas_validas': [('Temperatura', 'n')],
+}
+
+# Hora de estresse térmico para o milho: temperatura do ar acima deste valor
+LIMIAR_CALOR_C = 32.0
+
+# Metadados do cabeçalho do BDMEP -> nome usado na tabela de estações
+METADADOS = {
+    'REGIAO': 'Regiao',
+    'UF': 'UF',
+    'ESTACAO': 'Nome',
+    'CODIGO (WMO)': 'Estacao',
+    'LATITUDE': 'Latitude',
+    'LONGITUDE': 'Longitude',
+    'ALTITUDE': 'Altitude',
+}
+
+
+def get_col_by_keyword(df, keywords):
+    """Primeira coluna cujo nome contém alguma das palavras-chave (sem diferenciar maiúsculas)."""
+    for col in getattr(df, 'columns', df):
+        for kw in keywords:
+            if kw.lower() in col.lower():
+                return col
+    return None
+
+
+def mapear_colunas(colunas, variaveis=VARIAVEIS):
+    """{variável padronizada: coluna original} para as variáveis encontradas."""
+    mapa = {nome: get_col_by_keyword(colunas, palavras) for nome, palavras in variaveis.items()}
+    return {nome: col for nome, col in mapa.items() if col is not None}
+
+
+def _numero(texto):
+    try:
+        return float(texto.replace(',', '.'))
+    except ValueError:
+        return texto
+
+
+def ler_cabecalho(caminho, encoding=ENCODING):
+    """
+    Lê só o início do arquivo. Retorna (metadados, linhas_antes_dos_dados, colunas):
+    os metadados vêm das linhas 'CHAVE:;valor' e as colunas da linha que começa com 'Data'.
+    """
+    metadados = {}
+    with open(caminho, encoding=encoding) as f:
+        for numero, linha in enumerate(f):
+            campos = linha.rstrip('\r\n').split(';')
+            if campos[0].strip().lower().startswith('data') and len(campos) > 2:
+                colunas = [c.strip() for c in campos if c.strip()]
+                return metadados, numero, colunas
+            chave = campos[0].strip().rstrip(':')
+            if chave in METADADOS and len(campos) > 1:
+                metadados[METADADOS[chave]] = _numero(campos[1].strip())
+    raise ValueError(f'Linha de cabeçalho com a coluna Data não encontrada em {caminho}')
+
+
+def _datas(coluna):
+    """Datas do bloco (dia). Texto é convertido apenas nos valores únicos (poucos por bloco)."""
+    if pd.api.types.is_datetime64_any_dtype(coluna):
+        return coluna.dt.normalize()
+    unicas = pd.unique(coluna)
+    convertidas = pd.to_datetime(pd.Series(unicas).str.replace('/', '-'), format='%Y-%m-%d', errors='coerce')
+    if convertidas.isna().all():
+        convertidas = pd.to_datetime(pd.Series(unicas), dayfirst=True, errors='coerce')
+    return pd.Series(convertidas.values, index=unicas).reindex(coluna.values).set_axis(coluna.index)
+
+
+def parcial(valores, chaves):
+    """Somas, contagens, mínimos e máximos por chave; colunas (estatística, variável)."""
+    grupos = valores.groupby(chaves)
+    return pd.concat({'soma': grupos.sum(), 'n': grupos.count(), 'min': grupos.min(), 'max': grupos.max()}, axis=1)
+
+
+def combinar_parciais(parciais, niveis=0):
+    """Combina acumulados com as mesmas chaves (níveis do índice): soma/n somam, min/max se combinam."""
+    todos = pd.concat(parciais)
+    return pd.concat({
+        'soma': todos['soma'].groupby(level=niveis).sum(),
+        'n': todos['n'].groupby(level=niveis).sum(),
+        'min': todos['min'].groupby(level=niveis).min(),
+        'max': todos['max'].groupby(level=niveis).max(),
+    }, axis=1)
+
+
+def _derivadas(valores):
+    """Variáveis horárias derivadas, acumuladas como as demais (soma de 'Calor' = horas acima do limiar)."""
+    if 'Temperatura' in valores:
+        temp = valores['Temperatura']
+        valores['Calor'] = (temp > LIMIAR_CALOR_C).astype(float).where(temp.notna())
+    return valores
+
+
+def acumular_bloco(bloco, mapa, col_data):
+    """Acumulado diário (índice Data) de um bloco horário, para as colunas de `mapa`."""
+    valores = bloco[list(mapa.values())].apply(pd.to_numeric, errors='coerce')
+    valores.columns = list(mapa)
+    valores = _derivadas(valores)
+    datas = _datas(bloco[col_data])
+    return parcial(valores[datas.notna()], datas[datas.notna()].rename('Data'))
+
+
+def acumular_tabela(df, tamanho_bloco=TAMANHO_BLOCO):
+    """Acumulado diário de uma tabela horária já carregada (ex.: a planilha combinada)."""
+    mapa = mapear_colunas(df.columns)
+    col_data = get_col_by_keyword(df, ['data'])
+    acumulado = None
+    for inicio in range(0, len(df), tamanho_bloco):
+        novo = acumular_bloco(df.iloc[inicio:inicio + tamanho_bloco], mapa, col_data)
+        acumulado = novo if acumulado is None else combinar_parciais([acumulado, novo])
+    return acumulado
+
+
+def acumular_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO, inicio=0):
+    """
+    Lê um CSV nativo do INMET em blocos e devolve (metadados, acumulado diário).
+    Só as colunas de data e das variáveis encontradas são lidas. Com `inicio` (byte em que começa
+    uma linha de dados), lê apenas o que vem depois: as linhas anexadas a um arquivo já lido
+    (agregacao_incremental.py).
+    """
+    metadados, pular, colunas = ler_cabecalho(caminho)
+    mapa = mapear_colunas(colunas)
+    col_data = get_col_by_keyword(colunas, ['data'])
+    desejadas = {col_data, *mapa.values()}
+    if inicio:
+        # Sem a linha de títulos: as colunas são escolhidas pela posição no cabeçalho
+        posicoes = [i for i, c in enumerate(colunas) if c in desejadas]
+        opcoes = {'header': None, 'usecols': posicoes}
+    else:
+        opcoes = {'skiprows': pular, 'usecols': lambda c: c.strip() in desejadas}
+    acumulado = None
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        leitor = pd.read_csv(io.TextIOWrapper(arquivo, encoding=ENCODING), sep=';', decimal=',',
+                             na_values=VALORES_AUSENTES, chunksize=tamanho_bloco, **opcoes)
+        for bloco in leitor:
+            bloco.columns = [colunas[i] for i in posicoes] if inicio else [c.strip() for c in bloco.columns]
+            novo = acumular_bloco(bloco, mapa, col_data)
+            acumulado = novo if acumulado is None else combinar_parciais([acumulado, novo])
+    metadados.setdefault('Estacao', os.path.splitext(os.path.basename(caminho))[0])
+    return metadados, acumulado
+
+
+def finalizar(acumulado, saidas=SAIDAS):
+    """Converte o acumulado nas colunas de saída (médias = soma/n; vazio onde não houve leitura)."""
+    tabela = pd.DataFrame(index=acumulado.index)
+    disponiveis = set(acumulado['n'].columns)
+    for coluna, alternativas in saidas.items():
+        for variavel, estatistica in alternativas:
+            if variavel not in disponiveis:
+                continue
+            n = acumulado[('n', variavel)]
+            if estatistica == 'media':
+                valores = acumulado[('soma', variavel)] / n.where(n > 0)
+            elif estatistica == 'n':
+                valores = n
+            else:
+                valores = acumulado[(estatistica, variavel)].where(n > 0)
+            tabela[coluna] = valores
+            break
+    return tabela.reset_index()
+
+
+def reagrupar(diario, chaves):
+    """Reagrupa o acumulado diário (índice Estacao, Data) por outras chaves (ex.: Ano, Mes)."""
+    datas = diario.index.get_level_values('Data')
+    indice = [diario.index.get_level_values('Estacao')]
+    indice += [getattr(datas, atributo).rename(nome) for nome, atributo in chaves]
+    return combinar_parciais([diario.set_axis(pd.MultiIndex.from_arrays(indice), axis=0)],
+                             niveis=list(range(len(indice))))
+
+
+def resumir(acumulados, diario=True):
+    """
+    {estacao: acumulado diário} -> {'diario', 'mensal', 'anual'} finalizados, com a coluna Estacao.
+    Com diario=False, os acumulados podem ser mensais (ver _por_mes) e 'diario' não é gerado.
+    """
+    por_dia = pd.concat(acumulados, names=['Estacao', 'Data'])
+    mensal = reagrupar(por_dia, [('Ano', 'year'), ('Mes', 'month')])
+    anual = reagrupar(por_dia, [('Ano', 'year')])
+    mensal.index.names = ['Estacao', 'Ano', 'Mes']
+    anual.index.names = ['Estacao', 'Ano']
+    resultado = {'mensal': finalizar(mensal), 'anual': finalizar(anual)}
+    if diario:
+        resultado['diario'] = finalizar(por_dia)
+    return resultado
+
+
+def _por_mes(acumulado):
+    """Colapsa o acumulado diário no primeiro dia de cada mês (12 linhas por ano em vez de 365)."""
+    return combinar_parciais([acumulado.set_axis(acumulado.index.to_period('M').to_timestamp(), axis=0)])
+
+
+def _acumular_mensal(caminho, tamanho_bloco):
+    metadados, acumulado = acumular_arquivo(caminho, tamanho_bloco)
+    return metadados, None if acumulado is None else _por_mes(acumulado)
+
+
+def localizar_arquivos(pasta):
+    """CSV nativos da pasta (qualquer caixa na extensão), em ordem."""
+    return sorted({*glob.glob(os.path.join(pasta, '*.csv')), *glob.glob(os.path.join(pasta, '*.CSV'))})
+
+
+def agregar_estacoes(arquivos, tamanho_bloco=TAMANHO_BLOCO, workers=None, diario=True):
+    """
+    Lê os arquivos em paralelo (um por processo de cada vez) e junta os anos de cada estação
+    à medida que cada arquivo termina. Retorna {'diario', 'mensal', 'anual', 'estacoes'};
+    'estacoes' traz os metadados do cabeçalho. Com diario=False, cada arquivo já volta reduzido
+    a meses, e a memória não cresce com o número de dias (décadas de muitas estações).
+    """
+    if not arquivos:
+        raise FileNotFoundError('Nenhum CSV do INMET informado.')
+    workers = min(workers or os.cpu_count() or 1, len(arquivos))
+    ler = acumular_arquivo if diario else _acumular_mensal
+
+    acumulados, metadados = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for meta, acumulado in pool.map(ler, arquivos, [tamanho_bloco] * len(arquivos)):
+            if acumulado is None:
+                continue
+            estacao = meta['Estacao']
+            anterior = acumulados.get(estacao)
+            acumulados[estacao] = acumulado if anterior is None else combinar_parciais([anterior, acumulado])
+            registro = metadados.setdefault(estacao, {**meta, 'Arquivos': 0})
+            registro['Arquivos'] += 1
+    resultado = resumir(acumulados, diario)
+    resultado['estacoes'] = pd.DataFrame(list(metadados.values()))
+    return resultado
+
+
+def estacao_mais_proxima(estacoes, latitude, longitude):
+    """Código da estação mais próxima do ponto (distância em graus, suficiente para escolher)."""
+    distancia = np.hypot(estacoes['Latitude'].astype(float) - latitude,
+                         (estacoes['Longitude'].astype(float) - longitude) * np.cos(np.radians(latitude)))
+    return estacoes.loc[distancia.idxmin(), 'Estacao']
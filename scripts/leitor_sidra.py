@@ -0,0 +1,143 @@
+"""
+Leitor da Tabela 1612 do IBGE/SIDRA (Produção Agrícola Municipal).
+- Lê todas as abas de variáveis ('Área plantada', 'Área colhida', 'Quantidade produzida'...)
+  de uma vez só, usando o cache Parquet de cache_dados.py
+- Reorganiza o formato largo (Ano x Produto nas colunas) em uma tabela longa
+  indexada por (municipio, produto, ano, variavel)
+- Permite consultar qualquer município/cultura sem reler o arquivo
+
+Convenções do SIDRA: '-' = zero absoluto; '..', '...' e 'X' = dado indisponível/sigiloso (NaN).
+"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from cache_dados import ler_excel_cache
+
+ARQUIVO_SIDRA = '../dados_brutos/IBGE/SIDRA-IBGE-Producao-Municipal-Tabela-1612.xlsx'
+LINHA_ANO = 3
+LINHA_PRODUTO = 4
+PRIMEIRA_LINHA_DADOS = 5
+
+# Nome das variáveis (abas) nas colunas do CSV consolidado já usado pelo projeto
+COLUNAS_SAIDA = {
+    'Área plantada': 'Área Plantada (ha)',
+    'Área colhida': 'Área Colhida (ha)',
+    'Quantidade produzida': 'Produção (ton)',
+}
+
+
+def _valor_sidra(valor):
+    if isinstance(valor, str):
+        valor = valor.strip()
+        if valor == '-':
+            return 0.0
+        if valor in ('..', '...', 'X', ''):
+            return np.nan
+    return valor
+
+
+def _aba_para_longo(bruto, variavel):
+    """Converte uma aba no layout do SIDRA (cabeçalho em duas linhas) para formato longo."""
+    anos = pd.to_numeric(bruto.iloc[LINHA_ANO, 1:], errors='coerce').ffill()
+    produtos = bruto.iloc[LINHA_PRODUTO, 1:]
+    dados = bruto.iloc[PRIMEIRA_LINHA_DADOS:]
+    # O bloco de dados termina na linha de rodapé ('Fonte: IBGE ...')
+    fim = dados[0].astype(str).str.startswith('Fonte')
+    if fim.any():
+        dados = dados.loc[:fim.idxmax() - 1]
+    dados = dados.dropna(subset=[0])
+
+    valores = dados.iloc[:, 1:].map(_valor_sidra).apply(pd.to_numeric, errors='coerce')
+    valores.index = pd.Index(dados[0].str.strip().values, name='municipio')
+    valores.columns = pd.MultiIndex.from_arrays([produtos.values, anos.astype(int).values], names=['produto', 'ano'])
+    longo = valores.stack(['produto', 'ano'], future_stack=True).rename('valor').reset_index()
+    longo['variavel'] = variavel
+    return longo
+
+
+def ler_tabela_sidra(arquivo=ARQUIVO_SIDRA):
+    """
+    Lê todas as abas da Tabela 1612 em uma única passada e retorna uma Series
+    `valor` com MultiIndex (municipio, produto, ano, variavel), ordenado.
+    O nome do município segue o SIDRA, com UF: 'Sidrolândia (MS)'.
+    """
+    abas = ler_excel_cache(arquivo, sheet_name=None, header=None)
+    partes = [
+        _aba_para_longo(bruto, nome)
+        for nome, bruto in abas.items()
+        if nome != 'Notas'
+    ]
+    tabela = pd.concat(partes, ignore_index=True)
+    for col in ('municipio', 'produto', 'variavel'):
+        tabela[col] = tabela[col].astype('category')
+    return tabela.set_index(['municipio', 'produto', 'ano', 'variavel'])['valor'].sort_index()
+
+
+def resolver_municipio(tabela, nome):
+    """
+    Aceita o nome com ou sem UF ('Sidrolândia' ou 'Sidrolândia (MS)') e retorna o nome usado no índice.
+    Levanta KeyError se não houver correspondência única.
+    """
+    municipios = tabela.index.levels[0]
+    if nome in municipios:
+        return nome
+    candidatos = [m for m in municipios if m.split(' (')[0] == nome]
+    if len(candidatos) != 1:
+        raise KeyError(f'Município não encontrado (ou ambíguo) na tabela SIDRA: {nome!r} -> {candidatos}')
+    return candidatos[0]
+
+
+def nome_arquivo_municipio(municipio):
+    """'Sidrolândia (MS)' -> 'Sidrolandia_MS' (sem acentos, para nomes de arquivo)."""
+    ascii_ = unicodedata.normalize('NFKD', municipio).encode('ascii', 'ignore').decode('ascii')
+    return '_'.join(ascii_.replace('(', ' ').replace(')', ' ').split())
+
+
+def separar_uf(municipio):
+    """'Sidrolândia (MS)' -> ('Sidrolândia', 'MS')."""
+    nome, _, uf = municipio.rpartition(' (')
+    return (nome, uf.rstrip(')')) if nome else (municipio, '')
+
+
+def extrair_municipio(tabela, municipio, produto='Milho (em grão)'):
+    """
+    Monta o DataFrame consolidado (Ano, áreas, produção e produtividade) de um município/cultura,
+    no mesmo formato de Produtividade_Milho_-_Sidrolandia.csv.
+    """
+    municipio = resolver_municipio(tabela, municipio)
+    serie = tabela.loc[(municipio, produto)]
+    df = serie.unstack('variavel').rename(columns=COLUNAS_SAIDA)
+    df = df[[c for c in COLUNAS_SAIDA.values() if c in df.columns]].reset_index()
+    df = df.rename(columns={'ano': 'Ano'})
+    df.columns.name = None
+    df['Produtividade (ton/ha)'] = df['Produção (ton)'] / df['Área Plantada (ha)'].replace(0, np.nan)
+    return _contagens_inteiras(df)
+
+
+def _contagens_inteiras(df):
+    """Áreas e produção voltam a inteiros (Int64, aceita ausentes), como na planilha: 200000, não 200000.0."""
+    for col in COLUNAS_SAIDA.values():
+        if col in df.columns and (df[col].dropna() % 1 == 0).all():
+            df[col] = df[col].astype('Int64')
+    return df
+
+
+def extrair_todos(tabela, produto='Milho (em grão)', apenas_produtores=True):
+    """
+    Tabela consolidada de todos os municípios para uma cultura (coluna 'Municipio').
+    Com apenas_produtores=True, descarta municípios sem produção em nenhum ano.
+    A linha 'Brasil' (total nacional) é sempre descartada.
+    """
+    fatia = tabela.xs(produto, level='produto')
+    df = fatia.unstack('variavel').rename(columns=COLUNAS_SAIDA)
+    df = df[[c for c in COLUNAS_SAIDA.values() if c in df.columns]].reset_index()
+    df = df.rename(columns={'municipio': 'Municipio', 'ano': 'Ano'})
+    df.columns.name = None
+    df = df[df['Municipio'] != 'Brasil']
+    if apenas_produtores:
+        producao_total = df.groupby('Municipio', observed=True)['Produção (ton)'].transform('sum')
+        df = df[producao_total > 0]
+    df['Produtividade (ton/ha)'] = df['Produção (ton)'] / df['Área Plantada (ha)'].replace(0, np.nan)
+    df['Municipio'] = df['Municipio'].astype(str)
+    return df.reset_index(drop=True)
@@ -0,0 +1,126 @@
+"""
+Leave-One-Out analítico para modelos lineares (OLS e Ridge) e caminho de regularização.
+- OLS/Ridge: os resíduos LOO exatos saem de um único ajuste, pela diagonal da matriz
+  chapéu H: e_loo_i = e_i / (1 - h_ii)  (estatística PRESS). Sem n reajustes.
+- Ridge em vários alphas: uma única SVD da matriz centrada resolve todos os alphas
+  e todos os folds de uma vez.
+- Lasso: não tem forma fechada; os ajustes reaproveitam a solução anterior (warm start)
+  entre folds e ao longo da grade de alphas (do maior para o menor).
+
+O intercepto não é penalizado, como no Ridge/Lasso do scikit-learn (fit_intercept=True).
+"""
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import LeaveOneOut
+
+# Observações com alavancagem ~1 (h_ii -> 1) não têm resíduo LOO pela fórmula fechada
+LIMITE_ALAVANCAGEM = 1 - 1e-8
+
+
+def _como_arrays(X, y):
+    return np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+
+
+def loo_linear_analitico(X, y, alpha=0.0):
+    """
+    Previsões LOO exatas de OLS (alpha=0) ou Ridge(alpha) a partir de um único ajuste.
+    Retorna (y_pred_loo, h) — h é a diagonal da matriz chapéu.
+    Pontos de alavancagem ~1 (ex.: n <= p+1) são refeitos por ajuste explícito.
+    """
+    X, y = _como_arrays(X, y)
+    n, p = X.shape
+    Xa = np.hstack([np.ones((n, 1)), X])
+    penalidade = np.diag([0.0] + [alpha] * p)
+    A_inv = np.linalg.pinv(Xa.T @ Xa + penalidade)
+    coef = A_inv @ Xa.T @ y
+    h = np.einsum('ij,jk,ik->i', Xa, A_inv, Xa)
+    residuo = y - Xa @ coef
+
+    y_loo = np.empty(n)
+    estavel = h < LIMITE_ALAVANCAGEM
+    y_loo[estavel] = y[estavel] - residuo[estavel] / (1 - h[estavel])
+
+    if (~estavel).any():
+        modelo = LinearRegression() if alpha == 0 else Ridge(alpha=alpha)
+        for i in np.flatnonzero(~estavel):
+            treino = np.arange(n) != i
+            y_loo[i] = clone(modelo).fit(X[treino], y[treino]).predict(X[i:i + 1])[0]
+    return y_loo, h
+
+
+def caminho_ridge_loo(X, y, alphas):
+    """
+    Previsões LOO do Ridge para uma grade de alphas com uma única SVD.
+    Com X centrado (Xc), H(α) = 11ᵀ/n + U diag(s²/(s²+α)) Uᵀ, pois o intercepto é ortogonal a Xc.
+    Retorna matriz (n, len(alphas)) com as previsões LOO.
+    """
+    X, y = _como_arrays(X, y)
+    alphas = np.asarray(alphas, dtype=float)
+    n = len(y)
+    Xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    U, s, _ = np.linalg.svd(Xc, full_matrices=False)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fator = s[:, None] ** 2 / (s[:, None] ** 2 + alphas[None, :])    # (k, m)
+    fator = np.nan_to_num(fator)
+    Uty = U.T @ yc                                                        # (k,)
+    ajustado = y.mean() + U @ (fator * Uty[:, None])                      # (n, m)
+    h = 1.0 / n + (U ** 2) @ fator                                        # (n, m)
+    residuo = y[:, None] - ajustado
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_loo = y[:, None] - residuo / (1 - h)
+    y_loo[h >= LIMITE_ALAVANCAGEM] = np.nan
+    return y_loo
+
+
+def loo_lasso(X, y, alpha, max_iter=10000):
+    """
+    Previsões LOO do Lasso(alpha). Um único estimador com warm_start percorre os folds:
+    cada fold parte dos coeficientes do fold anterior (conjuntos de treino quase iguais).
+    """
+    X, y = _como_arrays(X, y)
+    modelo = Lasso(alpha=alpha, warm_start=True, max_iter=max_iter)
+    y_loo = np.empty(len(y))
+    for treino, teste in LeaveOneOut().split(X):
+        modelo.fit(X[treino], y[treino])
+        y_loo[teste] = modelo.predict(X[teste])
+    return y_loo
+
+
+def caminho_lasso_loo(X, y, alphas, max_iter=10000):
+    """
+    Previsões LOO do Lasso para uma grade de alphas. Em cada fold a grade é percorrida do
+    maior para o menor alpha com warm start; o primeiro alpha do fold parte da solução
+    do fold anterior. Retorna matriz (n, len(alphas)) na ordem de `alphas`.
+    """
+    X, y = _como_arrays(X, y)
+    alphas = np.asarray(alphas, dtype=float)
+    ordem = np.argsort(alphas)[::-1]
+    y_loo = np.empty((len(y), len(alphas)))
+    modelo = Lasso(alpha=alphas[ordem[0]], warm_start=True, max_iter=max_iter)
+    for treino, teste in LeaveOneOut().split(X):
+        inicio_fold = None
+        for j in ordem:
+            modelo.set_params(alpha=alphas[j]).fit(X[treino], y[treino])
+            if inicio_fold is None:
+                inicio_fold = modelo.coef_.copy()
+            y_loo[teste, j] = modelo.predict(X[teste])
+        # O próximo fold recomeça do maior alpha: parte da solução deste fold nesse alpha
+        modelo.coef_ = inicio_fold
+    return y_loo
+
+
+def r2_press(y, y_loo):
+    """R² de predição (Q²) = 1 - PRESS / soma dos quadrados totais. Aceita y_loo (n,) ou (n, m)."""
+    y = np.asarray(y, dtype=float)
+    y_loo = np.asarray(y_loo, dtype=float)
+    residuo = (y_loo.T - y).T
+    press = np.sum(residuo ** 2, axis=0)
+    return 1 - press / np.sum((y - y.mean()) ** 2)
+
+
+def rmse_loo(y, y_loo):
+    y = np.asarray(y, dtype=float)
+    residuo = (np.asarray(y_loo, dtype=float).T - y).T
+    return np.sqrt(np.mean(residuo ** 2, axis=0))
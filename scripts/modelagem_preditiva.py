@@ -4,13 +4,15 @@ Utiliza regressão linear/múltipla com variáveis NDVI, clima e produtividade.
 Salva resultados e coeficientes em dados_processados/ e resultados/.
 """
 
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import r2_score, mean_squared_error
 import numpy as np
-import os
+from registro_modelos import registrar_modelo
+from graficos import opcao_sem_graficos, desenhar_figuras
+
+args = opcao_sem_graficos(argparse.ArgumentParser(description='Regressão linear anual/mensal.')).parse_args()
 
 # --- Modelagem ANUAL ---
 # Carregar base integrada anual
@@ -28,6 +30,11 @@ r2 = r2_score(y, y_pred)
 mse = mean_squared_error(y, y_pred)
 rmse = np.sqrt(mse)
 
+# Registrar o modelo ajustado (permite prever cenários sem retreinar)
+registrar_modelo(model, 'linear_anual', X.columns, 'Produtividade (ton/ha)',
+                 metricas={'R2_treino': r2, 'RMSE_treino': rmse},
+                 descricao='Regressão linear múltipla: NDVI (Savitzky-Golay), precipitação e temperatura')
+
 # Salvar coeficientes
 coefs = pd.DataFrame({'Variavel': X.columns, 'Coeficiente': model.coef_})
 coefs.to_csv('../dados_processados/modelo_anual_coeficientes.csv', index=False)
@@ -36,17 +43,10 @@ coefs.to_csv('../dados_processados/modelo_anual_coeficientes.csv', index=False)
 with open('../dados_processados/modelo_anual_metricas.txt', 'w') as f:
     f.write(f'R²: {r2:.2f}\nRMSE: {rmse:.2f}\nIntercepto: {model.intercept_:.2f}\n')
 
-# Gráfico: Real vs Predito
-plt.figure(figsize=(8,6))
-plt.scatter(y, y_pred, color='blue', s=80)
-plt.plot([y.min(), y.max()], [y.min(), y.max()], 'r--')
-plt.xlabel('Produtividade Real (ton/ha)')
-plt.ylabel('Produtividade Predita (ton/ha)')
-plt.title('Modelo Anual: Produtividade Real vs Predita')
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('../resultados/modelo_anual_real_vs_predito.png')
-plt.close()
+# Salvar previsões (base do gráfico Real vs Predito)
+pd.DataFrame({'Ano': df['Ano'], 'Produtividade_Real': y, 'Produtividade_Predita': y_pred}).to_csv(
+    '../dados_processados/modelo_anual_previsoes.csv', index=False)
+figuras = ['modelo_anual_real_vs_predito']
 
 # --- Modelagem MENSAL (opcional, exemplo) ---
 df_mensal = pd.read_csv('../dados_processados/integrado_mensal.csv')
@@ -66,16 +66,14 @@ if y_m is not None:
     # Salvar métricas
     with open('../dados_processados/modelo_mensal_metricas.txt', 'w') as f:
         f.write(f'R²: {r2_m:.2f}\nRMSE: {rmse_m:.2f}\nIntercepto: {model_m.intercept_:.2f}\n')
-    # Gráfico
-    plt.figure(figsize=(8,6))
-    plt.scatter(y_m, y_pred_m, color='green', s=60)
-    plt.plot([y_m.min(), y_m.max()], [y_m.min(), y_m.max()], 'r--')
-    plt.xlabel('Produtividade Real (ton/ha)')
-    plt.ylabel('Produtividade Predita (ton/ha)')
-    plt.title('Modelo Mensal: Produtividade Real vs Predita')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig('../resultados/modelo_mensal_real_vs_predito.png')
-    plt.close()
+    # Salvar previsões (base do gráfico)
+    pd.DataFrame({'Ano': df_mensal['Ano'], 'Mes': df_mensal['Mes'], 'Produtividade_Real': y_m,
+                  'Produtividade_Predita': y_pred_m}).to_csv(
+        '../dados_processados/modelo_mensal_previsoes.csv', index=False)
+    figuras.append('modelo_mensal_real_vs_predito')
+
+# Gráficos: Real vs Predito
+if not args.sem_graficos:
+    desenhar_figuras(figuras)
 
 print('Modelos anuais e mensais executados. Resultados e coeficientes salvos em dados_processados/ e resultados/.')
@@ -2,13 +2,17 @@
 Random Forest para Previsão de Produtividade Agrícola
 Usando integrado_anual.csv
 """
+import argparse
+import sys
 import pandas as pd
-import numpy as np
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
-from sklearn.model_selection import LeaveOneOut
-import matplotlib.pyplot as plt
-import seaborn as sns
+from graficos import opcao_sem_graficos, desenhar_figuras
+from validacao_loo import avaliar_loo_em_cache
+from registro_modelos import registrar_modelo
+from validacao_oob import opcao_rapido, relatorio_rapido
+
+parser = argparse.ArgumentParser(description='Random Forest com áreas, NDVI e clima.')
+args = opcao_rapido(opcao_sem_graficos(parser)).parse_args()
 
 # 1. Importação dos dados
 df = pd.read_csv('../dados_processados/integrado_anual.csv')
@@ -18,51 +22,40 @@ X = df[['Área Plantada (ha)', 'Área Colhida (ha)', 'Savitzky-Golay',
         'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media']]
 y = df['Produtividade (ton/ha)']
 
-# 3. Treinamento e Validação Leave-One-Out
-loo = LeaveOneOut()
-y_true, y_pred = [], []
+modelo = RandomForestRegressor(n_estimators=100, random_state=42)
+
+# Modo rápido: estimativa OOB de uma única floresta; os arquivos de resultados continuam vindo do LOO
+if args.rapido:
+    relatorio_rapido(modelo, X, y)
+    sys.exit()
 
-for train_idx, test_idx in loo.split(X):
-    X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-    y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_train, y_train)
-    y_pred.append(model.predict(X_test)[0])
-    y_true.append(y_test.values[0])
+# 3. Treinamento e Validação Leave-One-Out (folds em paralelo + modelo final no mesmo lote)
+resultado_loo = avaliar_loo_em_cache(modelo, X, y, origem='../dados_processados/integrado_anual.csv')
+y_true = resultado_loo['previsoes']['y_real']
+y_pred = resultado_loo['previsoes']['y_pred']
 
 # 4. Avaliação do modelo
-r2 = r2_score(y_true, y_pred)
-mae = mean_absolute_error(y_true, y_pred)
-rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+r2 = resultado_loo['metricas']['R2']
+mae = resultado_loo['metricas']['MAE']
+rmse = resultado_loo['metricas']['RMSE']
 
 print(f'R²: {r2:.3f}')
 print(f'MAE: {mae:.3f}')
 print(f'RMSE: {rmse:.3f}')
 print('Execução concluída com sucesso.')
 
-# 5. Gráfico de comparação real vs predito
-plt.figure(figsize=(8,5))
-plt.plot(df['Ano'], y_true, label='Real', marker='o')
-plt.plot(df['Ano'], y_pred, label='Predito', marker='s')
-plt.xlabel('Ano')
-plt.ylabel('Produtividade (ton/ha)')
-plt.title('Produtividade Real vs Predita (Random Forest)')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('../resultados/produtividade_rf_real_vs_predito.png', dpi=200)
-plt.show()
+# 5. Previsões LOO (base do gráfico de comparação real vs predito)
+pd.DataFrame({'Ano': df['Ano'], 'Produtividade_Real': y_true, 'Produtividade_Predita': y_pred}).to_csv(
+    '../dados_processados/rf_completo_previsoes.csv', index=False)
 
 # 6. Importância das variáveis
-model_final = RandomForestRegressor(n_estimators=100, random_state=42)
-model_final.fit(X, y)
-importancias = model_final.feature_importances_
-features = X.columns
-
-plt.figure(figsize=(7,4))
-sns.barplot(x=importancias, y=features, palette='viridis')
-plt.title('Importância das Variáveis - Random Forest')
-plt.xlabel('Importância')
-plt.tight_layout()
-plt.savefig('../resultados/produtividade_rf_importancia_variaveis.png', dpi=200)
-plt.show()
+model_final = resultado_loo['modelo_final']
+registrar_modelo(model_final, 'rf_anual_completo', X.columns, 'Produtividade (ton/ha)',
+                 metricas=resultado_loo['metricas'],
+                 descricao='Random Forest com áreas + NDVI + clima - métricas de validação Leave-One-Out')
+pd.DataFrame({'Variavel': X.columns, 'Importancia': model_final.feature_importances_}).to_csv(
+    '../dados_processados/rf_completo_importancia.csv', index=False)
+
+# 7. Gráficos
+if not args.sem_graficos:
+    desenhar_figuras(['produtividade_rf_completo_real_vs_predito', 'produtividade_rf_importancia_variaveis'])
@@ -0,0 +1,169 @@
+"""
+Busca de hiperparâmetros dos quatro modelos de validacao_modelos.py (LinearRegression, Ridge, Lasso e
+Random Forest), com custo próximo ao da validação sem ajuste.
+- Os folds LOO são gerados uma única vez, em ordem embaralhada com semente fixa; todos os candidatos
+  são avaliados nos mesmos folds
+- Ridge e Lasso: a grade inteira de alphas sai dos caminhos LOO de loo_linear.py (uma SVD / warm start),
+  que já são exatos e custam menos que um corte; LinearRegression não tem hiperparâmetros
+- Random Forest: successive halving. Na 1ª rodada todos os candidatos rodam em poucos folds; a cada
+  rodada fica 1/ETA dos candidatos (menor erro nos folds já avaliados) e os folds crescem ETA vezes,
+  até o vencedor completar o LOO. Folds já avaliados não são refeitos
+- As tarefas (candidato x fold) rodam em um pool de processos (joblib), reaproveitado entre rodadas
+- n_estimators não multiplica os ajustes: com a mesma semente, a floresta de 50 árvores é formada pelas
+  50 primeiras da floresta de 100, então cada ajuste dá as previsões de todos os tamanhos de N_ARVORES
+
+Saídas (dados_processados/), no formato de validacao_modelos.py:
+- {anual,mensal}_otimizado_validacao_modelos.csv e _otimizado_explicacao.txt
+- {anual,mensal}_otimizacao_candidatos.csv: erro LOO de cada candidato e a rodada em que parou
+
+Uso (a partir de scripts/):
+    python otimizacao_hiperparametros.py
+    python otimizacao_hiperparametros.py mensal --eta 2 --workers 4
+"""
+import argparse
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import LeaveOneOut
+
+from loo_linear import caminho_lasso_loo, caminho_ridge_loo, loo_linear_analitico, rmse_loo
+from validacao_modelos import ALPHAS, CONJUNTOS, carregar_conjunto, linha_resultado, salvar_resultados
+
+ETA = 3
+SEMENTE = 42
+N_ARVORES = (25, 50, 100)
+GRADE_RF = {
+    'max_depth': [None, 4],
+    'min_samples_leaf': [1, 3],
+    'max_features': [1.0, 'sqrt'],
+}
+
+
+def folds_embaralhados(n, semente=SEMENTE):
+    """Folds LOO (treino, teste) em ordem aleatória fixa: qualquer prefixo é uma amostra dos dados."""
+    folds = list(LeaveOneOut().split(np.zeros((n, 1))))
+    return [folds[i] for i in np.random.default_rng(semente).permutation(n)]
+
+
+def candidatos_rf(grade=GRADE_RF):
+    return [dict(zip(grade, valores)) for valores in itertools.product(*grade.values())]
+
+
+def _prever_fold(parametros, X, y, treino, teste, n_arvores):
+    """Previsão do fold de teste para cada tamanho de floresta em `n_arvores` (um único ajuste)."""
+    modelo = RandomForestRegressor(n_estimators=max(n_arvores), random_state=SEMENTE, n_jobs=1, **parametros)
+    modelo.fit(X[treino], y[treino])
+    acumulada = np.cumsum([arvore.predict(X[teste])[0] for arvore in modelo.estimators_])
+    tamanhos = np.asarray(n_arvores)
+    return acumulada[tamanhos - 1] / tamanhos
+
+
+def divisao_sucessiva(candidatos, X, y, folds, n_arvores=N_ARVORES, eta=ETA, n_jobs=-1):
+    """
+    Successive halving do Random Forest sobre `folds`. Retorna (vencedor, n_estimators, y_loo, histórico);
+    `vencedor` é o índice em `candidatos` e y_loo vem na ordem das observações.
+    """
+    X, y = np.asarray(X, dtype=float), np.asarray(y, dtype=float)
+    y_folds = np.array([y[teste][0] for _, teste in folds])
+    rodadas = 1 + math.ceil(math.log(len(candidatos), eta)) if len(candidatos) > 1 else 1
+    folds_rodada = max(1, math.ceil(len(folds) / eta ** (rodadas - 1)))
+
+    previsoes = np.full((len(candidatos), len(folds), len(n_arvores)), np.nan)
+    vivos, feitos, historico = list(range(len(candidatos))), 0, []
+    with Parallel(n_jobs=n_jobs) as pool:
+        for rodada in range(1, rodadas + 1):
+            alvo = len(folds) if rodada == rodadas else min(len(folds), folds_rodada * eta ** (rodada - 1))
+            tarefas = [(c, f) for c in vivos for f in range(feitos, alvo)]
+            saidas = pool(delayed(_prever_fold)(candidatos[c], X, y, *folds[f], n_arvores) for c, f in tarefas)
+            for (c, f), previsao in zip(tarefas, saidas):
+                previsoes[c, f] = previsao
+            feitos = alvo
+
+            # Erro quadrático médio nos folds avaliados, para cada tamanho de floresta
+            erro = np.mean((previsoes[vivos, :feitos] - y_folds[:feitos, None]) ** 2, axis=1)
+            melhor_tamanho = erro.argmin(axis=1)
+            rmse = np.sqrt(erro.min(axis=1))
+            for c, tamanho, valor in zip(vivos, melhor_tamanho, rmse):
+                historico.append({'Modelo': 'RandomForest',
+                                  'Hiperparametros': {**candidatos[c], 'n_estimators': int(n_arvores[tamanho])},
+                                  'Rodada': rodada, 'Folds': feitos, 'RMSE_LOO': valor})
+            ordem = np.argsort(rmse, kind='stable')
+            vivos = [vivos[i] for i in ordem[:max(1, math.ceil(len(vivos) / eta))]]
+
+    vencedor = vivos[0]
+    tamanho = int(np.argmin(np.mean((previsoes[vencedor] - y_folds[:, None]) ** 2, axis=0)))
+    y_loo = np.empty(len(y))
+    y_loo[[teste[0] for _, teste in folds]] = previsoes[vencedor, :, tamanho]
+    return vencedor, int(n_arvores[tamanho]), y_loo, historico
+
+
+def buscar_lineares(X, y, alphas=ALPHAS):
+    """
+    OLS, Ridge e Lasso: previsões LOO exatas de toda a grade de alphas. Retorna
+    ({nome: (modelo, y_loo)}, histórico) com o alpha de menor RMSE LOO de cada família.
+    """
+    escolhidos = {'LinearRegression': (LinearRegression(), loo_linear_analitico(X, y)[0])}
+    historico = [{'Modelo': 'LinearRegression', 'Hiperparametros': {}, 'Rodada': 1, 'Folds': len(y),
+                  'RMSE_LOO': rmse_loo(y, escolhidos['LinearRegression'][1])}]
+    caminhos = {'Ridge': (Ridge, caminho_ridge_loo(X, y, alphas)), 'Lasso': (Lasso, caminho_lasso_loo(X, y, alphas))}
+    for nome, (classe, y_loo) in caminhos.items():
+        erros = rmse_loo(y, y_loo)
+        historico += [{'Modelo': nome, 'Hiperparametros': {'alpha': float(a)}, 'Rodada': 1, 'Folds': len(y),
+                       'RMSE_LOO': e} for a, e in zip(alphas, erros)]
+        j = int(np.nanargmin(erros))
+        alpha = float(alphas[j])
+        modelo = classe(alpha=alpha, max_iter=10000) if classe is Lasso else classe(alpha=alpha)
+        escolhidos[nome] = (modelo, y_loo[:, j])
+    return escolhidos, historico
+
+
+def otimizar(X, y, nome_saida, eta=ETA, n_jobs=-1, grade_rf=GRADE_RF, n_arvores=N_ARVORES):
+    """Busca, métricas no formato de validacao_modelos.py e histórico dos candidatos."""
+    folds = folds_embaralhados(len(y))
+    escolhidos, historico = buscar_lineares(X, y)
+
+    candidatos = candidatos_rf(grade_rf)
+    vencedor, arvores, y_loo, historico_rf = divisao_sucessiva(candidatos, X, y, folds, n_arvores, eta, n_jobs)
+    escolhidos['RandomForest'] = (RandomForestRegressor(n_estimators=arvores, random_state=SEMENTE,
+                                                        **candidatos[vencedor]), y_loo)
+    historico += historico_rf
+
+    df_result = pd.DataFrame([linha_resultado(nome, modelo.fit(X, y), X, y, y_loo)
+                              for nome, (modelo, y_loo) in escolhidos.items()])
+    hiperparametros = {nome: {k: v for k, v in modelo.get_params().items()
+                              if k in ('alpha', 'n_estimators', *grade_rf)}
+                       for nome, (modelo, _) in escolhidos.items()}
+    explicacao = (
+        'Validação leave-one-out com hiperparâmetros escolhidos pelo menor RMSE LOO:\n'
+        f'- Ridge e Lasso: grade de {len(ALPHAS)} alphas (caminhos LOO exatos).\n'
+        f'- RandomForest: successive halving (eta={eta}) sobre {len(candidatos)} configurações x '
+        f'{len(n_arvores)} tamanhos de floresta, nos mesmos folds.\n'
+        'O R2_LOO do modelo escolhido é otimista: a escolha usou os mesmos folds.\n'
+        'Hiperparâmetros:\n'
+        + ''.join(f'- {nome}: {parametros}\n' for nome, parametros in hiperparametros.items())
+    )
+    salvar_resultados(df_result, f'{nome_saida}_otimizado', explicacao)
+
+    historico = pd.DataFrame(historico)
+    historico['Hiperparametros'] = historico['Hiperparametros'].astype(str)
+    historico.to_csv(f'../dados_processados/{nome_saida}_otimizacao_candidatos.csv', index=False)
+    return df_result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hiperparâmetros dos modelos de validacao_modelos.py.')
+    parser.add_argument('conjuntos', nargs='*', help=f'padrão: {" ".join(CONJUNTOS)}')
+    parser.add_argument('--eta', type=int, default=ETA, help='fração de candidatos descartada por rodada (1 - 1/eta)')
+    parser.add_argument('--workers', type=int, default=-1, help='processos do pool (-1 = todos os núcleos)')
+    args = parser.parse_args()
+
+    for nome in args.conjuntos or CONJUNTOS:
+        X, y, _ = carregar_conjunto(nome)
+        print(f'--- {nome} ---')
+        print(otimizar(X, y, nome, eta=args.eta, n_jobs=args.workers).to_string(index=False))
+    print('Resultados salvos em dados_processados/*_otimizado_validacao_modelos.csv.')
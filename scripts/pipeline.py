@@ -0,0 +1,449 @@
+"""
+Executor incremental do pipeline de scripts (scripts/*.py).
+- Cada etapa declara suas entradas e saídas (dados_brutos/, dados_processados/, resultados/);
+  uma entrada pode ser uma pasta inteira (ex.: os CSV do INMET); 'opcionais' são entradas usadas
+  quando existem (entram no hash e na ordem das etapas, mas não impedem a execução)
+- As dependências entre etapas são deduzidas: B depende de A se B lê algo que A gera
+- O hash (SHA-256) das entradas e do próprio script é guardado após cada execução;
+  só são reexecutadas as etapas cujas entradas/script mudaram ou cujas saídas sumiram
+- Ramos independentes do grafo rodam em paralelo (pool de processos)
+
+Uso (a partir da pasta scripts/):
+    python pipeline.py              # executa apenas as etapas desatualizadas
+    python pipeline.py --simular    # mostra o que seria executado
+    python pipeline.py --forcar     # reexecuta tudo
+    python pipeline.py --workers 4  # até 4 etapas independentes em paralelo
+    python pipeline.py correlacao_geral.py validacao_modelos.py   # apenas essas etapas (se desatualizadas)
+    python pipeline.py --sem-graficos   # apenas os dados (figuras depois, com renderizar_figuras.py)
+    python pipeline.py --incremental    # INMET/NDVI mensais e tabelas integradas só com os dados novos
+
+As etapas rodam sem gráficos (SEM_GRAFICOS=1); ao final, as figuras desatualizadas de
+resultados/ são desenhadas em paralelo por renderizar_figuras.py.
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cache_dados import hash_arquivo, modulos_locais
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIR_SCRIPTS)
+ARQUIVO_ESTADO = os.path.join(RAIZ, '.cache', 'pipeline_estado.json')
+
+# Caminhos relativos à raiz do repositório
+ETAPAS = [
+    {
+        'script': 'extrair_milho_sidrolandia_ibge.py',
+        'entradas': ['dados_brutos/IBGE/SIDRA-IBGE-Producao-Municipal-Tabela-1612.xlsx'],
+        'saidas': ['dados_processados/Produtividade_Milho_-_Sidrolandia.csv'],
+    },
+    {
+        'script': 'analise_ndvi.py',
+        'entradas': ['dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx'],
+        'saidas': ['dados_processados/ndvi_medio_por_ano.csv'],
+    },
+    {
+        'script': 'analise_ndvi_mensal.py',
+        'entradas': ['dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx'],
+        'saidas': [
+            'dados_processados/ndvi_mensal.csv',
+        ],
+    },
+    {
+        'script': 'indice_janelas_ndvi.py',
+        'entradas': [
+            'dados_brutos/NDVI/satveg_NDVI_EVI_combinado.xlsx',
+            'dados_processados/Produtividade_Milho_-_Sidrolandia.csv',
+        ],
+        'saidas': [
+            'dados_processados/janelas_ndvi_melhores.csv',
+            'dados_processados/janelas_ndvi_ranking.csv',
+            'dados_processados/janelas_ndvi_melhor_por_ano.csv',
+        ],
+    },
+    {
+        'script': 'analise_inmet.py',
+        'entradas': ['dados_brutos/INMET'],  # CSV nativos do BDMEP ou a planilha combinada
+        'saidas': [
+            'dados_processados/inmet_clima_anual.csv',
+            'dados_processados/inmet_clima_mensal.csv',
+            'dados_processados/inmet_clima_diario.csv',
+        ],
+    },
+    {
+        'script': 'features_agroclimaticas.py',
+        'entradas': ['dados_processados/inmet_clima_diario.csv'],
+        'saidas': [
+            'dados_processados/features_agroclimaticas_mensal.csv',
+            'dados_processados/features_agroclimaticas_anual.csv',
+        ],
+    },
+    {
+        'script': 'integracao_ndvi_produtividade.py',
+        'entradas': [
+            'dados_processados/ndvi_medio_por_ano.csv',
+            'dados_processados/Produtividade_Milho_-_Sidrolandia.csv',
+        ],
+        'saidas': [
+            'dados_processados/dataset_integrado_ndvi_produtividade.csv',
+        ],
+    },
+    {
+        'script': 'correlacao_geral.py',
+        'entradas': [
+            'dados_processados/Produtividade_Milho_-_Sidrolandia.csv',
+            'dados_processados/ndvi_medio_por_ano.csv',
+            'dados_processados/inmet_clima_anual.csv',
+            'dados_processados/ndvi_mensal.csv',
+            'dados_processados/inmet_clima_mensal.csv',
+        ],
+        'opcionais': [
+            'dados_processados/features_agroclimaticas_anual.csv',
+            'dados_processados/features_agroclimaticas_mensal.csv',
+        ],
+        'saidas': [
+            'dados_processados/integrado_anual.csv',
+            'dados_processados/correlacao_anual.csv',
+            'dados_processados/integrado_mensal.csv',
+            'dados_processados/correlacao_mensal.csv',
+        ],
+    },
+    {
+        'script': 'modelagem_preditiva.py',
+        'entradas': ['dados_processados/integrado_anual.csv', 'dados_processados/integrado_mensal.csv'],
+        'saidas': [
+            'dados_processados/modelo_anual_coeficientes.csv',
+            'dados_processados/modelo_anual_metricas.txt',
+            'dados_processados/modelo_anual_previsoes.csv',
+        ],
+    },
+    {
+        'script': 'modelagem_produtividade_rf.py',
+        'entradas': ['dados_processados/integrado_anual.csv'],
+        'saidas': [
+            'dados_processados/rf_completo_previsoes.csv',
+            'dados_processados/rf_completo_importancia.csv',
+        ],
+    },
+    {
+        'script': 'validacao_modelos.py',
+        'entradas': ['dados_processados/integrado_anual.csv', 'dados_processados/integrado_mensal.csv'],
+        'saidas': [
+            'dados_processados/anual_validacao_modelos.csv',
+            'dados_processados/anual_explicacao.txt',
+            'dados_processados/mensal_validacao_modelos.csv',
+            'dados_processados/mensal_explicacao.txt',
+            'dados_processados/anual_caminho_regularizacao.csv',
+            'dados_processados/mensal_caminho_regularizacao.csv',
+        ],
+    },
+    {
+        'script': 'otimizacao_hiperparametros.py',
+        'entradas': ['dados_processados/integrado_anual.csv', 'dados_processados/integrado_mensal.csv'],
+        'saidas': [
+            'dados_processados/anual_otimizado_validacao_modelos.csv',
+            'dados_processados/anual_otimizado_explicacao.txt',
+            'dados_processados/anual_otimizacao_candidatos.csv',
+            'dados_processados/mensal_otimizado_validacao_modelos.csv',
+            'dados_processados/mensal_otimizado_explicacao.txt',
+            'dados_processados/mensal_otimizacao_candidatos.csv',
+        ],
+    },
+    {
+        'script': 'rf_visualizacoes.py',
+        'entradas': ['dados_processados/integrado_anual.csv'],
+        'saidas': [
+            'dados_processados/rf_resultados_detalhados.csv',
+            'dados_processados/rf_metricas.txt',
+            'dados_processados/rf_importancia.csv',
+            'dados_processados/rf_metricas_ic.csv',
+        ],
+    },
+    {
+        'script': 'validacao_oob.py',
+        'entradas': ['dados_processados/integrado_anual.csv'],
+        'saidas': ['dados_processados/rf_oob_curva.csv', 'dados_processados/rf_oob_vs_loo.csv'],
+    },
+    {
+        'script': 'analise_estatistica_completa.py',
+        'entradas': ['dados_processados/integrado_anual.csv', 'dados_processados/integrado_mensal.csv'],
+        'saidas': [
+            'dados_processados/correlacao_pearson_anual.csv',
+            'dados_processados/correlacao_pearson_pvalores_anual.csv',
+            'dados_processados/correlacao_pearson_mensal.csv',
+            'dados_processados/correlacao_spearman_anual.csv',
+            'dados_processados/correlacao_spearman_pvalores_anual.csv',
+            'dados_processados/regressao_linear_simples.txt',
+            'dados_processados/regressao_multipla.txt',
+            'dados_processados/lag_analysis.txt',
+            'dados_processados/correlacao_defasada_mensal.csv',
+            'dados_processados/correlacao_ic_anual.csv',
+            'dados_processados/correlacao_ic_mensal.csv',
+            'dados_processados/regressao_ic.csv',
+        ],
+    },
+    {
+        'script': 'pipeline_municipios.py',
+        'entradas': [
+            'dados_brutos/IBGE/SIDRA-IBGE-Producao-Municipal-Tabela-1612.xlsx',
+            'dados_processados/ndvi_medio_por_ano.csv',
+            'dados_processados/inmet_clima_anual.csv',
+        ],
+        'saidas': ['dados_processados/municipios/_manifesto.json'],
+    },
+    {
+        'script': 'segmentacao_espacial_kmeans.py',
+        'entradas': ['resultados/satveg-sta-querencia.png'],
+        'saidas': [
+            'dados_processados/satveg_segmentado_kmeans_contagem.csv',
+            'dados_processados/satveg_segmentado_kmeans_rotulos.npy',
+        ],
+    },
+    {
+        'script': 'segmentacao_ndvi_temporal.py',
+        'entradas': ['satveg_grafico.png'],
+        'saidas': ['dados_processados/satveg_grafico_curva.csv', 'dados_processados/satveg_grafico_resumo.csv'],
+    },
+]
+
+
+def _caminho(relativo):
+    return os.path.join(RAIZ, relativo)
+
+
+def _entradas(etapa):
+    return etapa['entradas'] + etapa.get('opcionais', [])
+
+
+def validar_etapas(etapas):
+    """Garante que cada saída é produzida por uma única etapa."""
+    produtor = {}
+    for etapa in etapas:
+        for saida in etapa['saidas']:
+            if saida in produtor:
+                raise ValueError(f"Saída {saida} declarada por {produtor[saida]} e {etapa['script']}")
+            produtor[saida] = etapa['script']
+    return produtor
+
+
+def ordenar_etapas(etapas):
+    """Ordenação topológica (Kahn) das etapas pelo grafo entradas -> saídas."""
+    produtor = validar_etapas(etapas)
+    por_script = {e['script']: e for e in etapas}
+    dependencias = {
+        e['script']: {produtor[ent] for ent in _entradas(e) if ent in produtor} - {e['script']}
+        for e in etapas
+    }
+    pendentes = {script: set(deps) for script, deps in dependencias.items()}
+    ordem = []
+    prontas = [e['script'] for e in etapas if not pendentes[e['script']]]
+    while prontas:
+        atual = prontas.pop(0)
+        ordem.append(por_script[atual])
+        for script, deps in pendentes.items():
+            if atual in deps:
+                deps.discard(atual)
+                if not deps and script not in prontas and por_script[script] not in ordem:
+                    prontas.append(script)
+    if len(ordem) != len(etapas):
+        raise ValueError('Ciclo de dependências entre as etapas do pipeline')
+    return ordem, dependencias
+
+
+def carregar_estado(caminho=ARQUIVO_ESTADO):
+    """Hashes registrados na última execução bem-sucedida de cada etapa (.cache/pipeline_estado.json)."""
+    if os.path.exists(caminho):
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    return {'etapas': {}, 'hashes': {}}
+
+
+def salvar_estado(estado, caminho=ARQUIVO_ESTADO):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+
+
+def hash_registrado(estado, relativo):
+    """
+    SHA-256 do arquivo, reaproveitado enquanto tamanho e mtime não mudarem.
+    Para uma pasta, combina os nomes e hashes de todos os arquivos dentro dela.
+    """
+    if os.path.isdir(_caminho(relativo)):
+        arquivos = sorted(
+            os.path.relpath(os.path.join(raiz, nome), _caminho(relativo)).replace(os.sep, '/')
+            for raiz, _, nomes in os.walk(_caminho(relativo)) for nome in nomes
+        )
+        partes = [[arq, hash_registrado(estado, f'{relativo}/{arq}')] for arq in arquivos]
+        return hashlib.sha256(json.dumps(partes).encode('utf-8')).hexdigest()
+    info = os.stat(_caminho(relativo))
+    assinatura = [info.st_size, info.st_mtime_ns]
+    registro = estado['hashes'].get(relativo)
+    if registro and registro['assinatura'] == assinatura:
+        return registro['sha256']
+    valor = hash_arquivo(_caminho(relativo))
+    estado['hashes'][relativo] = {'assinatura': assinatura, 'sha256': valor}
+    return valor
+
+
+def impressao_etapa(estado, etapa):
+    """Hashes atuais do script (e módulos locais) e das entradas da etapa (None se ausente)."""
+    arquivos = [os.path.join('scripts', m) for m in modulos_locais(etapa['script'])] + _entradas(etapa)
+    return {
+        arq: (hash_registrado(estado, arq) if os.path.exists(_caminho(arq)) else None)
+        for arq in arquivos
+    }
+
+
+def motivo_execucao(estado, etapa):
+    """Retorna por que a etapa precisa rodar, ou None se está atualizada."""
+    faltando = [s for s in etapa['saidas'] if not os.path.exists(_caminho(s))]
+    if faltando:
+        return f'saída ausente: {faltando[0]}'
+    anterior = estado['etapas'].get(etapa['script'])
+    if anterior is None:
+        return 'sem registro de execução anterior'
+    atual = impressao_etapa(estado, etapa)
+    if set(atual) != set(anterior):
+        return 'dependências do script mudaram'
+    for arq, valor in atual.items():
+        if anterior[arq] != valor:
+            return f'alterado: {arq}'
+    return None
+
+
+def executar_script(script):
+    """Executa um script em processo separado, a partir da pasta scripts/ (caminhos '../')."""
+    ambiente = dict(os.environ, MPLBACKEND='Agg', SEM_GRAFICOS='1')
+    inicio = time.time()
+    proc = subprocess.run([sys.executable, script], cwd=DIR_SCRIPTS, env=ambiente,
+                          capture_output=True, text=True)
+    return proc.returncode, proc.stdout + proc.stderr, time.time() - inicio
+
+
+def _avaliar(estado, etapa, forcar):
+    """Decide o destino de uma etapa já liberada: ('pulada'|'atualizada'|'executar', motivo)."""
+    entradas_ausentes = [e for e in etapa['entradas'] if not os.path.exists(_caminho(e))]
+    if entradas_ausentes:
+        return 'pulada', f'entrada ausente ({entradas_ausentes[0]})'
+    motivo = 'forçada' if forcar else motivo_execucao(estado, etapa)
+    return ('atualizada', None) if motivo is None else ('executar', motivo)
+
+
+def simular_pipeline(selecao=None, forcar=False):
+    """Lista, em ordem topológica, o que seria executado (sem executar nada)."""
+    ordem, dependencias = ordenar_etapas(ETAPAS)
+    estado = carregar_estado()
+    simuladas = set()
+    for etapa in ordem:
+        script = etapa['script']
+        if selecao and script not in selecao:
+            continue
+        situacao, motivo = _avaliar(estado, etapa, forcar)
+        if situacao == 'atualizada' and dependencias[script] & simuladas:
+            # As etapas anteriores não rodam de fato; assume-se que as saídas delas mudariam
+            situacao, motivo = 'executar', f'depende de {sorted(dependencias[script] & simuladas)[0]}'
+        if situacao == 'executar':
+            print(f'[executaria]  {script}: {motivo}')
+            simuladas.add(script)
+        elif situacao == 'pulada':
+            print(f'[pulada]      {script}: {motivo}')
+        else:
+            print(f'[atualizada]  {script}')
+    salvar_estado(estado)
+    return simuladas
+
+
+def executar_pipeline(selecao=None, forcar=False, workers=None):
+    """
+    Executa as etapas desatualizadas em um pool de processos.
+    Uma etapa é liberada quando todas as etapas de que depende terminaram; ramos
+    independentes (NDVI, INMET, IBGE; depois os modelos) rodam em paralelo.
+    Se uma etapa falha, as que dependem dela (direta ou indiretamente) são canceladas;
+    as demais continuam. Retorna (executadas, falhas, canceladas).
+    """
+    ordem, dependencias = ordenar_etapas(ETAPAS)
+    por_script = {e['script']: e for e in ordem}
+    estado = carregar_estado()
+    workers = workers or os.cpu_count() or 1
+
+    # Etapas fora da seleção contam como resolvidas: usa-se o que já está em disco
+    resolvidas = {s for s in por_script if selecao and s not in selecao}
+    pendentes = [s for s in por_script if s not in resolvidas]
+    executadas, falhas, canceladas = set(), [], set()
+    em_execucao = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pendentes or em_execucao:
+            for script in list(pendentes):
+                deps = dependencias[script]
+                if deps & (set(falhas) | canceladas):
+                    pendentes.remove(script)
+                    canceladas.add(script)
+                    print(f'[cancelada]   {script}: depende de etapa que falhou')
+                    continue
+                if not deps <= resolvidas:
+                    continue
+                pendentes.remove(script)
+                situacao, motivo = _avaliar(estado, por_script[script], forcar)
+                if situacao != 'executar':
+                    resolvidas.add(script)
+                    print(f'[{situacao}]'.ljust(14) + f'{script}' + (f': {motivo}' if motivo else ''))
+                    continue
+                print(f'[executando]  {script}: {motivo}')
+                em_execucao[pool.submit(executar_script, script)] = script
+
+            if not em_execucao:
+                continue
+            concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                script = em_execucao.pop(futuro)
+                codigo, saida, duracao = futuro.result()
+                if codigo != 0:
+                    print(f'[falhou]      {script} ({duracao:.1f}s)\n{saida}')
+                    falhas.append(script)
+                    continue
+                estado['etapas'][script] = impressao_etapa(estado, por_script[script])
+                salvar_estado(estado)
+                resolvidas.add(script)
+                executadas.add(script)
+                print(f'[ok]          {script} ({duracao:.1f}s)')
+
+    salvar_estado(estado)
+    return executadas, falhas, canceladas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Executa apenas as etapas desatualizadas do pipeline.')
+    parser.add_argument('etapas', nargs='*', help='scripts a considerar (padrão: todos)')
+    parser.add_argument('--forcar', action='store_true', help='reexecuta as etapas mesmo se atualizadas')
+    parser.add_argument('--simular', action='store_true', help='apenas lista o que seria executado')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='número de etapas simultâneas (padrão: número de CPUs)')
+    parser.add_argument('--sem-graficos', '--no-plots', dest='sem_graficos', action='store_true',
+                        help='não desenha as figuras de resultados/ ao final')
+    parser.add_argument('--incremental', action='store_true',
+                        help='etapas com modo incremental dobram só os dados novos (agregacao_incremental.py)')
+    args = parser.parse_args()
+    if args.incremental:
+        os.environ['INCREMENTAL'] = '1'  # herdado pelos scripts executados
+
+    selecao = set(args.etapas) or None
+    if args.simular:
+        simular_pipeline(selecao, forcar=args.forcar)
+        sys.exit(0)
+    _, falhas, canceladas = executar_pipeline(selecao, forcar=args.forcar, workers=args.workers)
+    if not args.sem_graficos:
+        from renderizar_figuras import renderizar_figuras
+        print('\nFiguras:')
+        desenhadas, em_dia, _, falhas_figuras = renderizar_figuras(workers=args.workers)
+        print(f'{len(desenhadas)} figuras desenhadas, {len(em_dia)} em dia.')
+        falhas += [f'figura {nome}' for nome in falhas_figuras]
+    if falhas:
+        print(f'\nFalharam: {", ".join(falhas)}' + (f'; canceladas: {", ".join(sorted(canceladas))}' if canceladas else ''))
+    sys.exit(1 if falhas else 0)
@@ -0,0 +1,254 @@
+"""
+Modo parametrizado por município: a mesma análise feita para Sidrolândia-MS
+(integração produtividade + NDVI + clima, correlações e validação LOO) para todos os
+municípios produtores da Tabela 1612 do SIDRA.
+- A tabela SIDRA é lida uma única vez (cache Parquet) e fatiada por município
+- Cada município é processado de forma independente em um pool de processos,
+  recebendo apenas as suas próprias linhas
+- Saídas em Parquet particionado no estilo Hive, um arquivo por município:
+      dados_processados/municipios/<tabela>/uf=MS/municipio=Sidrol%C3%A2ndia/parte.parquet
+  (tabelas: integrado_anual, correlacao_anual, validacao_loo)
+- Um manifesto guarda o hash das entradas de cada município (dados + código de
+  pipeline_municipios.py e de todos os módulos locais que ele importa): só os municípios
+  novos ou alterados são reprocessados e só as suas partições são regravadas. Incluir o
+  milésimo município custa o mesmo que incluir o décimo. Numa execução completa, municípios
+  que saíram da tabela SIDRA perdem a entrada no manifesto e as partições.
+
+Covariáveis (NDVI/clima): se existir dados_brutos/municipios/<Nome_UF>.csv (colunas Ano +
+variáveis anuais), ela é usada; senão, usa-se a série de referência do ponto SATVeg/INMET
+de Sidrolândia (ndvi_medio_por_ano.csv + inmet_clima_anual.csv). A coluna 'covariaveis'
+registra a origem ('propria' ou 'referencia').
+
+Uso (a partir de scripts/):
+    python pipeline_municipios.py                    # todos os municípios desatualizados
+    python pipeline_municipios.py --municipio Maracaju --municipio Dourados
+    python pipeline_municipios.py --forcar --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.metrics import r2_score
+
+from cache_dados import hash_arquivo, modulos_locais
+from correlacao_vetorizada import matriz_correlacao
+from leitor_sidra import ler_tabela_sidra, extrair_todos, resolver_municipio, nome_arquivo_municipio, separar_uf
+from loo_linear import r2_press, rmse_loo
+from validacao_modelos import previsoes_loo
+
+DIR_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIR_SCRIPTS)
+DIR_SAIDA = os.path.join(RAIZ, 'dados_processados', 'municipios')
+DIR_COVARIAVEIS = os.path.join(RAIZ, 'dados_brutos', 'municipios')
+ARQUIVO_MANIFESTO = os.path.join(DIR_SAIDA, '_manifesto.json')
+NDVI_REFERENCIA = os.path.join(RAIZ, 'dados_processados', 'ndvi_medio_por_ano.csv')
+CLIMA_REFERENCIA = os.path.join(RAIZ, 'dados_processados', 'inmet_clima_anual.csv')
+
+TABELAS = ('integrado_anual', 'correlacao_anual', 'validacao_loo')
+ALVO = 'Produtividade (ton/ha)'
+PREDITORAS = ['Savitzky-Golay', 'Precipitacao_total_mm', 'Temp_media_C']
+
+
+def covariaveis_referencia():
+    ndvi = pd.read_csv(NDVI_REFERENCIA)
+    clima = pd.read_csv(CLIMA_REFERENCIA)
+    return ndvi.merge(clima, on='Ano', how='inner')
+
+
+def covariaveis_municipio(municipio, referencia):
+    """Covariáveis anuais próprias do município, se houver, ou a série de referência."""
+    arquivo = os.path.join(DIR_COVARIAVEIS, nome_arquivo_municipio(municipio) + '.csv')
+    if os.path.exists(arquivo):
+        return pd.read_csv(arquivo), 'propria'
+    return referencia, 'referencia'
+
+
+def _versao_codigo(produto):
+    """Hash deste script e dos módulos de scripts/ que ele importa (recursivamente), mais o produto."""
+    h = hashlib.sha256(produto.encode('utf-8'))
+    for modulo in modulos_locais(os.path.basename(__file__)):
+        h.update(hash_arquivo(os.path.join(DIR_SCRIPTS, modulo)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _hash_entradas(producao, covariaveis, versao_codigo):
+    h = hashlib.sha256(versao_codigo.encode('utf-8'))
+    for df in (producao, covariaveis):
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        h.update(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _correlacao_longa(integrado):
+    colunas = [c for c in integrado.select_dtypes('number').columns if c != 'Ano']
+    r, p, n = matriz_correlacao(integrado, 'pearson', colunas)
+    longo = pd.DataFrame({
+        'variavel_1': np.repeat(colunas, len(colunas)),
+        'variavel_2': np.tile(colunas, len(colunas)),
+        'r': r.to_numpy().ravel(),
+        'p_valor': p.to_numpy().ravel(),
+        'n': n.to_numpy().ravel(),
+    })
+    return longo[longo['variavel_1'] < longo['variavel_2']].reset_index(drop=True)
+
+
+def _validacao(integrado):
+    dados = integrado.dropna(subset=PREDITORAS + [ALVO])
+    X, y = dados[PREDITORAS], dados[ALVO]
+    linhas = []
+    if len(dados) < 3:
+        # Tipos explícitos: o esquema das partições vazias precisa bater com o das demais
+        return pd.DataFrame({'Modelo': pd.Series(dtype=str), 'n': pd.Series(dtype='int64'),
+                             'R2_treino': pd.Series(dtype=float), 'R2_LOO': pd.Series(dtype=float),
+                             'RMSE_LOO': pd.Series(dtype=float)})
+    for nome, modelo in {'LinearRegression': LinearRegression(), 'Ridge': Ridge(alpha=1.0)}.items():
+        y_loo = previsoes_loo(modelo, X, y)
+        linhas.append({
+            'Modelo': nome,
+            'n': len(dados),
+            'R2_treino': r2_score(y, modelo.fit(X, y).predict(X)),
+            'R2_LOO': r2_press(y, y_loo),
+            'RMSE_LOO': rmse_loo(y, y_loo),
+        })
+    return pd.DataFrame(linhas)
+
+
+def processar_municipio(municipio, producao, covariaveis, origem_covariaveis):
+    """Integração, correlação e LOO de um município. Retorna {tabela: DataFrame}."""
+    integrado = producao.drop(columns='Municipio').merge(covariaveis, on='Ano', how='inner')
+    integrado['covariaveis'] = origem_covariaveis
+    return {
+        'integrado_anual': integrado,
+        'correlacao_anual': _correlacao_longa(integrado),
+        'validacao_loo': _validacao(integrado),
+    }
+
+
+def _pasta_particao(tabela, municipio):
+    nome, uf = separar_uf(municipio)
+    # Valores codificados em URI, como o particionamento Hive do pyarrow espera na leitura
+    return os.path.join(DIR_SAIDA, tabela, f'uf={quote(uf, safe="")}', f'municipio={quote(nome, safe="")}')
+
+
+def gravar_particoes(municipio, resultados):
+    for tabela, df in resultados.items():
+        pasta = _pasta_particao(tabela, municipio)
+        if os.path.isdir(pasta):
+            shutil.rmtree(pasta)
+        os.makedirs(pasta)
+        df.to_parquet(os.path.join(pasta, 'parte.parquet'), index=False)
+
+
+def remover_particoes(municipio):
+    for tabela in TABELAS:
+        pasta = _pasta_particao(tabela, municipio)
+        if os.path.isdir(pasta):
+            shutil.rmtree(pasta)
+        pasta_uf = os.path.dirname(pasta)
+        if os.path.isdir(pasta_uf) and not os.listdir(pasta_uf):
+            os.rmdir(pasta_uf)
+
+
+def _processar_lote(tarefas):
+    """Executado em um processo do pool: processa e grava vários municípios."""
+    concluidos = []
+    for municipio, producao, covariaveis, origem, hash_entradas in tarefas:
+        gravar_particoes(municipio, processar_municipio(municipio, producao, covariaveis, origem))
+        concluidos.append((municipio, hash_entradas))
+    return concluidos
+
+
+def carregar_manifesto():
+    if os.path.exists(ARQUIVO_MANIFESTO):
+        with open(ARQUIVO_MANIFESTO, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def salvar_manifesto(manifesto):
+    os.makedirs(DIR_SAIDA, exist_ok=True)
+    with open(ARQUIVO_MANIFESTO, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def ler_resultados(tabela, municipios=None):
+    """Lê uma tabela particionada (todas as partições ou só as de `municipios`, nomes com UF)."""
+    if municipios is None:
+        return pd.read_parquet(os.path.join(DIR_SAIDA, tabela), partitioning='hive')
+    partes = []
+    for municipio in municipios:
+        nome, uf = separar_uf(municipio)
+        parte = pd.read_parquet(os.path.join(_pasta_particao(tabela, municipio), 'parte.parquet'))
+        partes.append(parte.assign(uf=uf, municipio=nome))
+    return pd.concat(partes, ignore_index=True)
+
+
+def executar(municipios=None, produto='Milho (em grão)', forcar=False, workers=None, tamanho_lote=None):
+    """
+    Processa os municípios (todos os produtores, por padrão) que estiverem desatualizados.
+    Retorna (processados, pulados).
+    """
+    tabela_sidra = ler_tabela_sidra()
+    producao = extrair_todos(tabela_sidra, produto)
+    if municipios:
+        municipios = [resolver_municipio(tabela_sidra, m) for m in municipios]
+        producao = producao[producao['Municipio'].isin(municipios)]
+
+    referencia = covariaveis_referencia()
+    versao_codigo = _versao_codigo(produto)
+    manifesto = carregar_manifesto()
+    if not municipios:
+        # Execução completa: municípios que não estão mais na entrada deixam de ter saídas
+        for municipio in sorted(set(manifesto) - set(producao['Municipio'])):
+            remover_particoes(municipio)
+            del manifesto[municipio]
+
+    tarefas, pulados = [], []
+    for municipio, linhas in producao.groupby('Municipio', sort=True):
+        covariaveis, origem = covariaveis_municipio(municipio, referencia)
+        hash_entradas = _hash_entradas(linhas, covariaveis, versao_codigo)
+        if not forcar and manifesto.get(municipio) == hash_entradas:
+            pulados.append(municipio)
+            continue
+        tarefas.append((municipio, linhas.reset_index(drop=True), covariaveis, origem, hash_entradas))
+
+    workers = workers or os.cpu_count() or 1
+    # Lotes de municípios por processo: amortiza o custo de envio das tarefas ao pool
+    tamanho_lote = tamanho_lote or max(1, len(tarefas) // (workers * 4))
+    lotes = [tarefas[i:i + tamanho_lote] for i in range(0, len(tarefas), tamanho_lote)]
+    processados = []
+    if lotes:
+        with ProcessPoolExecutor(max_workers=min(workers, len(lotes))) as pool:
+            for concluidos in pool.map(_processar_lote, lotes):
+                for municipio, hash_entradas in concluidos:
+                    manifesto[municipio] = hash_entradas
+                    processados.append(municipio)
+    salvar_manifesto(manifesto)
+    return processados, pulados
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Integração, correlação e LOO por município (SIDRA 1612).')
+    parser.add_argument('--municipio', action='append', help='município (com ou sem UF); pode repetir')
+    parser.add_argument('--produto', default='Milho (em grão)')
+    parser.add_argument('--forcar', action='store_true', help='reprocessa mesmo sem mudanças')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    processados, pulados = executar(args.municipio, args.produto, args.forcar, args.workers)
+    print(f'{len(processados)} municípios processados, {len(pulados)} sem alterações '
+          f'({time.perf_counter() - inicio:.1f}s). Saídas em dados_processados/municipios/.')
+    if processados or pulados:
+        validacao = ler_resultados('validacao_loo')
+        resumo = validacao.pivot_table(index=['uf', 'municipio'], columns='Modelo', values='R2_LOO', observed=True)
+        print('\nR² LOO por município (primeiras linhas):')
+        print(resumo.head(10).round(3))
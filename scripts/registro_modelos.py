@@ -0,0 +1,178 @@
+"""
+Registro persistente de modelos e API de previsão em lote.
+- registrar_modelo() salva o estimador ajustado junto com o esquema de entrada
+  (colunas na ordem do treino, alvo, métricas) em modelos/<nome>/v<N>/
+- carregar_modelo() lê o modelo uma única vez por processo
+- prever_lote() valida/reordena as colunas dos cenários e prevê em blocos vetorizados
+
+Uso pela linha de comando (a partir de scripts/):
+    python registro_modelos.py listar
+    python registro_modelos.py prever rf_anual cenarios.csv --saida previsoes.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+DIR_MODELOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modelos')
+TAMANHO_LOTE = 100_000
+
+_modelos_carregados = {}
+
+
+def _versoes(nome):
+    pasta = os.path.join(DIR_MODELOS, nome)
+    if not os.path.isdir(pasta):
+        return []
+    return sorted(int(v[1:]) for v in os.listdir(pasta) if v.startswith('v') and v[1:].isdigit())
+
+
+def _impressao_modelo(modelo, colunas):
+    """
+    Identifica o modelo pelo comportamento: classe, hiperparâmetros, colunas e previsões sobre
+    uma matriz de sondagem fixa (o pickle do estimador não é byte a byte reprodutível).
+    """
+    sonda = np.random.default_rng(0).normal(size=(64, len(colunas)))
+    if hasattr(modelo, 'feature_names_in_'):
+        sonda = pd.DataFrame(sonda, columns=list(modelo.feature_names_in_))
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        'classe': f'{type(modelo).__module__}.{type(modelo).__qualname__}',
+        'parametros': sorted((k, repr(v)) for k, v in modelo.get_params().items() if k != 'n_jobs'),
+        'colunas': [str(c) for c in colunas],
+    }).encode('utf-8'))
+    h.update(np.round(np.asarray(modelo.predict(sonda), dtype=float), 10).tobytes())
+    return h.hexdigest()
+
+
+def registrar_modelo(modelo, nome, colunas, alvo, metricas=None, descricao=''):
+    """
+    Salva o modelo ajustado como nova versão de `nome`. Retorna o número da versão.
+    Se o modelo for equivalente ao da última versão (ver _impressao_modelo), nada é gravado.
+    """
+    impressao = _impressao_modelo(modelo, colunas)
+    versoes = _versoes(nome)
+    if versoes:
+        with open(os.path.join(DIR_MODELOS, nome, f'v{versoes[-1]}', 'esquema.json'), encoding='utf-8') as f:
+            if json.load(f).get('impressao') == impressao:
+                return versoes[-1]
+    versao = (versoes or [0])[-1] + 1
+    pasta = os.path.join(DIR_MODELOS, nome, f'v{versao}')
+    os.makedirs(pasta, exist_ok=True)
+    joblib.dump(modelo, os.path.join(pasta, 'modelo.joblib'))
+    esquema = {
+        'nome': nome,
+        'versao': versao,
+        'classe': f'{type(modelo).__module__}.{type(modelo).__qualname__}',
+        'colunas': [str(c) for c in colunas],
+        'alvo': alvo,
+        'metricas': {k: float(v) for k, v in (metricas or {}).items()},
+        'descricao': descricao,
+        'impressao': impressao,
+        'sklearn': sklearn.__version__,
+        'criado_em': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(pasta, 'esquema.json'), 'w', encoding='utf-8') as f:
+        json.dump(esquema, f, ensure_ascii=False, indent=2)
+    return versao
+
+
+def carregar_modelo(nome, versao=None):
+    """Retorna (modelo, esquema). Sem `versao`, usa a mais recente. Fica em memória após a 1ª leitura."""
+    versoes = _versoes(nome)
+    if not versoes:
+        raise KeyError(f'Modelo não registrado: {nome!r}')
+    versao = versao or versoes[-1]
+    chave = (nome, versao)
+    if chave not in _modelos_carregados:
+        pasta = os.path.join(DIR_MODELOS, nome, f'v{versao}')
+        with open(os.path.join(pasta, 'esquema.json'), encoding='utf-8') as f:
+            esquema = json.load(f)
+        modelo = joblib.load(os.path.join(pasta, 'modelo.joblib'))
+        # Previsão das árvores em paralelo, quando o estimador permite
+        if 'n_jobs' in modelo.get_params():
+            modelo.set_params(n_jobs=-1)
+        _modelos_carregados[chave] = (modelo, esquema)
+    return _modelos_carregados[chave]
+
+
+def _matriz_entrada(cenarios, colunas):
+    faltando = [c for c in colunas if c not in cenarios.columns]
+    if faltando:
+        raise ValueError(f'Colunas ausentes nos cenários: {faltando}')
+    return np.ascontiguousarray(cenarios[colunas].to_numpy(dtype=np.float64))
+
+
+def prever_lote(nome, cenarios, versao=None, tamanho_lote=TAMANHO_LOTE):
+    """
+    Prevê o alvo para cada linha de `cenarios` (DataFrame com pelo menos as colunas do esquema;
+    colunas extras são ignoradas). A matriz é montada uma vez e prevista em blocos.
+    """
+    modelo, esquema = carregar_modelo(nome, versao)
+    colunas = esquema['colunas']
+    X = _matriz_entrada(cenarios, colunas)
+    usa_nomes = hasattr(modelo, 'feature_names_in_')
+    saida = np.empty(len(X))
+    for inicio in range(0, len(X), tamanho_lote):
+        bloco = X[inicio:inicio + tamanho_lote]
+        if usa_nomes:
+            bloco = pd.DataFrame(bloco, columns=colunas)
+        saida[inicio:inicio + tamanho_lote] = modelo.predict(bloco)
+    return saida
+
+
+def listar_modelos():
+    linhas = []
+    for nome in sorted(os.listdir(DIR_MODELOS)) if os.path.isdir(DIR_MODELOS) else []:
+        versoes = _versoes(nome)
+        if not versoes:
+            continue
+        _, esquema = carregar_modelo(nome, versoes[-1])
+        linhas.append({
+            'nome': nome,
+            'versao': versoes[-1],
+            'classe': esquema['classe'].rsplit('.', 1)[-1],
+            'alvo': esquema['alvo'],
+            'colunas': ', '.join(esquema['colunas']),
+            'criado_em': esquema['criado_em'],
+        })
+    return pd.DataFrame(linhas)
+
+
+def prever_csv(nome, entrada, saida, versao=None, tamanho_lote=TAMANHO_LOTE):
+    """Lê os cenários em blocos, prevê e grava incrementalmente (cenários + coluna de previsão)."""
+    _, esquema = carregar_modelo(nome, versao)
+    coluna_prev = f"{esquema['alvo']}_predito"
+    total = 0
+    inicio = time.perf_counter()
+    for i, bloco in enumerate(pd.read_csv(entrada, chunksize=tamanho_lote)):
+        bloco[coluna_prev] = prever_lote(nome, bloco, versao, tamanho_lote)
+        bloco.to_csv(saida, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        total += len(bloco)
+    duracao = time.perf_counter() - inicio
+    return total, duracao
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Registro de modelos e previsão em lote de cenários.')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('listar', help='lista os modelos registrados')
+    p_prever = sub.add_parser('prever', help='prevê um CSV de cenários com um modelo registrado')
+    p_prever.add_argument('modelo')
+    p_prever.add_argument('entrada', help='CSV com as colunas do esquema do modelo')
+    p_prever.add_argument('--saida', default='previsoes.csv')
+    p_prever.add_argument('--versao', type=int, default=None)
+    p_prever.add_argument('--lote', type=int, default=TAMANHO_LOTE)
+    args = parser.parse_args()
+
+    if args.comando == 'listar':
+        print(listar_modelos().to_string(index=False))
+    else:
+        total, duracao = prever_csv(args.modelo, args.entrada, args.saida, args.versao, args.lote)
+        print(f'{total} cenários previstos em {duracao:.2f}s ({total / max(duracao, 1e-9):,.0f}/s) -> {args.saida}')
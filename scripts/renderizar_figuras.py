@@ -0,0 +1,75 @@
+"""
+Etapa de renderização: desenha as figuras de resultados/ a partir dos dados já salvos.
+- As figuras estão registradas em graficos.py (PNG de saída + arquivos de dados lidos)
+- Figuras cujos dados e código de desenho não mudaram desde a última renderização são puladas
+- Figuras sem os dados de entrada (etapa ainda não executada) são ignoradas
+- As demais são desenhadas em paralelo, em um pool de processos
+
+Uso (a partir de scripts/):
+    python renderizar_figuras.py                   # apenas as figuras desatualizadas
+    python renderizar_figuras.py pairplot          # só as figuras indicadas
+    python renderizar_figuras.py --forcar --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from graficos import FIGURAS, impressao_figura, figura_em_dia, desenhar_figura
+
+
+def _renderizar(nome, impressao):
+    inicio = time.time()
+    desenhar_figura(nome, impressao)
+    return time.time() - inicio
+
+
+def renderizar_figuras(nomes=None, forcar=False, workers=None):
+    """Desenha as figuras desatualizadas. Retorna (desenhadas, em_dia, sem_dados, falhas)."""
+    nomes = nomes or list(FIGURAS)
+    desconhecidas = [n for n in nomes if n not in FIGURAS]
+    if desconhecidas:
+        raise KeyError(f'Figuras não registradas em graficos.py: {desconhecidas}')
+
+    pendentes, em_dia, sem_dados = {}, [], []
+    for nome in nomes:
+        impressao = impressao_figura(nome)
+        if impressao is None:
+            sem_dados.append(nome)
+        elif not forcar and figura_em_dia(nome, impressao):
+            em_dia.append(nome)
+        else:
+            pendentes[nome] = impressao
+
+    desenhadas, falhas = [], []
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(pendentes))) as pool:
+            futuros = {pool.submit(_renderizar, nome, impressao): nome for nome, impressao in pendentes.items()}
+            for futuro in as_completed(futuros):
+                nome = futuros[futuro]
+                try:
+                    duracao = futuro.result()
+                except Exception as erro:
+                    print(f'[falhou]      {nome}: {erro}')
+                    falhas.append(nome)
+                    continue
+                print(f'[ok]          {FIGURAS[nome]["saida"]} ({duracao:.1f}s)')
+                desenhadas.append(nome)
+    return desenhadas, em_dia, sem_dados, falhas
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Desenha as figuras a partir dos dados salvos.')
+    parser.add_argument('figuras', nargs='*', help=f'nomes das figuras (padrão: todas as {len(FIGURAS)})')
+    parser.add_argument('--forcar', action='store_true', help='redesenha mesmo as figuras em dia')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    inicio = time.time()
+    desenhadas, em_dia, sem_dados, falhas = renderizar_figuras(args.figuras, args.forcar, args.workers)
+    if sem_dados:
+        print(f'Sem dados de entrada: {", ".join(sem_dados)}')
+    print(f'\n{len(desenhadas)} figuras desenhadas, {len(em_dia)} em dia, {len(sem_dados)} sem dados, '
+          f'{len(falhas)} falhas ({time.time() - inicio:.1f}s).')
+    sys.exit(1 if falhas else 0)
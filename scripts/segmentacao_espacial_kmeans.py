@@ -3,51 +3,60 @@ Segmentação automática por cor (K-means) na imagem satveg-sta-querencia.png
 - Identifica zonas: vegetação ativa, solo exposto, vegetação nativa/pousio
 - Destaca cada zona com cor/transparência diferente
 - Salva resultado em resultados/satveg_segmentado_kmeans.png
+- Salva a contagem de pixels por zona em dados_processados/satveg_segmentado_kmeans_contagem.csv
+  e os rótulos por pixel em dados_processados/satveg_segmentado_kmeans_rotulos.npy
+
+O ajuste é feito em uma amostra de pixels (MiniBatchKMeans) e os rótulos/cores são aplicados
+em blocos (ver segmentacao_kmeans.py), então a mesma rotina serve para cenas muito maiores.
 """
+import argparse
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.cluster import KMeans
+import pandas as pd
 from PIL import Image
+from segmentacao_kmeans import segmentar_imagem
+from graficos import opcao_sem_graficos, desenhar_figuras, CORES_ZONAS
+
+args = opcao_sem_graficos(argparse.ArgumentParser(description='Segmentação K-means da imagem SATVeg.')).parse_args()
 
 # Parâmetros
-img_path = '../satveg-sta-querencia.png'
+img_path = '../resultados/satveg-sta-querencia.png'
 output_path = '../resultados/satveg_segmentado_kmeans.png'
+contagem_path = '../dados_processados/satveg_segmentado_kmeans_contagem.csv'
+rotulos_path = '../dados_processados/satveg_segmentado_kmeans_rotulos.npy'
 n_clusters = 3  # Vegetação, solo, pousio/sombra
 
-# Lê imagem
+# Lê imagem (cenas grandes: desativa o limite de pixels do PIL)
+Image.MAX_IMAGE_PIXELS = None
 img = Image.open(img_path).convert('RGB')
-img_np = np.array(img)
+img_np = np.asarray(img)
 
-# Prepara para K-means
-pixels = img_np.reshape(-1, 3)
-kmeans = KMeans(n_clusters=n_clusters, random_state=42).fit(pixels)
-labels = kmeans.labels_.reshape(img_np.shape[:2])
-centers = kmeans.cluster_centers_.astype(np.uint8)
+# K-means ajustado em uma amostra e aplicado à imagem em blocos
+resultado = segmentar_imagem(img_np, n_clusters)
+labels = resultado['rotulos']
+centers = resultado['centros'].astype(np.float32)
 
 # Define cores para destacar zonas
 # Verde escuro: cultivo ativo, Amarelo: solo exposto, Cinza: vegetação nativa/pousio
-cores_dest = [np.array([34,139,34]), np.array([255, 255, 0]), np.array([160,160,160])]  # verde, amarelo, cinza
+nomes_dest = list(CORES_ZONAS)
+cores_dest = np.array(list(CORES_ZONAS.values()), dtype=np.float32)  # verde, amarelo, cinza
 
 # Associa clusters às cores destino pela proximidade ao verde, amarelo e cinza
-def cor_mais_proxima(centro):
-    return np.argmin([np.linalg.norm(centro-c) for c in cores_dest])
-
-mapa_clusters = [cor_mais_proxima(centro) for centro in centers]
-
-# Gera imagem segmentada
-img_segmentada = np.zeros_like(img_np)
-for i, idx in enumerate(mapa_clusters):
-    img_segmentada[labels == i] = cores_dest[idx]
-
-# Transparência para sobrepor
-alpha = 0.45
-img_overlay = (alpha*img_segmentada + (1-alpha)*img_np).astype(np.uint8)
-
-plt.figure(figsize=(10,10))
-plt.imshow(img_overlay)
-plt.axis('off')
-plt.title('Segmentação K-means: Vegetação (verde), Solo exposto (amarelo), Pousio (cinza)')
-plt.savefig(output_path, bbox_inches='tight', dpi=300)
-plt.close()
-
-print(f'Segmentação K-means salva em {output_path}')
+mapa_clusters = np.linalg.norm(centers[:, None, :] - cores_dest[None, :, :], axis=2).argmin(axis=1)
+
+# Contagem de pixels por cluster
+contagem = pd.DataFrame({
+    'cluster': np.arange(n_clusters),
+    'zona': [nomes_dest[i] for i in mapa_clusters],
+    'pixels': resultado['contagem'],
+})
+contagem['percentual'] = 100 * contagem['pixels'] / contagem['pixels'].sum()
+contagem.to_csv(contagem_path, index=False)
+print(contagem.to_string(index=False))
+
+# Rótulos (uint8, 1 byte/pixel): a sobreposição é desenhada a partir deles e da imagem original
+np.save(rotulos_path, labels)
+
+# Sobreposição: tabela cluster -> cor com transparência, em uma única indexação
+if not args.sem_graficos:
+    desenhar_figuras(['satveg_segmentado_kmeans'])
+    print(f'Segmentação K-means salva em {output_path}')
@@ -0,0 +1,91 @@
+"""
+Segmentação por cor (K-means) para imagens de satélite grandes.
+- O ajuste usa MiniBatchKMeans sobre uma amostra aleatória de pixels (não sobre a imagem inteira)
+- Os rótulos são atribuídos em blocos de linhas: só um bloco por vez é convertido para float32
+- A pintura usa uma tabela cluster -> cor (LUT) em uma única indexação, sem um laço por cluster
+- A contagem de pixels por classe sai de np.bincount, acumulada bloco a bloco
+
+Memória: além da imagem RGB em uint8, apenas os rótulos (uint8, 1 byte/pixel) e um bloco
+em float32 ficam na memória, o que permite cenas de centenas de megapixels.
+
+Uso:
+    from segmentacao_kmeans import segmentar_imagem
+    resultado = segmentar_imagem(img_np, n_clusters=3)
+    resultado['rotulos'], resultado['centros'], resultado['contagem']
+"""
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+TAMANHO_AMOSTRA = 200_000
+PIXELS_POR_BLOCO = 4_000_000
+
+
+def amostrar_pixels(img, tamanho_amostra=TAMANHO_AMOSTRA, random_state=42):
+    """Amostra aleatória (sem reposição) de pixels RGB, em float32."""
+    pixels = img.reshape(-1, img.shape[-1])
+    rng = np.random.default_rng(random_state)
+    if len(pixels) > tamanho_amostra:
+        pixels = pixels[rng.choice(len(pixels), tamanho_amostra, replace=False)]
+    return pixels.astype(np.float32)
+
+
+def ajustar_kmeans(amostra, n_clusters, random_state=42):
+    modelo = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3,
+                             batch_size=min(len(amostra), 4096))
+    return modelo.fit(amostra)
+
+
+def _blocos_de_linhas(img, pixels_por_bloco):
+    linhas = max(1, pixels_por_bloco // img.shape[1])
+    for inicio in range(0, img.shape[0], linhas):
+        yield slice(inicio, inicio + linhas)
+
+
+def rotular_em_blocos(img, centros, pixels_por_bloco=PIXELS_POR_BLOCO):
+    """
+    Rótulo do centro mais próximo para cada pixel, processando blocos de linhas.
+    Usa ||x - c||² = ||x||² - 2 x·c + ||c||²; ||x||² é constante por pixel e não altera o argmin.
+    """
+    centros = np.asarray(centros, dtype=np.float32)
+    norma_centros = np.einsum('ij,ij->i', centros, centros)
+    rotulos = np.empty(img.shape[:2], dtype=np.uint8)
+    for linhas in _blocos_de_linhas(img, pixels_por_bloco):
+        bloco = img[linhas].reshape(-1, img.shape[-1]).astype(np.float32)
+        distancias = norma_centros - 2 * (bloco @ centros.T)
+        rotulos[linhas] = distancias.argmin(axis=1).reshape(img[linhas].shape[:2])
+    return rotulos
+
+
+def contagem_classes(rotulos, n_clusters, pixels_por_bloco=PIXELS_POR_BLOCO):
+    """Número de pixels de cada classe (np.bincount por bloco, acumulado)."""
+    contagem = np.zeros(n_clusters, dtype=np.int64)
+    for linhas in _blocos_de_linhas(rotulos, pixels_por_bloco):
+        contagem += np.bincount(rotulos[linhas].ravel(), minlength=n_clusters)
+    return contagem
+
+
+def pintar_sobreposicao(img, rotulos, lut_cores, alpha=0.45, saida=None,
+                        pixels_por_bloco=PIXELS_POR_BLOCO):
+    """
+    Mistura alpha*cor_da_classe + (1-alpha)*imagem. `lut_cores` é um array (n_clusters, 3)
+    indexado pelos rótulos. Com saida=img, a imagem é sobrescrita (sem cópia extra).
+    """
+    lut = np.asarray(lut_cores, dtype=np.float32) * np.float32(alpha)
+    peso_img = np.float32(1 - alpha)
+    saida = np.empty_like(img) if saida is None else saida
+    for linhas in _blocos_de_linhas(img, pixels_por_bloco):
+        mistura = lut[rotulos[linhas]] + peso_img * img[linhas]
+        saida[linhas] = mistura.astype(np.uint8)
+    return saida
+
+
+def segmentar_imagem(img, n_clusters, tamanho_amostra=TAMANHO_AMOSTRA, random_state=42,
+                     pixels_por_bloco=PIXELS_POR_BLOCO):
+    """Ajusta na amostra e rotula a imagem inteira. Retorna rótulos, centros e contagem por classe."""
+    modelo = ajustar_kmeans(amostrar_pixels(img, tamanho_amostra, random_state), n_clusters, random_state)
+    rotulos = rotular_em_blocos(img, modelo.cluster_centers_, pixels_por_bloco)
+    return {
+        'rotulos': rotulos,
+        'centros': modelo.cluster_centers_,
+        'contagem': contagem_classes(rotulos, n_clusters, pixels_por_bloco),
+    }
@@ -0,0 +1,143 @@
+"""
+Suavização Savitzky-Golay em lote para muitas séries de NDVI (pontos, municípios), sem laço por série.
+- As séries são empilhadas em uma matriz (séries x datas) sobre a grade comum de datas
+- Máscara de nuvens/outliers sobre a matriz inteira: valores fora de [NDVI_MINIMO, NDVI_MAXIMO] e
+  quedas abruptas em relação à mediana móvel (a nuvem reduz o NDVI)
+- Lacunas (mascaradas ou sem observação) preenchidas por interpolação linear no tempo: as posições
+  do último e do próximo valor válido saem de np.maximum.accumulate; nas pontas repete-se o valor
+- Savitzky-Golay ao longo do eixo do tempo (scipy.signal.savgol_filter, axis=1), uma chamada
+- Envelope superior (Chen et al., 2004): valores abaixo da curva suavizada são trocados por ela e
+  a matriz é suavizada de novo; os resíduos negativos do NDVI costumam ser nuvem
+
+O filtro supõe espaçamento regular. Os compostos MODIS de 16 dias reiniciam em 1º de janeiro (o
+último intervalo do ano é mais curto), diferença ignorada aqui.
+
+O resultado sai na coluna 'Savitzky-Golay', a mesma da exportação do SATVeg, e segue direto para
+analise_ndvi_mensal.py (que usa esta suavização quando a coluna não existe).
+
+Uso (a partir de scripts/):
+    python suavizacao_ndvi.py ../dados_processados/ndvi_cenas.csv --saida ../dados_processados/ndvi_cenas_sg.csv
+    python suavizacao_ndvi.py ../dados_brutos/ndvi_pontos.csv --serie Ponto --saida ../dados_processados/ndvi_pontos_sg.csv
+"""
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import savgol_filter
+
+JANELA = 7              # compostos (~3,5 meses com 16 dias)
+ORDEM = 2
+NDVI_MINIMO = -0.2
+NDVI_MAXIMO = 1.0
+JANELA_MEDIANA = 5
+QUEDA_MAXIMA = 0.15     # abaixo da mediana móvel mais do que isso = nuvem/outlier
+ITERACOES = 2           # ajustes do envelope superior
+
+
+def mediana_movel(valores, janela=JANELA_MEDIANA):
+    """Mediana móvel centrada ao longo do eixo 1, ignorando NaN."""
+    metade = janela // 2
+    preenchido = np.pad(valores, ((0, 0), (metade, metade)), constant_values=np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # janelas só com NaN
+        return np.nanmedian(sliding_window_view(preenchido, janela, axis=1), axis=-1)
+
+
+def mascarar(valores, minimo=NDVI_MINIMO, maximo=NDVI_MAXIMO, queda=QUEDA_MAXIMA, janela_mediana=JANELA_MEDIANA):
+    """Matriz booleana das leituras descartadas (ausentes, fora da faixa ou quedas abruptas)."""
+    invalidos = ~np.isfinite(valores) | (valores < minimo) | (valores > maximo)
+    referencia = mediana_movel(np.where(invalidos, np.nan, valores), janela_mediana)
+    with np.errstate(invalid='ignore'):
+        return invalidos | (valores < referencia - queda)
+
+
+def interpolar_lacunas(valores):
+    """Preenche NaN por interpolação linear ao longo do eixo 1 (linhas sem nenhum valor ficam NaN)."""
+    valores = np.asarray(valores, dtype=float)
+    n = valores.shape[1]
+    posicoes = np.arange(n)
+    validos = np.isfinite(valores)
+    anterior = np.maximum.accumulate(np.where(validos, posicoes, -1), axis=1)
+    proximo = np.minimum.accumulate(np.where(validos, posicoes, n)[:, ::-1], axis=1)[:, ::-1]
+    # Pontas: sem vizinho de um dos lados, usa o do outro
+    anterior = np.where(anterior < 0, proximo, anterior)
+    proximo = np.where(proximo >= n, anterior, proximo)
+    anterior, proximo = np.clip(anterior, 0, n - 1), np.clip(proximo, 0, n - 1)
+
+    linhas = np.arange(valores.shape[0])[:, None]
+    v_anterior, v_proximo = valores[linhas, anterior], valores[linhas, proximo]
+    distancia = np.maximum(proximo - anterior, 1)
+    preenchido = v_anterior + (v_proximo - v_anterior) * (posicoes - anterior) / distancia
+    return np.where(validos, valores, preenchido)
+
+
+def suavizar_lote(valores, janela=JANELA, ordem=ORDEM, queda=QUEDA_MAXIMA, iteracoes=ITERACOES):
+    """
+    Matriz (séries x datas) -> (suavizada, mascara). Séries mais curtas que a janela usam a maior
+    janela ímpar possível; sem pontos suficientes para o polinômio, ficam só interpoladas.
+    """
+    valores = np.atleast_2d(np.asarray(valores, dtype=float))
+    mascara = mascarar(valores, queda=queda)
+    base = interpolar_lacunas(np.where(mascara, np.nan, valores))
+
+    janela = min(janela, valores.shape[1] - (1 - valores.shape[1] % 2))
+    com_dados = np.isfinite(base).all(axis=1)   # linhas sem nenhuma leitura válida ficam NaN
+    if janela <= ordem or not com_dados.any():
+        return base, mascara
+    linhas = base[com_dados]
+    suavizada = savgol_filter(linhas, janela, ordem, axis=1, mode='interp')
+    for _ in range(iteracoes):
+        suavizada = savgol_filter(np.maximum(linhas, suavizada), janela, ordem, axis=1, mode='interp')
+    resultado = base.copy()
+    resultado[com_dados] = suavizada
+    return resultado, mascara
+
+
+def suavizar_tabela(df, col_valor='NDVI', col_data='Data', col_serie=None, col_saida='Savitzky-Golay', **opcoes):
+    """
+    Tabela longa (uma linha por série e data) -> mesma tabela com a coluna `col_saida` suavizada.
+    Sem `col_serie`, é uma única série. Datas repetidas na mesma série são promediadas.
+    """
+    datas = df[col_data]
+    if not pd.api.types.is_datetime64_any_dtype(datas):
+        datas = pd.to_datetime(datas, dayfirst=True)
+    codigo_data, grade = pd.factorize(datas, sort=True)
+    if col_serie is None:
+        codigo_serie, series = np.zeros(len(df), dtype=np.intp), [None]
+    else:
+        codigo_serie, series = pd.factorize(df[col_serie], sort=True)
+
+    valores = df[col_valor].to_numpy(dtype=float)
+    presente = np.isfinite(valores) & (codigo_data >= 0) & (codigo_serie >= 0)
+    soma = np.zeros((len(series), len(grade)))
+    contagem = np.zeros_like(soma)
+    np.add.at(soma, (codigo_serie[presente], codigo_data[presente]), valores[presente])
+    np.add.at(contagem, (codigo_serie[presente], codigo_data[presente]), 1)
+    with np.errstate(invalid='ignore'):
+        matriz = soma / contagem
+
+    suavizada, _ = suavizar_lote(matriz, **opcoes)
+    resultado = df.copy()
+    resultado[col_saida] = np.where((codigo_data >= 0) & (codigo_serie >= 0),
+                                    suavizada[codigo_serie, codigo_data], np.nan)
+    return resultado
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Savitzky-Golay em lote com máscara de nuvens e preenchimento.')
+    parser.add_argument('entrada', help='CSV com colunas Data e NDVI (e a coluna da série, se houver várias)')
+    parser.add_argument('--saida', required=True)
+    parser.add_argument('--serie', help='coluna que identifica cada série (ex.: Ponto, Municipio)')
+    parser.add_argument('--coluna', default='NDVI', help='coluna a suavizar (ex.: EVI)')
+    parser.add_argument('--janela', type=int, default=JANELA)
+    parser.add_argument('--ordem', type=int, default=ORDEM)
+    args = parser.parse_args()
+
+    col_saida = 'Savitzky-Golay' if args.coluna == 'NDVI' else f'Savitzky-Golay_{args.coluna}'
+    tabela = suavizar_tabela(pd.read_csv(args.entrada), col_valor=args.coluna, col_serie=args.serie,
+                             col_saida=col_saida, janela=args.janela, ordem=args.ordem)
+    tabela.to_csv(args.saida, index=False)
+    n_series = tabela[args.serie].nunique() if args.serie else 1
+    print(f'{n_series} séries suavizadas; salvo em {args.saida}')
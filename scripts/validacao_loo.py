@@ -0,0 +1,96 @@
+"""
+Validação Leave-One-Out (LOO) compartilhada pelos scripts de Random Forest.
+- Os folds rodam em paralelo (processos via joblib), junto com o ajuste do modelo final
+- Os núcleos que sobram são repassados ao modelo (n_jobs das árvores do Random Forest)
+- Retorna previsões, resíduos e métricas em uma única estrutura, para que gráficos e
+  tabelas consumam o mesmo resultado em vez de refazer os folds
+
+Uso:
+    from validacao_loo import avaliar_loo
+    resultado = avaliar_loo(RandomForestRegressor(n_estimators=100, random_state=42), X, y)
+    resultado['previsoes']     # DataFrame: y_real, y_pred, residuo (um por fold)
+    resultado['metricas']      # {'R2': ..., 'MAE': ..., 'RMSE': ...}
+    resultado['modelo_final']  # modelo ajustado com todos os dados
+
+avaliar_loo_em_cache() faz o mesmo, mas guarda/reaproveita o resultado em .cache/resultados.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import LeaveOneOut
+from cache_resultados import em_cache, versao_codigo
+
+
+def _ajustar_fold(modelo, X, y, idx_treino, idx_teste):
+    modelo = clone(modelo).fit(X[idx_treino], y[idx_treino])
+    if idx_teste is None:
+        return modelo
+    return modelo.predict(X[idx_teste])
+
+
+def _distribuir_nucleos(n_tarefas, n_jobs):
+    """Divide os núcleos entre tarefas paralelas (folds) e paralelismo interno do modelo."""
+    total = os.cpu_count() or 1
+    if n_jobs is None or n_jobs < 0:
+        n_jobs = total
+    externos = max(1, min(n_jobs, n_tarefas))
+    internos = max(1, n_jobs // externos)
+    return externos, internos
+
+
+def metricas_regressao(y_real, y_pred):
+    return {
+        'R2': r2_score(y_real, y_pred),
+        'MAE': mean_absolute_error(y_real, y_pred),
+        'RMSE': np.sqrt(mean_squared_error(y_real, y_pred)),
+    }
+
+
+def avaliar_loo(modelo, X, y, n_jobs=-1, cv=None):
+    """
+    Executa a validação (LOO por padrão) em paralelo e ajusta o modelo final com todos os dados.
+    `X` e `y` podem ser DataFrame/Series; o índice original é preservado nas previsões.
+    """
+    cv = cv if cv is not None else LeaveOneOut()
+    indice = X.index if hasattr(X, 'index') else pd.RangeIndex(len(X))
+    X_arr = np.asarray(X, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    folds = list(cv.split(X_arr))
+
+    externos, internos = _distribuir_nucleos(len(folds) + 1, n_jobs)
+    if 'n_jobs' in modelo.get_params():
+        modelo = clone(modelo).set_params(n_jobs=internos)
+
+    tarefas = [delayed(_ajustar_fold)(modelo, X_arr, y_arr, tr, te) for tr, te in folds]
+    tarefas.append(delayed(_ajustar_fold)(modelo, X_arr, y_arr, np.arange(len(y_arr)), None))
+    saidas = Parallel(n_jobs=externos)(tarefas)
+    modelo_final = saidas.pop()
+
+    y_pred = np.empty(len(y_arr))
+    fold = np.empty(len(y_arr), dtype=int)
+    for i, ((_, te), pred) in enumerate(zip(folds, saidas)):
+        y_pred[te] = pred
+        fold[te] = i
+
+    previsoes = pd.DataFrame({
+        'fold': fold,
+        'y_real': y_arr,
+        'y_pred': y_pred,
+        'residuo': y_arr - y_pred,
+    }, index=indice)
+    return {
+        'previsoes': previsoes,
+        'metricas': metricas_regressao(y_arr, y_pred),
+        'modelo_final': modelo_final,
+        'colunas': list(X.columns) if hasattr(X, 'columns') else None,
+    }
+
+
+def avaliar_loo_em_cache(modelo, X, y, origem=None, n_jobs=-1):
+    """avaliar_loo com cache persistente (ver cache_resultados.py); `origem` é o CSV de onde vieram X e y."""
+    return em_cache(lambda: avaliar_loo(modelo, X, y, n_jobs=n_jobs), X, y, modelo, 'LeaveOneOut()', origem=origem,
+                    extra={'funcao': 'validacao_loo.avaliar_loo', 'codigo': versao_codigo(__file__)})
@@ -6,80 +6,150 @@ Validação cruzada dos modelos anuais e mensais usando múltiplos algoritmos:
 - RandomForestRegressor
 
 Apresenta métricas e explicações para cada modelo. Foco no anual (produtividade) e mensal (NDVI).
+
+O LOO dos modelos lineares é analítico (um único ajuste, via matriz chapéu/PRESS);
+o Lasso reaproveita a solução entre folds (warm start) e o Random Forest usa validacao_loo.py.
+Também é salvo o caminho de regularização (R² LOO para uma grade de alphas) de Ridge e Lasso.
 """
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression, Ridge, Lasso
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import LeaveOneOut, cross_val_score
 from sklearn.metrics import r2_score, mean_squared_error
-import matplotlib.pyplot as plt
 import os
+from loo_linear import loo_linear_analitico, loo_lasso, caminho_ridge_loo, caminho_lasso_loo, r2_press, rmse_loo
+from validacao_loo import avaliar_loo
+import loo_linear
+import validacao_loo
+from cache_resultados import em_cache, versao_codigo
+
+ALPHAS = np.logspace(-3, 2, 26)
+
+# Conjunto -> (arquivo, variáveis explicativas, alvo)
+CONJUNTOS = {
+    'anual': ('../dados_processados/integrado_anual.csv',
+              ['Savitzky-Golay', 'Precipitacao_total_mm', 'Temp_media_C'], 'Produtividade (ton/ha)'),
+    'mensal': ('../dados_processados/integrado_mensal.csv',
+               ['Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media'], 'NDVI_medio'),
+}
+
+
+def carregar_conjunto(nome):
+    """(X, y, arquivo) de um dos CONJUNTOS."""
+    arquivo, colunas, alvo = CONJUNTOS[nome]
+    df = pd.read_csv(arquivo)
+    return df[colunas], df[alvo], arquivo
+
+
+def previsoes_loo(modelo, X, y):
+    """Previsões LOO usando o caminho mais barato disponível para cada tipo de modelo."""
+    if type(modelo) is LinearRegression:
+        return loo_linear_analitico(X, y, alpha=0.0)[0]
+    if type(modelo) is Ridge:
+        return loo_linear_analitico(X, y, alpha=modelo.alpha)[0]
+    if type(modelo) is Lasso:
+        return loo_lasso(X, y, alpha=modelo.alpha, max_iter=modelo.max_iter)
+    return avaliar_loo(modelo, X, y)['previsoes']['y_pred'].to_numpy()
+
+
+def validar_e_ajustar(modelo, X, y):
+    """Previsões LOO + modelo ajustado com todos os dados (o que fica guardado no cache)."""
+    y_loo = previsoes_loo(modelo, X, y)
+    return y_loo, modelo.fit(X, y)
 
-os.makedirs('../dados_processados', exist_ok=True)
-os.makedirs('../resultados', exist_ok=True)
 
 # --- Função para avaliação e explicação dos modelos ---
-def avaliar_modelos(X, y, modelos, nome_saida, explicacao):
+def avaliar_modelos(X, y, modelos, nome_saida, explicacao, origem=None):
     resultados = []
-    loo = LeaveOneOut()
+    # Resultado próprio (tupla y_loo, modelo): não compartilha entradas com avaliar_loo_em_cache
+    extra = {'funcao': 'validacao_modelos.validar_e_ajustar',
+             'codigo': versao_codigo(__file__, loo_linear, validacao_loo)}
     for nome, modelo in modelos.items():
-        scores = cross_val_score(modelo, X, y, cv=loo, scoring='r2')
-        modelo.fit(X, y)
-        y_pred = modelo.predict(X)
-        mse = mean_squared_error(y, y_pred)
-        rmse = np.sqrt(mse)
-        r2 = r2_score(y, y_pred)
-        resultados.append({
-            'Modelo': nome,
-            'R2_treino': r2,
-            'R2_LOO_medio': np.mean(scores),
-            'RMSE': rmse
-        })
+        # Resultados reaproveitados do cache quando dados e hiperparâmetros não mudaram
+        y_loo, modelo = em_cache(lambda: validar_e_ajustar(modelo, X, y), X, y, modelo, 'LeaveOneOut()',
+                                 origem=origem, extra=extra)
+        resultados.append(linha_resultado(nome, modelo, X, y, y_loo))
     df_result = pd.DataFrame(resultados)
+    salvar_resultados(df_result, nome_saida, explicacao)
+    return df_result
+
+
+def linha_resultado(nome, modelo, X, y, y_loo):
+    """Linha de *_validacao_modelos.csv: `modelo` já ajustado com todos os dados + previsões LOO."""
+    y_pred = modelo.predict(X)
+    return {
+        'Modelo': nome,
+        'R2_treino': r2_score(y, y_pred),
+        'R2_LOO': r2_press(y, y_loo),
+        'RMSE': np.sqrt(mean_squared_error(y, y_pred)),
+        'RMSE_LOO': rmse_loo(y, y_loo),
+    }
+
+
+def salvar_resultados(df_result, nome_saida, explicacao):
     df_result.to_csv(f'../dados_processados/{nome_saida}_validacao_modelos.csv', index=False)
     with open(f'../dados_processados/{nome_saida}_explicacao.txt', 'w') as f:
         f.write(explicacao)
         f.write('\nMétricas:\n')
         f.write(df_result.to_string(index=False))
-    return df_result
 
-# --- 1. Modelagem ANUAL (Produtividade) ---
-df_anual = pd.read_csv('../dados_processados/integrado_anual.csv')
-X_anual = df_anual[['Savitzky-Golay', 'Precipitacao_total_mm', 'Temp_media_C']]
-y_anual = df_anual['Produtividade (ton/ha)']
-modelos_anual = {
-    'LinearRegression': LinearRegression(),
-    'Ridge': Ridge(alpha=1.0),
-    'Lasso': Lasso(alpha=0.01),
-    'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42)
-}
-explicacao_anual = (
-    'Validação cruzada leave-one-out com 4 algoritmos:\n'
-    '- LinearRegression: modelo linear simples.\n'
-    '- Ridge: regularização L2 para reduzir overfitting.\n'
-    '- Lasso: regularização L1 para seleção de variáveis.\n'
-    '- RandomForest: modelo não-linear, robusto a colinearidade.'
-)
-avaliar_modelos(X_anual, y_anual, modelos_anual, 'anual', explicacao_anual)
-
-# --- 2. Modelagem MENSAL (NDVI ~ clima) ---
-df_mensal = pd.read_csv('../dados_processados/integrado_mensal.csv')
-X_mensal = df_mensal[['Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media']]
-y_mensal = df_mensal['NDVI_medio']
-modelos_mensal = {
-    'LinearRegression': LinearRegression(),
-    'Ridge': Ridge(alpha=1.0),
-    'Lasso': Lasso(alpha=0.01),
-    'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42)
-}
-explicacao_mensal = (
-    'Validação cruzada leave-one-out para prever NDVI mensal a partir do clima:\n'
-    '- LinearRegression: modelo linear simples.\n'
-    '- Ridge: regularização L2 para reduzir overfitting.\n'
-    '- Lasso: regularização L1 para seleção de variáveis.\n'
-    '- RandomForest: modelo não-linear, robusto a colinearidade.'
-)
-avaliar_modelos(X_mensal, y_mensal, modelos_mensal, 'mensal', explicacao_mensal)
-
-print('Validação cruzada concluída. Resultados salvos em dados_processados/.')
+
+def caminho_regularizacao(X, y, nome_saida, alphas=ALPHAS):
+    """R² e RMSE LOO de Ridge e Lasso para cada alpha da grade (uma SVD / warm start)."""
+    loo_ridge = caminho_ridge_loo(X, y, alphas)
+    loo_lasso_alphas = caminho_lasso_loo(X, y, alphas)
+    caminho = pd.concat([
+        pd.DataFrame({'Modelo': 'Ridge', 'alpha': alphas,
+                      'R2_LOO': r2_press(y, loo_ridge), 'RMSE_LOO': rmse_loo(y, loo_ridge)}),
+        pd.DataFrame({'Modelo': 'Lasso', 'alpha': alphas,
+                      'R2_LOO': r2_press(y, loo_lasso_alphas), 'RMSE_LOO': rmse_loo(y, loo_lasso_alphas)}),
+    ], ignore_index=True)
+    caminho.to_csv(f'../dados_processados/{nome_saida}_caminho_regularizacao.csv', index=False)
+    return caminho
+
+
+if __name__ == '__main__':
+    os.makedirs('../dados_processados', exist_ok=True)
+    os.makedirs('../resultados', exist_ok=True)
+
+    # --- 1. Modelagem ANUAL (Produtividade) ---
+    X_anual, y_anual, arquivo_anual = carregar_conjunto('anual')
+    modelos_anual = {
+        'LinearRegression': LinearRegression(),
+        'Ridge': Ridge(alpha=1.0),
+        'Lasso': Lasso(alpha=0.01),
+        'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42)
+    }
+    explicacao_anual = (
+        'Validação cruzada leave-one-out com 4 algoritmos:\n'
+        '- LinearRegression: modelo linear simples.\n'
+        '- Ridge: regularização L2 para reduzir overfitting.\n'
+        '- Lasso: regularização L1 para seleção de variáveis.\n'
+        '- RandomForest: modelo não-linear, robusto a colinearidade.\n'
+        'R2_LOO = 1 - PRESS/SQT, calculado com as previsões de todos os folds.'
+    )
+    avaliar_modelos(X_anual, y_anual, modelos_anual, 'anual', explicacao_anual,
+                    origem=arquivo_anual)
+    caminho_regularizacao(X_anual, y_anual, 'anual')
+
+    # --- 2. Modelagem MENSAL (NDVI ~ clima) ---
+    X_mensal, y_mensal, arquivo_mensal = carregar_conjunto('mensal')
+    modelos_mensal = {
+        'LinearRegression': LinearRegression(),
+        'Ridge': Ridge(alpha=1.0),
+        'Lasso': Lasso(alpha=0.01),
+        'RandomForest': RandomForestRegressor(n_estimators=100, random_state=42)
+    }
+    explicacao_mensal = (
+        'Validação cruzada leave-one-out para prever NDVI mensal a partir do clima:\n'
+        '- LinearRegression: modelo linear simples.\n'
+        '- Ridge: regularização L2 para reduzir overfitting.\n'
+        '- Lasso: regularização L1 para seleção de variáveis.\n'
+        '- RandomForest: modelo não-linear, robusto a colinearidade.\n'
+        'R2_LOO = 1 - PRESS/SQT, calculado com as previsões de todos os folds.'
+    )
+    avaliar_modelos(X_mensal, y_mensal, modelos_mensal, 'mensal', explicacao_mensal,
+                    origem=arquivo_mensal)
+    caminho_regularizacao(X_mensal, y_mensal, 'mensal')
+
+    print('Validação cruzada concluída. Resultados salvos em dados_processados/.')
@@ -0,0 +1,137 @@
+"""
+Validação rápida do Random Forest pelas previsões out-of-bag (OOB), com uma única floresta.
+- Cada árvore é treinada numa amostra bootstrap; as observações que ficaram de fora (~37%) servem de
+  teste para ela. A previsão OOB de uma observação é a média das árvores que não a viram
+- A floresta cresce em passos de PASSO_ARVORES com warm_start (as árvores já treinadas são mantidas),
+  e o erro OOB de cada passo forma a curva erro x n_estimators num único treinamento
+- Com a mesma semente, a floresta final é idêntica à de RandomForestRegressor(n_estimators=...) direto
+- Passos em que alguma observação ainda não tem árvore OOB ficam sem métricas (NaN) na curva
+
+O OOB serve para iterar rápido; os relatórios finais continuam no LOO (validacao_loo.py). Rodado como
+script, compara OOB e LOO lado a lado para os Random Forest de rf_visualizacoes.py e
+modelagem_produtividade_rf.py (o LOO vem do cache de resultados quando esses scripts já rodaram).
+
+Uso:
+    from validacao_oob import avaliar_oob
+    resultado = avaliar_oob(RandomForestRegressor(n_estimators=100, random_state=42), X, y)
+    resultado['curva']         # DataFrame: n_estimators, R2_OOB, MAE_OOB, RMSE_OOB
+    resultado['previsoes']     # mesmo formato de avaliar_loo (y_real, y_pred, residuo)
+
+    python validacao_oob.py            # (a partir de scripts/) salva rf_oob_curva.csv e rf_oob_vs_loo.csv
+    python rf_visualizacoes.py --rapido
+"""
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+from validacao_loo import avaliar_loo_em_cache, metricas_regressao
+
+PASSO_ARVORES = 10
+
+# Random Forest dos scripts -> variáveis explicativas (alvo: produtividade de integrado_anual.csv)
+MODELOS = {
+    'rf_anual': ['Savitzky-Golay', 'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media'],
+    'rf_anual_completo': ['Área Plantada (ha)', 'Área Colhida (ha)', 'Savitzky-Golay',
+                          'Precipitacao_total_mm', 'Temp_media_C', 'Umidade_media'],
+}
+
+
+def opcao_rapido(parser):
+    parser.add_argument('--rapido', action='store_true',
+                        help='estima o erro pelo OOB de uma única floresta, sem os folds do LOO (nada é salvo)')
+    return parser
+
+
+def avaliar_oob(modelo, X, y, passo=PASSO_ARVORES, n_jobs=-1):
+    """
+    Floresta de `modelo.n_estimators` árvores crescida em passos (warm_start), com a curva OOB.
+    Retorna a mesma estrutura de avaliar_loo, mais 'curva'.
+    """
+    indice = X.index if hasattr(X, 'index') else pd.RangeIndex(len(X))
+    X_arr = np.asarray(X, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    total = modelo.get_params()['n_estimators']
+    floresta = clone(modelo).set_params(bootstrap=True, oob_score=True, warm_start=True, n_jobs=n_jobs)
+
+    curva = []
+    for n in list(range(passo, total, passo)) + [total]:
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter('always', UserWarning)  # "Some inputs do not have OOB scores"
+            floresta.set_params(n_estimators=n).fit(X_arr, y_arr)
+        completo = not any('OOB' in str(aviso.message) for aviso in avisos)
+        metricas = (metricas_regressao(y_arr, floresta.oob_prediction_) if completo
+                    else dict.fromkeys(('R2', 'MAE', 'RMSE'), np.nan))
+        curva.append({'n_estimators': n, **{f'{k}_OOB': v for k, v in metricas.items()}})
+    floresta.set_params(warm_start=False)
+
+    previsoes = pd.DataFrame({
+        'y_real': y_arr,
+        'y_pred': floresta.oob_prediction_,
+        'residuo': y_arr - floresta.oob_prediction_,
+    }, index=indice)
+    return {
+        'previsoes': previsoes,
+        'metricas': metricas_regressao(y_arr, floresta.oob_prediction_),
+        'modelo_final': floresta,
+        'colunas': list(X.columns) if hasattr(X, 'columns') else None,
+        'curva': pd.DataFrame(curva),
+    }
+
+
+def comparar_com_loo(resultado_oob, resultado_loo):
+    """Métricas OOB e LOO lado a lado."""
+    return pd.DataFrame({
+        'Metrica': list(resultado_oob['metricas']),
+        'OOB': list(resultado_oob['metricas'].values()),
+        'LOO': [resultado_loo['metricas'][k] for k in resultado_oob['metricas']],
+    })
+
+
+def relatorio_rapido(modelo, X, y):
+    """Modo --rapido dos scripts de Random Forest: métricas OOB e curva no terminal."""
+    resultado = avaliar_oob(modelo, X, y)
+    print('Métricas do modelo Random Forest (estimativa OOB, sem LOO):')
+    for nome, valor in resultado['metricas'].items():
+        print(f'{nome}: {valor:.3f}')
+    print('\nCurva OOB (erro x número de árvores):')
+    print(resultado['curva'].to_string(index=False, float_format='{:.3f}'.format))
+    return resultado
+
+
+if __name__ == '__main__':
+    from sklearn.ensemble import RandomForestRegressor
+    from graficos import opcao_sem_graficos, desenhar_figuras
+
+    parser = argparse.ArgumentParser(description='Random Forest: validação OOB x LOO e curva de árvores.')
+    parser.add_argument('--passo', type=int, default=PASSO_ARVORES, help='árvores acrescentadas por passo')
+    parser.add_argument('--sem-loo', action='store_true', help='apenas o OOB (sem a coluna LOO)')
+    args = opcao_sem_graficos(parser).parse_args()
+
+    arquivo = '../dados_processados/integrado_anual.csv'
+    df = pd.read_csv(arquivo)
+    y = df['Produtividade (ton/ha)']
+    curvas, comparacoes = [], []
+    for nome, colunas in MODELOS.items():
+        modelo = RandomForestRegressor(n_estimators=100, random_state=42)
+        resultado = avaliar_oob(modelo, df[colunas], y, passo=args.passo)
+        curvas.append(resultado['curva'].assign(Modelo=nome))
+        if args.sem_loo:
+            comparacao = comparar_com_loo(resultado, {'metricas': dict.fromkeys(resultado['metricas'], np.nan)})
+        else:
+            comparacao = comparar_com_loo(resultado, avaliar_loo_em_cache(modelo, df[colunas], y, origem=arquivo))
+        comparacoes.append(comparacao.assign(Modelo=nome))
+        print(f'--- {nome} ---')
+        print(comparacao.to_string(index=False, float_format='{:.3f}'.format))
+
+    curva = pd.concat(curvas, ignore_index=True)
+    curva[['Modelo'] + [c for c in curva.columns if c != 'Modelo']].to_csv(
+        '../dados_processados/rf_oob_curva.csv', index=False)
+    comparacao = pd.concat(comparacoes, ignore_index=True)
+    comparacao[['Modelo', 'Metrica', 'OOB', 'LOO']].to_csv('../dados_processados/rf_oob_vs_loo.csv', index=False)
+
+    if not args.sem_graficos:
+        desenhar_figuras(['rf_oob_curva'])
+    print('Resultados salvos em dados_processados/rf_oob_curva.csv e rf_oob_vs_loo.csv.')